@@ -0,0 +1,90 @@
+"""events.starts_at zaman damgası ve ana sayfa indeksleri
+
+date/time metin kolonlarından starts_at doldurulur; eski kolonlar API'de
+sunulmaya devam ettiği için korunur.
+
+Revision ID: 0001_event_starts_at
+Revises:
+Create Date: 2026-10-18
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_event_starts_at"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_events_active_starts_at": ["is_active", "starts_at", "id"],
+    "ix_events_active_category_starts_at": ["is_active", "category_id", "starts_at", "id"],
+    "ix_events_active_featured_starts_at": ["is_active", "is_featured", "starts_at", "id"],
+}
+
+events = sa.table(
+    "events",
+    sa.column("id", sa.Integer),
+    sa.column("date", sa.String),
+    sa.column("time", sa.String),
+    sa.column("created_at", sa.DateTime),
+    sa.column("starts_at", sa.DateTime),
+)
+
+
+def _parse(date, time, fallback):
+    date = (date or "").strip()
+    time = (time or "").strip()
+    candidates = [
+        (f"{date} {time}", "%Y-%m-%d %H:%M"),
+        (f"{date} {time}", "%Y-%m-%d %H:%M:%S"),
+        (date, "%Y-%m-%d"),
+    ]
+    for value, fmt in candidates:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    # Biçimi bozuk eski kayıtlar: oluşturulma zamanına düş
+    return fallback or datetime(1970, 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "events" not in inspector.get_table_names():
+        # Boş veritabanı: tablolar create_all ile güncel şemayla oluşturulur
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("events")}
+    if "starts_at" not in columns:
+        op.add_column("events", sa.Column("starts_at", sa.DateTime(), nullable=True))
+
+    rows = bind.execute(
+        sa.select(events.c.id, events.c.date, events.c.time, events.c.created_at)
+        .where(events.c.starts_at.is_(None))
+    ).all()
+    if rows:
+        bind.execute(
+            events.update()
+            .where(events.c.id == sa.bindparam("event_id"))
+            .values(starts_at=sa.bindparam("value")),
+            [{"event_id": row.id, "value": _parse(row.date, row.time, row.created_at)} for row in rows],
+        )
+
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.alter_column("starts_at", existing_type=sa.DateTime(), nullable=False)
+
+    existing = {index["name"] for index in sa.inspect(bind).get_indexes("events")}
+    for name, index_columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "events", index_columns)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="events")
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.drop_column("starts_at")
@@ -0,0 +1,29 @@
+"""table_versions: ETag / Last-Modified için tablo bazlı değişiklik sayaçları
+
+Revision ID: 0002_table_versions
+Revises: 0001_event_starts_at
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_table_versions"
+down_revision = "0001_event_starts_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "table_versions" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
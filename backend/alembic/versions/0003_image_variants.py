@@ -0,0 +1,34 @@
+"""events/stories.image_variants: duyarlı görsel varyant manifesti
+
+Mevcut görseller için varyant üretilmez; kolon boş kalır ve istemci
+image_url'e geri döner. Yeni yüklemeler manifesti doldurur.
+
+Revision ID: 0003_image_variants
+Revises: 0002_table_versions
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_image_variants"
+down_revision = "0002_table_versions"
+branch_labels = None
+depends_on = None
+
+TABLES = ("events", "stories")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table_name in TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table_name)}
+        if "image_variants" not in columns:
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.add_column(sa.Column("image_variants", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("image_variants")
@@ -0,0 +1,40 @@
+"""blobs: içerik adresli yükleme deposu ve referans sayaçları
+
+Mevcut rastgele adlı yüklemeler taşınmaz; yalnızca yeni yüklemeler depoya
+alınır. Eski dosyalar önceki gibi kayıt silinirken temizlenir.
+
+Revision ID: 0004_blobs
+Revises: 0003_image_variants
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_blobs"
+down_revision = "0003_image_variants"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "blobs" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "blobs",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("meta", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_blobs_sha256", "blobs", ["sha256"])
+    op.create_index("ix_blobs_ref_count_updated_at", "blobs", ["ref_count", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_blobs_ref_count_updated_at", table_name="blobs")
+    op.drop_index("ix_blobs_sha256", table_name="blobs")
+    op.drop_table("blobs")
@@ -0,0 +1,59 @@
+"""forms.allow_multiple_submissions, applications.idempotency_key/submission_slot
+
+Mevcut formlar birden fazla başvuruya izin verecek şekilde işaretlenir
+(davranış değişmez); mevcut başvuruların submission_slot değeri boş kalır,
+böylece eski tekrar eden başvurular benzersiz indeksle çakışmaz. Yeni
+formlar varsayılan olarak kullanıcı başına tek başvuru kabul eder.
+
+Revision ID: 0005_application_submission_policy
+Revises: 0004_blobs
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_application_submission_policy"
+down_revision = "0004_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not {"forms", "applications"} <= set(inspector.get_table_names()):
+        return  # tablolar henüz yok; create_all güncel şemayla oluşturur
+    form_columns = {column["name"] for column in inspector.get_columns("forms")}
+    if "allow_multiple_submissions" not in form_columns:
+        with op.batch_alter_table("forms") as batch_op:
+            batch_op.add_column(
+                sa.Column("allow_multiple_submissions", sa.Boolean(), nullable=False, server_default=sa.false())
+            )
+        op.execute(sa.text("UPDATE forms SET allow_multiple_submissions = :value").bindparams(value=True))
+
+    application_columns = {column["name"] for column in inspector.get_columns("applications")}
+    with op.batch_alter_table("applications") as batch_op:
+        if "idempotency_key" not in application_columns:
+            batch_op.add_column(sa.Column("idempotency_key", sa.String(128), nullable=True))
+        if "submission_slot" not in application_columns:
+            batch_op.add_column(sa.Column("submission_slot", sa.Integer(), nullable=True))
+
+    indexes = {index["name"] for index in inspector.get_indexes("applications")}
+    if "uq_applications_idempotency" not in indexes:
+        op.create_index(
+            "uq_applications_idempotency", "applications", ["form_id", "user_id", "idempotency_key"], unique=True
+        )
+    if "uq_applications_submission_slot" not in indexes:
+        op.create_index(
+            "uq_applications_submission_slot", "applications", ["form_id", "user_id", "submission_slot"], unique=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_applications_submission_slot", table_name="applications")
+    op.drop_index("uq_applications_idempotency", table_name="applications")
+    with op.batch_alter_table("applications") as batch_op:
+        batch_op.drop_column("submission_slot")
+        batch_op.drop_column("idempotency_key")
+    with op.batch_alter_table("forms") as batch_op:
+        batch_op.drop_column("allow_multiple_submissions")
@@ -0,0 +1,45 @@
+"""job_leases tablosu ve stories.expires_at indeksleri
+
+job_leases, periyodik arka plan işlerinin (story süpürücüsü) birden fazla
+worker arasında tek bir sahip tarafından çalıştırılmasını sağlar.
+
+Revision ID: 0006_job_leases_story_indexes
+Revises: 0005_application_submission_policy
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_job_leases_story_indexes"
+down_revision = "0005_application_submission_policy"
+branch_labels = None
+depends_on = None
+
+STORY_INDEXES = (
+    ("ix_stories_expires_at", ["expires_at"]),
+    ("ix_stories_is_active_expires_at", ["is_active", "expires_at"]),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if "job_leases" not in tables:
+        op.create_table(
+            "job_leases",
+            sa.Column("name", sa.String(), primary_key=True),
+            sa.Column("owner", sa.String(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+        )
+    if "stories" in tables:
+        existing = {index["name"] for index in inspector.get_indexes("stories")}
+        for name, columns in STORY_INDEXES:
+            if name not in existing:
+                op.create_index(name, "stories", columns)
+
+
+def downgrade() -> None:
+    for name, _ in STORY_INDEXES:
+        op.drop_index(name, table_name="stories")
+    op.drop_table("job_leases")
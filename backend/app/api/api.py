@@ -3,7 +3,8 @@ from fastapi import APIRouter
 from .endpoints import (
     auth, categories, events, stories, settings,
     clubs, content_requests, user_roles,
-    forms, applications # New routers
+    forms, applications, # New routers
+    uploads
 )
 
 api_router = APIRouter()
@@ -36,6 +37,13 @@ api_router.include_router(
     tags=["stories"]
 )
 
+# Uploads (blob deposu bakımı) routes
+api_router.include_router(
+    uploads.router,
+    prefix="/uploads",
+    tags=["uploads"]
+)
+
 # Settings routes
 api_router.include_router(
     settings.router,
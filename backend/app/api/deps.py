@@ -1,9 +1,10 @@
-from typing import Optional, Any, List, Generator
+from typing import Optional, Generator, AsyncGenerator
 from fastapi import Depends, HTTPException, status, Header, Path
-from sqlalchemy.orm import Session
-from app import models # Assuming models.User, models.UserRole are accessible
 from app.core.roles import RoleType
-from app.core.database import SessionLocal # Assuming this is your session factory
+from app.core.principals import Principal, RoleGrant, resolve_principal
+from app.core.permissions import build_permission_index, permissions_for, require_club_manager
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import SessionLocal, AsyncSessionLocal # Assuming this is your session factory
 # Removed: from app.core import security - not used in this new version
 # Removed: from app.core.config import settings - not used in this new version
 # Removed: from app.models.admin import Admin - MOCK_USERS_DB will serve auth for now
@@ -26,73 +27,74 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-async def get_current_user(db: Session = Depends(get_db), user_email_header: Optional[str] = Header(None, alias="X-User-Email")) -> Optional[models.User]:
-    if user_email_header and user_email_header in MOCK_USERS_DB:
-        user_data = MOCK_USERS_DB[user_email_header]
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Async session for the public read routes; runs on the event loop instead of the threadpool
+    async with AsyncSessionLocal() as db:
+        yield db
 
-        # Ensure all fields required by User model are present
-        user = models.User(
-            id=user_data["id"],
-            email=user_data["email"],
-            is_active=user_data["is_active"],
-            password_hash=user_data["password_hash"],
-            full_name=user_data.get("full_name"), # Add other fields if User model requires them
-            student_id=user_data.get("student_id") # Add other fields
-        )
+def _mock_principal(email: str) -> Optional[Principal]:
+    # Development users that are not (yet) in the users table
+    user_data = MOCK_USERS_DB.get(email)
+    if user_data is None:
+        return None
+    roles = tuple(
+        RoleGrant(id=user_data["id"] * 1000 + idx, role_type=role_data["role_type"], club_id=role_data.get("club_id"))
+        for idx, role_data in enumerate(user_data["roles_data"])
+    )
+    return Principal(
+        id=user_data["id"],
+        email=user_data["email"],
+        is_active=user_data["is_active"],
+        full_name=user_data.get("full_name"),
+        student_id=user_data.get("student_id"),
+        roles=roles,
+        permissions=build_permission_index(roles),
+    )
 
-        user.roles = [] # This is an instance variable, not from SQLAlchemy relationship here
-        for idx, role_data in enumerate(user_data["roles_data"]):
-            mock_role_id = user_data["id"] * 1000 + idx # Ensure unique mock ID
-            # Ensure UserRole model can be instantiated with these args
-            user.roles.append(models.UserRole(
-                id=mock_role_id,
-                user_id=user_data["id"],
-                role_type=role_data["role_type"],
-                club_id=role_data.get("club_id")
-            ))
-        return user
-    return None
+async def get_current_user(
+    user_email_header: Optional[str] = Header(None, alias="X-User-Email"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[Principal]:
+    # Users and roles come from the principal cache; the DB is only hit on a miss
+    # (the async session connects lazily, so a cache hit never checks out a connection)
+    if not user_email_header:
+        return None
+    return await resolve_principal(user_email_header, db, fallback=_mock_principal)
 
-async def get_current_active_user(current_user: Optional[models.User] = Depends(get_current_user)) -> models.User:
+async def get_current_active_user(current_user: Optional[Principal] = Depends(get_current_user)) -> Principal:
     if not current_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated (X-User-Email header missing or invalid)")
     if not current_user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
     return current_user
 
-async def get_current_active_admin(current_user: models.User = Depends(get_current_active_user)) -> models.User:
-    if not hasattr(current_user, 'roles') or not current_user.roles:
+async def get_current_active_admin(current_user: Principal = Depends(get_current_active_user)) -> Principal:
+    permissions = permissions_for(current_user)
+    if not permissions.has_roles:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
-    if not any(role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN for role in current_user.roles):
+    if not permissions.is_system_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User does not have Admin or Super Admin privileges")
     return current_user
 
-async def get_current_active_super_admin(current_user: models.User = Depends(get_current_active_user)) -> models.User:
-    if not hasattr(current_user, 'roles') or not current_user.roles:
+async def get_current_active_super_admin(current_user: Principal = Depends(get_current_active_user)) -> Principal:
+    permissions = permissions_for(current_user)
+    if not permissions.has_roles:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
-    if not any(role.role_type == RoleType.SUPER_ADMIN for role in current_user.roles):
+    if not permissions.is_super_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User does not have Super Admin privileges")
     return current_user
 
 def club_manager_dependency_factory(club_id_path_param_name: str = "club_id"):
     async def get_current_club_manager_for_club(
         # club_id_from_path: int = Path(..., description="The ID of the club", alias=club_id_path_param_name), # This will be injected by FastAPI
-        current_user: models.User = Depends(get_current_active_user),
+        current_user: Principal = Depends(get_current_active_user),
         # To get club_id_from_path, it must be a parameter to this inner function,
         # which FastAPI will populate from the path.
         # The alias trick is for when the path parameter in the endpoint function has a different name.
         # If the endpoint function's path parameter is named club_id, then:
         club_id_from_path: int = Path(..., alias=club_id_path_param_name) # Path must be imported from fastapi
-    ) -> models.User:
-        if not hasattr(current_user, 'roles') or not current_user.roles:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
-
-        is_manager_for_club = any(
-            role.role_type == RoleType.CLUB_MANAGER and hasattr(role, 'club_id') and role.club_id == club_id_from_path for role in current_user.roles
-        )
-        is_admin_or_super = any(role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN for role in current_user.roles)
-
-        if not (is_manager_for_club or is_admin_or_super):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"User is not a manager for club {club_id_from_path} nor a system admin.")
+    ) -> Principal:
+        # O(1) lookup in the principal's precomputed permission index
+        require_club_manager(current_user, club_id_from_path, detail=f"User is not a manager for club {club_id_from_path} nor a system admin.")
         return current_user
     return get_current_club_manager_for_club
@@ -1,16 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path, File, UploadFile, Form as FastAPIForm
+from fastapi import APIRouter, Depends, HTTPException, status, Path, File, UploadFile, Form as FastAPIForm, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import or_, true
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Any, Optional
-import shutil
 import os
 import json
 from app import models, schemas
 from app.api import deps
-from app.core.roles import RoleType
+from app.core.permissions import permissions_for, require_club_manager
 from app.core.config import settings
+from app.core.pagination import paginate
+from app.core.blobs import blob_reference, ingest_upload, is_blob_reference, safe_extension
+from app.core.static import serve_file
+from app.core.application_export import EXPORT_FORMATS, export_applications
+from app.core.form_validation import validate_submission
+from app.core.loaders import APPLICATION_READ_OPTIONS, load_for_response
+from app.models.form import SINGLE_SUBMISSION_SLOT
 
 router = APIRouter()
 
+# Newest first; id breaks ties between submissions in the same second
+APPLICATION_SORT_KEYS = [(models.Application.submitted_at, True), (models.Application.id, True)]
+
 # Dependency to get and authorize application access
 async def get_application_for_auth(
     application_id: int = Path(..., description="The ID of the application"),
@@ -26,7 +39,8 @@ async def get_application_for_auth(
     if not application:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application not found")
 
-    if not hasattr(current_user, 'roles') or not current_user.roles:
+    permissions = permissions_for(current_user)
+    if not permissions.has_roles:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
 
     # Authorization: Submitter, or manager of the club owning the form, or system admin
@@ -39,157 +53,188 @@ async def get_application_for_auth(
          # Or if form was deleted after application was made (cascade might delete app too)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Application is not linked to a form.")
 
-
-    is_manager_of_club = any(
-        hasattr(role, 'club_id') and role.role_type == RoleType.CLUB_MANAGER and role.club_id == application.form.club_id
-        for role in current_user.roles
-    )
-    is_system_admin = any(
-        role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-        for role in current_user.roles
-    )
-    if not (is_manager_of_club or is_system_admin):
+    if not permissions.can_manage_club(application.form.club_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this application")
 
     return application
 
+def _find_prior_application(
+    db: Session, form: models.Form, user_id: int, idempotency_key: Optional[str]
+) -> Optional[models.Application]:
+    """An earlier application this submission collides with: same Idempotency-Key, or any
+    application by the user when the form accepts one per user."""
+    conditions = []
+    if idempotency_key:
+        conditions.append(models.Application.idempotency_key == idempotency_key)
+    if not form.allow_multiple_submissions:
+        conditions.append(true())
+    if not conditions:
+        return None
+    query = (
+        db.query(models.Application)
+        .options(*APPLICATION_READ_OPTIONS)
+        .filter(models.Application.form_id == form.id, models.Application.user_id == user_id, or_(*conditions))
+    )
+    if idempotency_key:
+        query = query.order_by((models.Application.idempotency_key == idempotency_key).desc()) # A replay wins over a conflict
+    return query.order_by(models.Application.id).first()
+
+
+def _replay_or_conflict(
+    prior: models.Application, idempotency_key: Optional[str], data: dict, response: Response
+) -> models.Application:
+    if idempotency_key and prior.idempotency_key == idempotency_key:
+        if prior.data_json != data:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different payload"
+            )
+        # A client retry: answer with the application the first request created
+        response.status_code = status.HTTP_200_OK
+        response.headers["Idempotent-Replayed"] = "true"
+        return prior
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="You have already applied to this form")
+
+
 @router.post("/form/{form_id}", response_model=schemas.form.ApplicationRead, status_code=status.HTTP_201_CREATED)
 async def submit_application(
     *,
     db: Session = Depends(deps.get_db),
+    response: Response,
     form_id: int = Path(..., description="The ID of the form to submit to"),
     data_json_str: str = FastAPIForm(..., alias="data_json"),
-    files: Optional[List[UploadFile]] = File(None, description="Optional files for the application"),
+    files: List[UploadFile] = File([], description="Optional files for the application"),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=128,
+        description="Retries carrying the same key return the original application instead of creating a new one"
+    ),
     current_user: models.User = Depends(deps.get_current_active_user)
 ) -> models.Application:
-    form = db.query(models.Form).filter(models.Form.id == form_id, models.Form.is_active == True).first()
-    if not form:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Active form not found or form does not exist")
-
+    files = [file_obj for file_obj in files if file_obj.filename]
     try:
-        application_data_dict = json.loads(data_json_str)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON format for data_json.")
+        form = db.query(models.Form).filter(models.Form.id == form_id, models.Form.is_active == True).first()
+        if not form:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Active form not found or form does not exist")
+
+        try:
+            application_data_dict = json.loads(data_json_str)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON format for data_json.")
 
-    # TODO: Add validation of application_data_dict against form.fields_json definition here
-    # This is a crucial step for real-world applications.
+        # Validated against the form's compiled (cached) field definitions; file fields
+        # reference uploaded files by name. Only the normalized, declared fields are stored.
+        uploaded_filenames = [os.path.basename(file_obj.filename) for file_obj in files]
+        application_data_dict = validate_submission(form, application_data_dict, uploaded_filenames)
 
+        # Retries and duplicates are answered before any file is stored
+        prior = _find_prior_application(db, form, current_user.id, idempotency_key)
+        if prior is not None:
+            return _replay_or_conflict(prior, idempotency_key, application_data_dict, response)
+        submission_slot = None if form.allow_multiple_submissions else SINGLE_SUBMISSION_SLOT
+        db.rollback() # Release the read snapshot; nothing is held open during file I/O
+
+        # Stage every file first. Content-addressed blobs are stored outside this transaction;
+        # if the submission never commits they stay unreferenced and are garbage collected.
+        stored_files = [] # (path, original name, content type)
+        for file_obj in files:
+            safe_filename = os.path.basename(file_obj.filename) # Basic sanitization
+            try:
+                # Content-addressed: an identical file (e.g. the same CV) is stored once and shared
+                blob = await ingest_upload(db, file_obj, "applications", safe_extension(safe_filename), settings.MAX_FILE_SIZE)
+            except HTTPException:
+                raise # e.g. 413 when the file exceeds MAX_FILE_SIZE
+            except Exception as e:
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Could not save file {safe_filename}: {str(e)}")
+            stored_files.append((blob_reference(blob.key), safe_filename, file_obj.content_type))
+    finally:
+        for file_obj in files:
+            await file_obj.close()
+
+    # The application and its file rows are written in a single transaction
     db_application = models.Application(
         data_json=application_data_dict,
         form_id=form_id,
         user_id=current_user.id,
-        status="submitted"
+        status="submitted",
+        idempotency_key=idempotency_key,
+        submission_slot=submission_slot,
+        application_files=[
+            models.ApplicationFile(file_path=file_location, original_file_name=safe_filename, file_type=content_type)
+            for file_location, safe_filename, content_type in stored_files
+        ],
     )
     db.add(db_application)
-    # Must commit here to get db_application.id for file path
     try:
         db.commit()
-        db.refresh(db_application)
+    except IntegrityError:
+        db.rollback()
+        # A concurrent request with the same key (or for the same single-submission form) won the race
+        prior = _find_prior_application(db, form, current_user.id, idempotency_key)
+        if prior is None:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create application entry")
+        return _replay_or_conflict(prior, idempotency_key, application_data_dict, response)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to create application entry: {str(e)}")
 
-
-    if files:
-        upload_dir_base = settings.UPLOAD_DIR
-        if not upload_dir_base or not os.path.exists(upload_dir_base):
-            os.makedirs(upload_dir_base, exist_ok=True)
-
-        application_specific_upload_dir = os.path.join(upload_dir_base, "applications", str(db_application.id))
-        if not os.path.exists(application_specific_upload_dir):
-            os.makedirs(application_specific_upload_dir, exist_ok=True)
-
-        saved_file_paths = []
-        for file_obj in files:
-            if not file_obj.filename: continue
-            safe_filename = os.path.basename(file_obj.filename) # Basic sanitization
-            file_location = os.path.join(application_specific_upload_dir, safe_filename)
-
-            try:
-                with open(file_location, "wb+") as file_buffer:
-                    shutil.copyfileobj(file_obj.file, file_buffer)
-                saved_file_paths.append(file_location) # Keep track of successfully saved files
-            except Exception as e:
-                # Cleanup already saved files for this application if one fails? Or log and continue?
-                # For now, just raise an error.
-                db.delete(db_application) # Rollback application if file upload fails
-                db.commit()
-                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Could not save file {safe_filename}: {str(e)}")
-            finally:
-                await file_obj.close()
-
-            db_app_file = models.ApplicationFile(
-                application_id=db_application.id,
-                file_path=file_location,
-                original_file_name=safe_filename,
-                file_type=file_obj.content_type
-            )
-            db.add(db_app_file)
-
-        try:
-            db.commit()
-            db.refresh(db_application, attribute_names=['application_files'])
-        except Exception as e:
-            db.rollback()
-            # Attempt to delete files that were physically saved if DB operation fails
-            for fp in saved_file_paths:
-                if os.path.exists(fp): os.remove(fp)
-            # Also delete the application itself as it's now in an inconsistent state
-            db.delete(db_application)
-            db.commit()
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to save file metadata to DB: {str(e)}")
-
-
-    db.refresh(db_application, attribute_names=['submitter'])
-    return db_application
+    return load_for_response(db, db_application, APPLICATION_READ_OPTIONS)
 
 @router.get("/form/{form_id}/applications", response_model=List[schemas.form.ApplicationRead])
 def list_applications_for_form(
     *,
     db: Session = Depends(deps.get_db),
     form_id: int,
+    response: Response,
     current_user: models.User = Depends(deps.get_current_active_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None # Opaque keyset cursor from a previous X-Next-Cursor header; overrides skip
 ) -> List[models.Application]:
     form = db.query(models.Form).filter(models.Form.id == form_id).first()
     if not form:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
 
-    if not hasattr(current_user, 'roles') or not current_user.roles:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
-
-    is_manager_of_club = any(
-        hasattr(role, 'club_id') and role.role_type == RoleType.CLUB_MANAGER and role.club_id == form.club_id
-        for role in current_user.roles
-    )
-    is_system_admin = any(
-        role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-        for role in current_user.roles
-    )
-    if not (is_manager_of_club or is_system_admin):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view applications for this form")
+    require_club_manager(current_user, form.club_id, detail="Not authorized to view applications for this form")
 
-    applications = (
+    query = (
         db.query(models.Application)
         .filter(models.Application.form_id == form_id)
-        .options(joinedload(models.Application.submitter), joinedload(models.Application.application_files))
-        .order_by(models.Application.submitted_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+        .options(*APPLICATION_READ_OPTIONS) # Two extra queries per page (files, submitter roles) instead of one per row
+    )
+    return paginate(query, APPLICATION_SORT_KEYS, limit=limit, skip=skip, cursor=cursor, response=response)
+
+@router.get("/form/{form_id}/export")
+def export_applications_for_form(
+    *,
+    db: Session = Depends(deps.get_db),
+    form_id: int,
+    format: str = "csv", # csv or xlsx
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> Response:
+    form = db.query(models.Form).filter(models.Form.id == form_id).first()
+    if not form:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+
+    require_club_manager(current_user, form.club_id, detail="Not authorized to view applications for this form")
+
+    fmt = format.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unsupported format. Supported formats: {sorted(EXPORT_FORMATS)}")
+
+    # Rows are streamed in yield_per batches; columns follow the form's field order
+    return StreamingResponse(
+        export_applications(form.id, form.fields_json, fmt, sheet_name=form.name),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="form-{form.id}-applications.{fmt}"'},
     )
-    return applications
 
 @router.get("/{application_id}", response_model=schemas.form.ApplicationRead)
 def read_application(
     target_application: models.Application = Depends(get_application_for_auth),
     db: Session = Depends(deps.get_db)
 ) -> models.Application:
-    # Ensure relationships needed by ApplicationRead are loaded.
-    # get_application_for_auth loads 'form'. 'submitter' and 'application_files' might also be needed.
-    db.refresh(target_application, attribute_names=['submitter', 'application_files'])
-    return target_application
+    # get_application_for_auth only loads 'form'; ApplicationRead also needs submitter and files
+    return load_for_response(db, target_application, APPLICATION_READ_OPTIONS)
 
 @router.put("/{application_id}/status", response_model=schemas.form.ApplicationRead)
 def update_application_status(
@@ -202,21 +247,44 @@ def update_application_status(
     # get_application_for_auth allows submitter to view. We must prevent submitter from changing status.
     if target_application.user_id == current_user.id:
         # Check if they also have a managing role for this form's club (edge case)
-        is_manager_of_club_for_form = any(
-            hasattr(role, 'club_id') and role.role_type == RoleType.CLUB_MANAGER and role.club_id == target_application.form.club_id
-            for role in current_user.roles
-        )
-        is_system_admin = any(
-            role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-            for role in current_user.roles
-        )
-        if not (is_manager_of_club_for_form or is_system_admin):
+        if not permissions_for(current_user).can_manage_club(target_application.form.club_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Submitters cannot change application status.")
 
     target_application.status = status_in.status
     db.add(target_application)
     db.commit()
-    db.refresh(target_application)
     # Ensure relationships are loaded for the response model
-    db.refresh(target_application, attribute_names=['submitter', 'application_files', 'form'])
-    return target_application
+    return load_for_response(db, target_application, APPLICATION_READ_OPTIONS)
+
+@router.get("/{application_id}/files/{file_id}")
+async def download_application_file(
+    *,
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    file_id: int = Path(..., description="The ID of the application file"),
+    target_application: models.Application = Depends(get_application_for_auth) # Auth check
+) -> Response:
+    application_file = (
+        db.query(models.ApplicationFile)
+        .filter(models.ApplicationFile.id == file_id, models.ApplicationFile.application_id == target_application.id)
+        .first()
+    )
+    if not application_file:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application file not found")
+
+    try:
+        stat_result = await run_in_threadpool(os.stat, application_file.file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application file is missing on disk")
+
+    # Content-addressed files never change, so clients may keep them; ranges let large attachments resume
+    is_blob = is_blob_reference(application_file.file_path)
+    return serve_file(
+        request.scope,
+        application_file.file_path,
+        stat_result,
+        cache_control="private, max-age=31536000, immutable" if is_blob else "private, no-cache",
+        etag=f'"{os.path.basename(application_file.file_path)}"' if is_blob else None,
+        filename=application_file.original_file_name,
+        media_type=application_file.file_type,
+    )
@@ -1,11 +1,13 @@
 from datetime import timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core import security
 from ...core.config import settings
+from ...core.ratelimit import login_limiter
 from ...api import deps
 from ...models import Admin
 from ...schemas.auth import Token, AdminLogin
@@ -14,28 +16,31 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login(
-    db: Session = Depends(deps.get_db),
+async def login(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """Admin girişi"""
-    # Admin'i bul
-    admin = db.query(Admin).filter(Admin.username == form_data.username).first()
-    
-    if not admin:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Şifreyi kontrol et
-    if not security.verify_password(form_data.password, admin.hashed_password):
+    # Deneme sınırı: reddedilen istekler veritabanına ve bcrypt'e ulaşmaz (429)
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        await login_limiter.check(form_data.username, request.client.host if request.client else None)
+
+    # Admin'i bul (async session: ortak thread havuzu kullanılmaz)
+    result = await db.execute(select(Admin).where(Admin.username == form_data.username))
+    admin = result.scalars().first()
+
+    # Şifreyi kontrol et (bcrypt ayrı havuzda çalışır)
+    if not admin or not await security.verify_password_async(form_data.password, admin.hashed_password):
+        if settings.LOGIN_RATE_LIMIT_ENABLED:
+            await login_limiter.record_failure(form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        await login_limiter.record_success(form_data.username)
     
     # Token oluştur
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
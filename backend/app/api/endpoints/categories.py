@@ -1,36 +1,41 @@
 from typing import List, Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ...api import deps
-from ...models import Category, Admin
+from ...models import Category, Event, Admin
 from ...schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
+from ...core.conditional import conditional_get
 
 router = APIRouter()
 
+categories_not_modified = conditional_get("categories")
 
-@router.get("/", response_model=List[CategorySchema])
-def read_categories(
-    db: Session = Depends(deps.get_db),
+
+@router.get("/", response_model=List[CategorySchema], dependencies=[Depends(categories_not_modified)])
+async def read_categories(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True
 ) -> Any:
     """Kategorileri listele (Public)"""
-    query = db.query(Category)
+    query = select(Category)
     if active_only:
         query = query.filter(Category.is_active == True)
-    categories = query.offset(skip).limit(limit).all()
+    categories = (await db.scalars(query.offset(skip).limit(limit))).all()
     return categories
 
 
-@router.get("/{category_id}", response_model=CategorySchema)
-def read_category(
+@router.get("/{category_id}", response_model=CategorySchema, dependencies=[Depends(categories_not_modified)])
+async def read_category(
     category_id: int,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ) -> Any:
     """Tek bir kategori getir (Public)"""
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = await db.get(Category, category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -107,7 +112,7 @@ def delete_category(
         )
     
     # Kategoriye ait etkinlik var mı kontrol et
-    if category.events:
+    if db.query(Event.id).filter(Event.category_id == category_id).first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete category with associated events"
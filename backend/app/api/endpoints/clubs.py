@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime # Keep for updated_at, though model might handle it
 from app import models, schemas
 from app.api import deps
+from app.core.conditional import conditional_get
+from app.core.loaders import CLUB_MEMBER_READ_OPTIONS, load_for_response
 
 router = APIRouter()
 
+# Club listings are the same for every active user; auth still runs before the 304 check
+clubs_not_modified = conditional_get("clubs", user_dependency=deps.get_current_active_user)
+
 @router.post("/", response_model=schemas.club.ClubRead, status_code=status.HTTP_201_CREATED)
 def create_club(
     *,
@@ -22,7 +27,7 @@ def create_club(
     db.refresh(db_club)
     return db_club
 
-@router.get("/", response_model=List[schemas.club.ClubRead])
+@router.get("/", response_model=List[schemas.club.ClubRead], dependencies=[Depends(clubs_not_modified)])
 def read_clubs(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
@@ -32,7 +37,7 @@ def read_clubs(
     clubs = db.query(models.Club).filter(models.Club.is_active == True).offset(skip).limit(limit).all()
     return clubs
 
-@router.get("/{club_id}", response_model=schemas.club.ClubRead)
+@router.get("/{club_id}", response_model=schemas.club.ClubRead, dependencies=[Depends(clubs_not_modified)])
 def read_club(
     *,
     db: Session = Depends(deps.get_db),
@@ -112,10 +117,8 @@ def add_club_member(
     db_member = models.ClubMember(club_id=club_id, user_id=member_in.user_id, role=member_in.role)
     db.add(db_member)
     db.commit()
-    db.refresh(db_member)
-    # For the response, load the user relationship if schema expects it
-    db.refresh(db_member, attribute_names=['user']) # Eagerly load user if needed for schema
-    return db_member
+    # For the response, load the user relationship (with roles) the schema expects
+    return load_for_response(db, db_member, CLUB_MEMBER_READ_OPTIONS)
 
 @router.get("/{club_id}/members", response_model=List[schemas.club.ClubMemberRead])
 def list_club_members(
@@ -130,7 +133,7 @@ def list_club_members(
 
     # Eagerly load the 'user' relationship of each 'ClubMember'
     # This is important if schemas.club.ClubMemberRead includes user details.
-    members = db.query(models.ClubMember).filter(models.ClubMember.club_id == club_id).options(joinedload(models.ClubMember.user)).all()
+    members = db.query(models.ClubMember).filter(models.ClubMember.club_id == club_id).options(*CLUB_MEMBER_READ_OPTIONS).all()
     return members
 
 @router.delete("/{club_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
-from sqlalchemy.orm import Session, joinedload # Ensure joinedload is imported
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Response
+from sqlalchemy.orm import Session
+from typing import List, Optional
 from datetime import datetime
 from app import models, schemas
 from app.api import deps
-from app.core.roles import RoleType
+from app.core.permissions import require_club_manager
+from app.core.pagination import paginate
+from app.core.loaders import CONTENT_REQUEST_READ_OPTIONS, load_for_response
 
 router = APIRouter()
 
+# Review queue is oldest first, club history newest first; id breaks ties
+PENDING_SORT_KEYS = [(models.ContentRequest.submitted_at, False), (models.ContentRequest.id, False)]
+CLUB_HISTORY_SORT_KEYS = [(models.ContentRequest.submitted_at, True), (models.ContentRequest.id, True)]
+
 @router.post("/", response_model=schemas.content_request.ContentRequestRead, status_code=status.HTTP_201_CREATED)
 def create_content_request(
     *,
@@ -15,21 +21,8 @@ def create_content_request(
     request_in: schemas.content_request.ContentRequestCreate,
     current_user: models.User = Depends(deps.get_current_active_user) # User must be active
 ) -> models.ContentRequest:
-    if not hasattr(current_user, 'roles') or not current_user.roles:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
-
     # Authorization: User must be a manager of the club_id in request_in OR an Admin/SuperAdmin
-    is_authorized_club_manager = any(
-        role.role_type == RoleType.CLUB_MANAGER and hasattr(role, 'club_id') and role.club_id == request_in.club_id
-        for role in current_user.roles
-    )
-    is_admin_or_super = any(
-        role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-        for role in current_user.roles
-    )
-
-    if not (is_authorized_club_manager or is_admin_or_super):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"User not authorized to create content requests for club {request_in.club_id}")
+    require_club_manager(current_user, request_in.club_id, detail=f"User not authorized to create content requests for club {request_in.club_id}")
 
     # model_dump(exclude_unset=True) is good practice if not all fields are always provided
     db_request = models.ContentRequest(**request_in.model_dump(), submitted_at=datetime.utcnow())
@@ -37,26 +30,23 @@ def create_content_request(
     db_request.reviewer_id = None
     db.add(db_request)
     db.commit()
-    db.refresh(db_request)
-    return db_request
+    return load_for_response(db, db_request, CONTENT_REQUEST_READ_OPTIONS)
 
 @router.get("/pending", response_model=List[schemas.content_request.ContentRequestRead])
 def list_pending_content_requests(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None, # Opaque keyset cursor from X-Next-Cursor; overrides skip
     current_user: models.User = Depends(deps.get_current_active_admin) # Only Admin/SuperAdmin can see all pending
 ) -> List[models.ContentRequest]:
-    requests = (
+    query = (
         db.query(models.ContentRequest)
-        .options(joinedload(models.ContentRequest.club)) # Eager load club data
+        .options(*CONTENT_REQUEST_READ_OPTIONS) # Eager load club and reviewer data
         .filter(models.ContentRequest.status == "pending")
-        .order_by(models.ContentRequest.submitted_at.asc())
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
-    return requests
+    return paginate(query, PENDING_SORT_KEYS, limit=limit, skip=skip, cursor=cursor, response=response)
 
 @router.put("/{request_id}/approve", response_model=schemas.content_request.ContentRequestRead)
 def approve_content_request(
@@ -76,8 +66,7 @@ def approve_content_request(
     db_request.reviewer_id = current_user.id
     db.add(db_request)
     db.commit()
-    db.refresh(db_request)
-    return db_request
+    return load_for_response(db, db_request, CONTENT_REQUEST_READ_OPTIONS)
 
 @router.put("/{request_id}/reject", response_model=schemas.content_request.ContentRequestRead)
 def reject_content_request(
@@ -97,16 +86,17 @@ def reject_content_request(
     db_request.reviewer_id = current_user.id
     db.add(db_request)
     db.commit()
-    db.refresh(db_request)
-    return db_request
+    return load_for_response(db, db_request, CONTENT_REQUEST_READ_OPTIONS)
 
 @router.get("/club/{club_id}", response_model=List[schemas.content_request.ContentRequestRead])
 def list_club_content_requests(
     *,
     db: Session = Depends(deps.get_db),
     club_id: int = Path(..., description="The ID of the club"),
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None, # Opaque keyset cursor from X-Next-Cursor; overrides skip
     current_user: models.User = Depends(deps.club_manager_dependency_factory(club_id_path_param_name="club_id")) # Club manager or Admin/SuperAdmin
 ) -> List[models.ContentRequest]:
     # Verify club exists
@@ -114,5 +104,9 @@ def list_club_content_requests(
     if not target_club:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Club with id {club_id} not found.")
 
-    requests = db.query(models.ContentRequest).filter(models.ContentRequest.club_id == club_id).order_by(models.ContentRequest.submitted_at.desc()).offset(skip).limit(limit).all()
-    return requests
+    query = (
+        db.query(models.ContentRequest)
+        .options(*CONTENT_REQUEST_READ_OPTIONS)
+        .filter(models.ContentRequest.club_id == club_id)
+    )
+    return paginate(query, CLUB_HISTORY_SORT_KEYS, limit=limit, skip=skip, cursor=cursor, response=response)
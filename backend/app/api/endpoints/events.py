@@ -1,31 +1,53 @@
 from typing import List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-import os
-import uuid
-from PIL import Image
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, select
+from starlette.concurrency import run_in_threadpool
+from datetime import date, datetime, time, timedelta
 
 from ...api import deps
 from ...models import Event, Category, Admin
-from ...schemas.event import Event as EventSchema, EventCreate, EventUpdate, EventList
-from ...core.config import settings
+from ...schemas.event import Event as EventSchema, EventCreate, EventUpdate, EventList, EventImportReport
+from ...core.images import EVENT_IMAGE_PROCESSOR, delete_upload_file, store_uploaded_image
+from ...core.conditional import conditional_get, query_flag_set
+from ...core.pagination import paginate_async
+from ...core.search import event_search_subquery, is_search_index_ready
+from ...core.bulk_events import IMPORT_FORMATS, export_events, import_events, iter_records, resolve_format
+from ...core.loaders import EVENT_READ_OPTIONS, load_for_response
 
 router = APIRouter()
 
+# Yaklaşan etkinlik sıralaması (keyset sayfalama anahtarı, ix_events_active_* indeksleriyle uyumlu)
+EVENT_SORT_KEYS = [(Event.starts_at, False), (Event.id, False)]
 
-@router.get("/", response_model=List[EventList])
-def read_events(
-    db: Session = Depends(deps.get_db),
+# Etkinlik yanıtları kategori bilgisini de içerir; upcoming_only zamana bağlı olduğu için ETag'siz
+events_not_modified = conditional_get("events", "categories", bypass=query_flag_set("upcoming_only"))
+
+
+@router.get("/", response_model=List[EventList], dependencies=[Depends(events_not_modified)])
+async def read_events(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     category_id: Optional[int] = None,
     active_only: bool = True,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    upcoming_only: bool = False,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
 ) -> Any:
-    """Etkinlikleri listele (Public)"""
-    query = db.query(Event).join(Category)
+    """Etkinlikleri listele (Public)
+
+    Arama yapılmadığında `cursor` ile keyset sayfalama desteklenir; bir sonraki
+    sayfanın cursor'ı X-Next-Cursor başlığında döner. `upcoming_only` ve
+    `date_from`/`date_to` (dahil) starts_at üzerinden filtreler.
+    """
+    # Kategori aynı sorguda yüklenir (async session'da lazy load yapılamaz)
+    query = select(Event).join(Event.category).options(contains_eager(Event.category))
     
     if active_only:
         query = query.filter(Event.is_active == True)
@@ -33,7 +55,21 @@ def read_events(
     if category_id:
         query = query.filter(Event.category_id == category_id)
     
-    if search:
+    if upcoming_only:
+        query = query.filter(Event.starts_at >= datetime.now())
+    if date_from:
+        query = query.filter(Event.starts_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        query = query.filter(Event.starts_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    
+    search_results = None
+    if search and is_search_index_ready(db.get_bind()):
+        # FTS5 indeksi üzerinden ara, alaka düzeyine göre sırala
+        search_results = event_search_subquery(search)
+    
+    if search_results is not None:
+        query = query.join(search_results, search_results.c.event_id == Event.id)
+    elif search:
         search_filter = f"%{search}%"
         query = query.filter(
             or_(
@@ -44,32 +80,72 @@ def read_events(
             )
         )
     
-    # Tarihe göre sırala (yaklaşan etkinlikler önce)
-    query = query.order_by(Event.date, Event.time)
+    if search_results is not None:
+        # Alaka sıralaması için offset sayfalama
+        query = query.order_by(search_results.c.rank, Event.starts_at, Event.id)
+        return (await db.scalars(query.offset(skip).limit(limit))).all()
     
-    events = query.offset(skip).limit(limit).all()
-    return events
+    # Tarihe göre sırala (yaklaşan etkinlikler önce)
+    return await paginate_async(db, query, EVENT_SORT_KEYS, limit=limit, skip=skip, cursor=cursor, response=response)
 
 
-@router.get("/featured", response_model=List[EventList])
-def read_featured_events(
-    db: Session = Depends(deps.get_db)
+@router.get("/featured", response_model=List[EventList], dependencies=[Depends(events_not_modified)])
+async def read_featured_events(
+    db: AsyncSession = Depends(deps.get_async_db),
+    upcoming_only: bool = False
 ) -> Any:
     """Öne çıkan etkinlikleri listele (Public)"""
-    events = db.query(Event).join(Category).filter(
+    query = select(Event).join(Event.category).options(contains_eager(Event.category)).filter(
         Event.is_active == True,
         Event.is_featured == True
-    ).order_by(Event.date, Event.time).all()
+    )
+    if upcoming_only:
+        query = query.filter(Event.starts_at >= datetime.now())
+    events = (await db.scalars(query.order_by(Event.starts_at, Event.id))).all()
     return events
 
 
-@router.get("/{event_id}", response_model=EventSchema)
-def read_event(
+@router.post("/import", response_model=EventImportReport)
+def import_events_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    dry_run: bool = False,
+    db: Session = Depends(deps.get_db),
+    current_user: Admin = Depends(deps.get_current_active_admin)
+) -> Any:
+    """CSV veya JSON Lines dosyasından toplu etkinlik ekle (Admin only)
+
+    Format `format` parametresinden ya da dosya uzantısından belirlenir.
+    Kategori `category_id` veya `category` (slug) kolonuyla verilebilir.
+    Hatalı satırlar atlanır ve raporda satır numarasıyla döner; `dry_run`
+    yalnızca doğrulama yapar.
+    """
+    fmt = resolve_format(format, file.filename)
+    return import_events(db, iter_records(file.file, fmt), dry_run=dry_run)
+
+
+@router.get("/export")
+def export_events_file(
+    format: str = "csv",
+    active_only: bool = False,
+    current_user: Admin = Depends(deps.get_current_active_admin)
+) -> Any:
+    """Etkinlikleri CSV veya JSON Lines olarak akış halinde dışa aktar (Admin only)"""
+    fmt = resolve_format(format)
+    return StreamingResponse(
+        export_events(fmt, active_only=active_only),
+        media_type=IMPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="events.{fmt}"'},
+    )
+
+
+@router.get("/{event_id}", response_model=EventSchema, dependencies=[Depends(events_not_modified)])
+async def read_event(
     event_id: int,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ) -> Any:
     """Tek bir etkinlik getir (Public)"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).options(*EVENT_READ_OPTIONS).filter(Event.id == event_id))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -96,8 +172,7 @@ def create_event(
     event = Event(**event_in.dict())
     db.add(event)
     db.commit()
-    db.refresh(event)
-    return event
+    return load_for_response(db, event, EVENT_READ_OPTIONS)
 
 
 @router.put("/{event_id}", response_model=EventSchema)
@@ -130,8 +205,7 @@ def update_event(
     
     event.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(event)
-    return event
+    return load_for_response(db, event, EVENT_READ_OPTIONS)
 
 
 @router.delete("/{event_id}")
@@ -149,10 +223,7 @@ def delete_event(
         )
     
     # Görsel dosyasını sil (eğer varsa ve local ise)
-    if event.image_url and event.image_url.startswith("/uploads/"):
-        file_path = event.image_url.replace("/uploads/", settings.UPLOAD_FOLDER + "/")
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    delete_upload_file(event.image_url, event.image_variants)
     
     db.delete(event)
     db.commit()
@@ -174,52 +245,19 @@ async def upload_event_image(
             detail="Event not found"
         )
     
-    # Dosya uzantısı kontrolü
-    file_extension = file.filename.split(".")[-1].lower()
-    if file_extension not in settings.ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
-        )
-    
-    # Dosya boyutu kontrolü
-    contents = await file.read()
-    if len(contents) > settings.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Max size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
-        )
+    # Görseli blob deposuna al ve süreç havuzunda optimize et (event loop bloklanmaz)
+    image_url, image_variants = await store_uploaded_image(db, file, EVENT_IMAGE_PROCESSOR, bucket="events")
     
-    # Dosya adı oluştur
-    file_name = f"{uuid.uuid4()}.{file_extension}"
-    file_path = os.path.join(settings.UPLOAD_FOLDER, file_name)
-    
-    # Dosyayı kaydet
-    with open(file_path, "wb") as f:
-        f.write(contents)
-    
-    # Görseli optimize et
-    try:
-        img = Image.open(file_path)
-        # Maksimum boyut 1200x800
-        img.thumbnail((1200, 800), Image.Resampling.LANCZOS)
-        img.save(file_path, optimize=True, quality=85)
-    except Exception:
-        # Görsel işlenemezse orijinal haliyle bırak
-        pass
-    
-    # Eski görseli sil (varsa)
-    if event.image_url and event.image_url.startswith("/uploads/"):
-        old_file_path = event.image_url.replace("/uploads/", settings.UPLOAD_FOLDER + "/")
-        if os.path.exists(old_file_path):
-            os.remove(old_file_path)
+    # Eski görseli sil (varsa; blob deposundakiler çöp toplayıcıya bırakılır)
+    await run_in_threadpool(delete_upload_file, event.image_url, event.image_variants)
     
     # Veritabanını güncelle
-    event.image_url = f"/uploads/{file_name}"
+    event.image_url = image_url
+    event.image_variants = image_variants
     db.commit()
     db.refresh(event)
     
-    return {"image_url": event.image_url}
+    return {"image_url": event.image_url, "image_variants": event.image_variants}
 
 
 @router.patch("/{event_id}/toggle-featured")
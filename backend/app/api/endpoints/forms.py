@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Response
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Any
+from typing import List, Any, Optional
 from app import models, schemas
 from app.api import deps
-from app.core.roles import RoleType
+from app.core.permissions import permissions_for, require_club_manager
+from app.core.pagination import paginate
+from app.core.conditional import conditional_get
+from app.core.form_validation import check_form_definition
 
 router = APIRouter()
 
+# Newest first; id breaks ties between forms created in the same second
+FORM_SORT_KEYS = [(models.Form.created_at, True), (models.Form.id, True)]
+
+# Visibility of inactive forms depends on the caller's roles, so validators are per user
+forms_not_modified = conditional_get("forms", "clubs", user_dependency=deps.get_current_active_user)
+
 # Dependency to get and authorize form access for modification/deletion
 async def get_form_for_modification_auth(
     form_id: int = Path(..., description="The ID of the form"),
@@ -17,20 +26,7 @@ async def get_form_for_modification_auth(
     if not form:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
 
-    # Ensure current_user.roles is populated by get_current_active_user from deps.py
-    if not hasattr(current_user, 'roles') or not current_user.roles:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
-
-    is_manager_of_club = any(
-        hasattr(role, 'club_id') and role.role_type == RoleType.CLUB_MANAGER and role.club_id == form.club_id
-        for role in current_user.roles
-    )
-    is_system_admin = any(
-        role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-        for role in current_user.roles
-    )
-    if not (is_manager_of_club or is_system_admin):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to modify this form")
+    require_club_manager(current_user, form.club_id, detail="Not authorized to modify this form")
     return form
 
 @router.post("/", response_model=schemas.form.FormRead, status_code=status.HTTP_201_CREATED)
@@ -45,57 +41,54 @@ def create_form(
     if not club:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Club with id {target_club_id} not found.")
 
-    if not hasattr(current_user, 'roles') or not current_user.roles:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
-
-    is_manager_of_club = any(
-        hasattr(role, 'club_id') and role.role_type == RoleType.CLUB_MANAGER and role.club_id == target_club_id
-        for role in current_user.roles
-    )
-    is_system_admin = any(
-        role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-        for role in current_user.roles
-    )
-    if not (is_manager_of_club or is_system_admin):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to create forms for this club")
-
-    db_form = models.Form(**form_in.model_dump())
+    require_club_manager(current_user, target_club_id, detail="Not authorized to create forms for this club")
+
+    form_data = form_in.model_dump()
+    check_form_definition(form_data["fields_json"]) # e.g. duplicate field names
+    db_form = models.Form(**form_data)
     db.add(db_form)
     db.commit()
     db.refresh(db_form)
     return db_form
 
-@router.get("/club/{club_id}", response_model=List[schemas.form.FormRead])
+@router.get("/club/{club_id}", response_model=List[schemas.form.FormRead], dependencies=[Depends(forms_not_modified)])
 def read_forms_by_club(
     *,
     db: Session = Depends(deps.get_db),
     club_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None, # Opaque keyset cursor from X-Next-Cursor; overrides skip
     current_user: models.User = Depends(deps.get_current_active_user) # Added for consistency, can check roles later
 ) -> List[models.Form]:
     club = db.query(models.Club).filter(models.Club.id == club_id).first()
     if not club:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Club not found")
 
-    # Logic to show all forms (active/inactive) to managers/admins vs only active to others
-    is_manager_of_club = any(
-        hasattr(role, 'club_id') and role.role_type == RoleType.CLUB_MANAGER and role.club_id == club_id
-        for role in current_user.roles
-    )
-    is_system_admin = any(
-        role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-        for role in current_user.roles
-    )
-
+    # Managers/admins see all forms (active/inactive), others only active ones
     query = db.query(models.Form).filter(models.Form.club_id == club_id)
-    if not (is_manager_of_club or is_system_admin):
+    if not permissions_for(current_user).can_manage_club(club_id):
         query = query.filter(models.Form.is_active == True)
 
-    forms = query.order_by(models.Form.created_at.desc()).offset(skip).limit(limit).all()
-    return forms
+    return paginate(query, FORM_SORT_KEYS, limit=limit, skip=skip, cursor=cursor, response=response)
+
+@router.get("/managed", response_model=List[schemas.form.FormRead], dependencies=[Depends(forms_not_modified)])
+def read_managed_forms(
+    *,
+    db: Session = Depends(deps.get_db),
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None, # Opaque keyset cursor from X-Next-Cursor; overrides skip
+    current_user: models.User = Depends(deps.get_current_active_user)
+) -> List[models.Form]:
+    # All forms (active/inactive) of every club the caller manages; the permission check runs in SQL
+    permissions = permissions_for(current_user)
+    query = db.query(models.Form).filter(permissions.club_clause(models.Form.club_id))
+    return paginate(query, FORM_SORT_KEYS, limit=limit, skip=skip, cursor=cursor, response=response)
 
-@router.get("/{form_id}", response_model=schemas.form.FormRead)
+@router.get("/{form_id}", response_model=schemas.form.FormRead, dependencies=[Depends(forms_not_modified)])
 def read_form(
     *,
     db: Session = Depends(deps.get_db),
@@ -107,15 +100,7 @@ def read_form(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found.")
 
     if not db_form.is_active:
-        is_manager_of_club = any(
-            hasattr(role, 'club_id') and role.role_type == RoleType.CLUB_MANAGER and role.club_id == db_form.club_id
-            for role in current_user.roles
-        )
-        is_system_admin = any(
-            role.role_type == RoleType.ADMIN or role.role_type == RoleType.SUPER_ADMIN
-            for role in current_user.roles
-        )
-        if not (is_manager_of_club or is_system_admin):
+        if not permissions_for(current_user).can_manage_club(db_form.club_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="This form is currently not active.")
     return db_form
 
@@ -127,6 +112,8 @@ def update_form(
     target_form: models.Form = Depends(get_form_for_modification_auth)
 ) -> models.Form:
     update_data = form_in.model_dump(exclude_unset=True)
+    if update_data.get("fields_json") is not None:
+        check_form_definition(update_data["fields_json"])
     for field, value in update_data.items():
         setattr(target_form, field, value)
     # db.add(target_form) # Not strictly necessary if target_form is already in session and modified
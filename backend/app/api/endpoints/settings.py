@@ -1,26 +1,29 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ...api import deps
 from ...models import Settings, Admin
 from ...schemas.settings import Settings as SettingsSchema, SettingsUpdate
+from ...core.conditional import conditional_get
 
 router = APIRouter()
 
 
-@router.get("/", response_model=SettingsSchema)
-def get_settings(
-    db: Session = Depends(deps.get_db),
+@router.get("/", response_model=SettingsSchema, dependencies=[Depends(conditional_get("settings"))])
+async def get_settings(
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """Site ayarlarını getir (Public)"""
-    settings = db.query(Settings).first()
+    settings = await db.scalar(select(Settings).limit(1))
     if not settings:
         # Eğer ayarlar yoksa varsayılan ayarları oluştur
         settings = Settings()
         db.add(settings)
-        db.commit()
-        db.refresh(settings)
+        await db.commit()
+        await db.refresh(settings)
     return settings
 
 
@@ -1,26 +1,27 @@
 from typing import List, Any
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
-import os
-import uuid
-from PIL import Image
+from starlette.concurrency import run_in_threadpool
 
 from ...api import deps
 from ...models import Story, Admin
 from ...schemas.story import Story as StorySchema, StoryCreate, StoryUpdate
-from ...core.config import settings
+from ...core.images import STORY_IMAGE_PROCESSOR, delete_upload_file, store_uploaded_image
+from ...core.sweeper import story_sweeper
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[StorySchema])
-def read_stories(
-    db: Session = Depends(deps.get_db),
+async def read_stories(
+    db: AsyncSession = Depends(deps.get_async_db),
     active_only: bool = True
 ) -> Any:
     """Storyleri listele (Public)"""
-    query = db.query(Story)
+    query = select(Story)
     
     if active_only:
         # Aktif ve süresi dolmamış storyleri getir
@@ -31,18 +32,18 @@ def read_stories(
         )
     
     # Sıralama indexine göre sırala
-    stories = query.order_by(Story.order_index, Story.created_at.desc()).all()
+    stories = (await db.scalars(query.order_by(Story.order_index, Story.created_at.desc()))).all()
     
     return stories
 
 
 @router.get("/{story_id}", response_model=StorySchema)
-def read_story(
+async def read_story(
     story_id: int,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ) -> Any:
     """Tek bir story getir (Public)"""
-    story = db.query(Story).filter(Story.id == story_id).first()
+    story = await db.get(Story, story_id)
     if not story:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,10 +105,7 @@ def delete_story(
         )
     
     # Görsel dosyasını sil (eğer varsa ve local ise)
-    if story.image_url and story.image_url.startswith("/uploads/"):
-        file_path = story.image_url.replace("/uploads/", settings.UPLOAD_FOLDER + "/")
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    delete_upload_file(story.image_url, story.image_variants)
     
     db.delete(story)
     db.commit()
@@ -129,80 +127,28 @@ async def upload_story_image(
             detail="Story not found"
         )
     
-    # Dosya uzantısı kontrolü
-    file_extension = file.filename.split(".")[-1].lower()
-    if file_extension not in settings.ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
-        )
-    
-    # Dosya boyutu kontrolü
-    contents = await file.read()
-    if len(contents) > settings.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Max size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
-        )
-    
-    # Dosya adı oluştur
-    file_name = f"story_{uuid.uuid4()}.{file_extension}"
-    file_path = os.path.join(settings.UPLOAD_FOLDER, file_name)
+    # Görseli blob deposuna al, süreç havuzunda kare kırp ve optimize et (event loop bloklanmaz)
+    image_url, image_variants = await store_uploaded_image(db, file, STORY_IMAGE_PROCESSOR, bucket="stories")
     
-    # Dosyayı kaydet
-    with open(file_path, "wb") as f:
-        f.write(contents)
-    
-    # Görseli optimize et (stories için kare format)
-    try:
-        img = Image.open(file_path)
-        # Stories için 1:1 oran, maksimum 800x800
-        size = min(img.width, img.height)
-        left = (img.width - size) // 2
-        top = (img.height - size) // 2
-        right = left + size
-        bottom = top + size
-        
-        img_cropped = img.crop((left, top, right, bottom))
-        img_cropped.thumbnail((800, 800), Image.Resampling.LANCZOS)
-        img_cropped.save(file_path, optimize=True, quality=85)
-    except Exception:
-        # Görsel işlenemezse orijinal haliyle bırak
-        pass
-    
-    # Eski görseli sil (varsa)
-    if story.image_url and story.image_url.startswith("/uploads/"):
-        old_file_path = story.image_url.replace("/uploads/", settings.UPLOAD_FOLDER + "/")
-        if os.path.exists(old_file_path):
-            os.remove(old_file_path)
+    # Eski görseli sil (varsa; blob deposundakiler çöp toplayıcıya bırakılır)
+    await run_in_threadpool(delete_upload_file, story.image_url, story.image_variants)
     
     # Veritabanını güncelle
-    story.image_url = f"/uploads/{file_name}"
+    story.image_url = image_url
+    story.image_variants = image_variants
     db.commit()
     db.refresh(story)
     
-    return {"image_url": story.image_url}
+    return {"image_url": story.image_url, "image_variants": story.image_variants}
 
 
 @router.delete("/expired/cleanup")
 def cleanup_expired_stories(
-    db: Session = Depends(deps.get_db),
     current_user: Admin = Depends(deps.get_current_active_user)
 ) -> Any:
-    """Süresi dolmuş storyleri temizle (Admin only)"""
-    current_time = datetime.utcnow()
-    expired_stories = db.query(Story).filter(Story.expires_at < current_time).all()
-    
-    deleted_count = 0
-    for story in expired_stories:
-        # Görsel dosyasını sil
-        if story.image_url and story.image_url.startswith("/uploads/"):
-            file_path = story.image_url.replace("/uploads/", settings.UPLOAD_FOLDER + "/")
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        
-        db.delete(story)
-        deleted_count += 1
-    
-    db.commit()
-    return {"message": f"{deleted_count} expired stories cleaned up"}
+    """Süresi dolmuş storyleri hemen temizle (Admin only).
+
+    Aynı temizlik arka planda STORY_SWEEP_INTERVAL_SECONDS aralıklarla çalışır.
+    """
+    report = story_sweeper.sweep()
+    return {"message": f"{report['deleted']} expired stories cleaned up", **report}
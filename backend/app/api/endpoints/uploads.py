@@ -0,0 +1,34 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from ...api import deps
+from ...models import Admin
+from ...core.blobs import blob_stats, collect_garbage, reconcile_ref_counts
+
+router = APIRouter()
+
+
+@router.get("/stats")
+def read_upload_stats(
+    db: Session = Depends(deps.get_db),
+    current_user: Admin = Depends(deps.get_current_active_admin)
+) -> Any:
+    """Blob deposu istatistikleri (Admin only)"""
+    return blob_stats(db)
+
+
+@router.post("/gc")
+def collect_upload_garbage(
+    reconcile: bool = False,
+    db: Session = Depends(deps.get_db),
+    current_user: Admin = Depends(deps.get_current_active_admin)
+) -> Any:
+    """Referansı kalmamış yüklemeleri sil (Admin only).
+
+    reconcile=true ise önce tüm referans sayaçları yeniden hesaplanır.
+    """
+    fixed = reconcile_ref_counts(db) if reconcile else 0
+    result = collect_garbage(db)
+    result["reconciled"] = fixed
+    return result
@@ -4,6 +4,7 @@ from typing import List
 from app import models, schemas
 from app.api import deps
 from app.core.roles import RoleType
+from app.core.permissions import permissions_for
 
 router = APIRouter()
 
@@ -90,8 +91,9 @@ def remove_user_role(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role assignment not found.")
 
     # Check permissions
-    current_user_is_super_admin = any(r.role_type == RoleType.SUPER_ADMIN for r in current_user.roles)
-    current_user_is_admin = any(r.role_type == RoleType.ADMIN for r in current_user.roles)
+    permissions = permissions_for(current_user)
+    current_user_is_super_admin = permissions.is_super_admin
+    current_user_is_admin = permissions.is_system_admin
 
     can_delete = False
 
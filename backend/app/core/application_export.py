@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import select
+
+from . import database
+from .xlsx import XLSX_MEDIA_TYPE, iter_xlsx
+from ..models import Application, ApplicationFile, User
+
+# Form başvurularının CSV/XLSX olarak akış halinde dışa aktarılması.
+# Başvurular yield_per ile parti parti okunur; her partinin dosyaları tek
+# sorguyla alınır. data_json, Form.fields_json'daki alan sırasına göre
+# kolonlara açılır; sonuç kümesi hiçbir zaman bütünüyle belleğe alınmaz.
+
+EXPORT_FORMATS = {"csv": "text/csv", "xlsx": XLSX_MEDIA_TYPE}
+EXPORT_BATCH_SIZE = 500
+
+BASE_HEADER = ("Application ID", "Submitted At", "Status", "User ID", "Email", "Full Name")
+
+# Tablolama programlarında formül olarak yorumlanabilecek başlangıçlar (CSV injection)
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def export_layout(fields_json: Sequence[Any]) -> Tuple[List[str], List[str]]:
+    """(başlık, data_json anahtarları) döndür; kolon sırası formdaki alan sırasıdır"""
+    header = list(BASE_HEADER)
+    field_names = []
+    for field in fields_json or []:
+        if isinstance(field, dict) and field.get("name"):
+            field_names.append(field["name"])
+            header.append(field.get("label") or field["name"])
+    header.append("Files")
+    return header, field_names
+
+
+def _flatten(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(_flatten(item)) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def iter_application_rows(form_id: int, field_names: Sequence[str]) -> Iterator[List[Any]]:
+    """Başvuruları düz satırlar halinde üret; akış boyunca kendi session'ını kullanır"""
+    statement = (
+        select(
+            Application.id, Application.submitted_at, Application.status, Application.user_id,
+            Application.data_json, User.email, User.full_name,
+        )
+        .outerjoin(User, User.id == Application.user_id)
+        .where(Application.form_id == form_id)
+        .order_by(Application.submitted_at, Application.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    db = database.primary_session()
+    try:
+        for partition in db.execute(statement).partitions():
+            files: Dict[int, List[str]] = defaultdict(list)
+            file_rows = db.execute(
+                select(ApplicationFile.application_id, ApplicationFile.original_file_name)
+                .where(ApplicationFile.application_id.in_([row.id for row in partition]))
+                .order_by(ApplicationFile.id)
+            )
+            for application_id, file_name in file_rows:
+                files[application_id].append(file_name or "")
+            for row in partition:
+                data = row.data_json if isinstance(row.data_json, dict) else {}
+                yield [
+                    row.id, row.submitted_at, row.status, row.user_id, row.email, row.full_name,
+                    *(_flatten(data.get(name)) for name in field_names),
+                    "; ".join(files.get(row.id, ())),
+                ]
+    finally:
+        db.close()
+
+
+def _csv_safe(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(header: Sequence[Any], rows: Iterator[Sequence[Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for index, row in enumerate(rows, start=1):
+        writer.writerow([_csv_safe(value) for value in row])
+        if index % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_applications(form_id: int, fields_json: Sequence[Any], fmt: str, sheet_name: str = "Applications") -> Iterator[Any]:
+    """Formun başvurularını istenen formatta parça parça üret"""
+    header, field_names = export_layout(fields_json)
+    rows = iter_application_rows(form_id, field_names)
+    if fmt == "xlsx":
+        return iter_xlsx(header, rows, sheet_name=sheet_name)
+    return iter_csv(header, rows)
@@ -0,0 +1,312 @@
+import os
+import re
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, attributes
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+from .database import writer_bind
+from .uploads import save_upload_stream
+from ..models import ApplicationFile, Blob, Event, Story
+
+# İçerik adresli yükleme deposu. Dosyalar içeriklerinin SHA-256 özetiyle
+# "<kök>/blobs/<bucket>/ab/cd/<sha256>.<uzantı>" yolunda bir kez saklanır;
+# aynı afiş ya da CV tekrar yüklendiğinde mevcut dosya (ve varyantları)
+# kullanılır. blobs.ref_count, referans kolonlarına yapılan ORM yazımlarıyla
+# aynı transaction içinde güncellenir; referansı kalmayan kayıtlar
+# collect_garbage ile silinir.
+
+BLOB_DIRNAME = "blobs"
+BLOB_URL_PREFIX = f"/uploads/{BLOB_DIRNAME}/"
+INCOMING_DIRNAME = ".incoming"
+
+# Görseller /uploads altından public sunulur; başvuru dosyaları UPLOAD_DIR'de kalır
+PRIVATE_BUCKETS = frozenset({"applications"})
+
+# Blob referansı tutan kolonlar
+REFERENCE_COLUMNS = (
+    (Event, "image_url"),
+    (Story, "image_url"),
+    (ApplicationFile, "file_path"),
+)
+
+_EXTENSION_RE = re.compile(r"^[a-z0-9]{1,10}$")
+
+_blobs = Blob.__table__
+
+
+def _bucket_root(bucket: str) -> str:
+    root = settings.UPLOAD_DIR if bucket in PRIVATE_BUCKETS else settings.UPLOAD_FOLDER
+    return os.path.join(os.path.abspath(root), BLOB_DIRNAME)
+
+
+def safe_extension(filename: Optional[str], default: str = "bin") -> str:
+    """Dosya adından güvenli (küçük harf, alfanümerik) uzantı çıkar"""
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    return extension if _EXTENSION_RE.match(extension) else default
+
+
+def blob_key(bucket: str, sha256: str, extension: str) -> str:
+    return f"{bucket}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{extension}"
+
+
+def blob_path(key: str) -> str:
+    """Blob anahtarının diskteki mutlak yolu"""
+    bucket = key.split("/", 1)[0]
+    return os.path.join(_bucket_root(bucket), *key.split("/"))
+
+
+def blob_reference(key: str) -> str:
+    """Modellerde saklanan referans: public bucket'lar için URL, diğerleri için dosya yolu"""
+    if key.split("/", 1)[0] in PRIVATE_BUCKETS:
+        return blob_path(key)
+    return BLOB_URL_PREFIX + key
+
+
+def reference_key(value: Optional[str]) -> Optional[str]:
+    """image_url / file_path değeri bir blob'u gösteriyorsa anahtarını döndür"""
+    if not value:
+        return None
+    if value.startswith(BLOB_URL_PREFIX):
+        return value[len(BLOB_URL_PREFIX):]
+    for bucket in PRIVATE_BUCKETS:
+        root = _bucket_root(bucket) + os.sep
+        path = os.path.abspath(value)
+        if path.startswith(root):
+            return os.path.relpath(path, root[:-1]).replace(os.sep, "/")
+    return None
+
+
+def is_blob_reference(value: Optional[str]) -> bool:
+    return reference_key(value) is not None
+
+
+def _discard(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def ingest_upload(
+    db: Session,
+    file: UploadFile,
+    bucket: str,
+    extension: str,
+    max_size: int = settings.MAX_FILE_SIZE,
+    prepare: Optional[Callable[[str, str], Awaitable[Optional[dict]]]] = None,
+) -> Blob:
+    """Yüklemeyi depoya al; aynı içerik zaten varsa mevcut blob'u döndür.
+
+    prepare(key, path) yeni içerik için bir kez çalışır (örn. görsel işleme) ve
+    dönen değer blob.meta olarak saklanır. Blob kaydı çağıranın transaction'ından
+    bağımsız, kısa bir oturumda yazılır.
+    """
+    incoming = os.path.join(_bucket_root(bucket), INCOMING_DIRNAME, f"{uuid.uuid4()}.{extension}")
+    stored = await save_upload_stream(file, incoming, max_size)
+    key = blob_key(bucket, stored.sha256, extension)
+    path = blob_path(key)
+
+    with Session(bind=writer_bind(db), expire_on_commit=False) as blob_db:
+        blob = blob_db.get(Blob, key)
+        if blob is not None and os.path.exists(path):
+            # Tekrar yükleme: dosya zaten var; GC bekleme süresi yeniden başlar
+            await run_in_threadpool(_discard, incoming)
+            blob.updated_at = datetime.utcnow()
+            blob_db.commit()
+            return blob
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        await run_in_threadpool(os.replace, incoming, path)
+        meta = await prepare(key, path) if prepare is not None else None
+        size = os.path.getsize(path)
+
+        if blob is not None:
+            # Kayıt var ama dosya kaybolmuş: dosyayı yeniden oluştur
+            blob.meta, blob.size, blob.updated_at = meta, size, datetime.utcnow()
+            blob_db.commit()
+            return blob
+
+        blob = Blob(key=key, sha256=stored.sha256, size=size, ref_count=0, meta=meta)
+        blob_db.add(blob)
+        try:
+            blob_db.commit()
+        except IntegrityError:
+            # Aynı içerik eşzamanlı yüklendi; diğer isteğin kaydını kullan
+            blob_db.rollback()
+            blob = blob_db.get(Blob, key)
+        return blob
+
+
+def _blob_files(blob: Blob) -> List[str]:
+    paths = [blob_path(blob.key)]
+    for variant in (blob.meta or {}).get("variants", []):
+        key = reference_key(variant.get("url"))
+        if key:
+            paths.append(blob_path(key))
+    return list(dict.fromkeys(paths))
+
+
+def count_references(db: Session, key: str) -> int:
+    """Blob'a modellerden gerçekte kaç referans olduğunu say"""
+    reference = blob_reference(key)
+    return sum(
+        db.query(func.count()).select_from(model).filter(getattr(model, column) == reference).scalar()
+        for model, column in REFERENCE_COLUMNS
+    )
+
+
+def reconcile_ref_counts(db: Session) -> int:
+    """Tüm sayaçları referans kolonlarından yeniden hesapla; düzeltilen kayıt sayısını döndür"""
+    counts: Dict[str, int] = {}
+    for model, column in REFERENCE_COLUMNS:
+        attribute = getattr(model, column)
+        rows = db.execute(select(attribute, func.count()).where(attribute.isnot(None)).group_by(attribute)).all()
+        for value, count in rows:
+            key = reference_key(value)
+            if key:
+                counts[key] = counts.get(key, 0) + count
+    fixed = 0
+    for blob in db.query(Blob).all():
+        expected = counts.get(blob.key, 0)
+        if blob.ref_count != expected:
+            blob.ref_count = expected
+            fixed += 1
+    db.commit()
+    return fixed
+
+
+def collect_garbage(db: Session, grace_seconds: int = settings.BLOB_GC_GRACE_SECONDS) -> dict:
+    """Referansı kalmamış ve bekleme süresini doldurmuş blob'ları (varyantlarıyla) sil.
+
+    Aday seçimiyle silme arasında eşzamanlı bir yükleme updated_at'i, yeni bir
+    referans ref_count'u artırmış olabilir; bu yüzden her satır aynı koşullarla
+    yeniden doğrulanarak silinir. Dosyalar ancak silme commit edildikten sonra
+    kaldırılır.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    candidates = db.query(Blob).filter(Blob.ref_count <= 0, Blob.updated_at < cutoff).all()
+    removed = []
+    for blob in candidates:
+        references = count_references(db, blob.key)
+        if references:
+            # Sayaç kaymış (örn. ORM dışı yazım); silmek yerine düzelt
+            blob.ref_count = references
+            continue
+        files, size = _blob_files(blob), blob.size
+        result = db.execute(
+            _blobs.delete().where(
+                _blobs.c.key == blob.key, _blobs.c.ref_count <= 0, _blobs.c.updated_at < cutoff
+            )
+        )
+        if result.rowcount:
+            removed.append((blob.key, files, size))
+            db.expunge(blob)  # satır Core ile silindi; oturum nesneyi yeniden yüklemeye çalışmasın
+    db.commit()
+
+    reclaimed_bytes = 0
+    for key, files, size in removed:
+        if db.execute(select(_blobs.c.key).where(_blobs.c.key == key)).first() is not None:
+            # Silmeden sonra aynı içerik yeniden yüklendi; dosyalar artık yeni kayda ait
+            continue
+        for path in files:
+            _discard(path)
+        reclaimed_bytes += size
+    db.commit()
+    return {"deleted": len(removed), "reclaimed_bytes": reclaimed_bytes}
+
+
+def blob_stats(db: Session) -> dict:
+    total, stored_bytes, references = db.query(
+        func.count(Blob.key), func.coalesce(func.sum(Blob.size), 0), func.coalesce(func.sum(Blob.ref_count), 0)
+    ).one()
+    unreferenced = db.query(func.count(Blob.key)).filter(Blob.ref_count <= 0).scalar()
+    return {
+        "blobs": total,
+        "stored_bytes": stored_bytes,
+        "references": references,
+        "unreferenced": unreferenced,
+    }
+
+
+def apply_reference_deltas(connection, deltas: Dict[str, int]) -> None:
+    """Blob sayaçlarını çağıranın transaction'ı içinde güncelle (anahtar sırasıyla, kilit sırası sabit)"""
+    now = datetime.utcnow()
+    for key, delta in sorted(deltas.items()):
+        if delta:
+            connection.execute(
+                _blobs.update()
+                .where(_blobs.c.key == key)
+                .values(ref_count=_blobs.c.ref_count + delta, updated_at=now)
+            )
+
+
+def _reference_deltas(values: Iterable[Optional[str]], step: int) -> Dict[str, int]:
+    deltas: Dict[str, int] = {}
+    for value in values:
+        key = reference_key(value)
+        if key:
+            deltas[key] = deltas.get(key, 0) + step
+    return deltas
+
+
+def acquire_references(connection, values: Iterable[Optional[str]]) -> None:
+    """ORM dışında (toplu INSERT ile) eklenen kayıtların blob referanslarını artır"""
+    apply_reference_deltas(connection, _reference_deltas(values, 1))
+
+
+def release_references(connection, values: Iterable[Optional[str]]) -> None:
+    """ORM dışında (toplu DELETE ile) silinen kayıtların blob referanslarını düş"""
+    apply_reference_deltas(connection, _reference_deltas(values, -1))
+
+
+# Referans kolonu değiştirilirken eski değerin de yüklenmesini sağla (sayaç düşümü için)
+def _load_previous_reference(target, value, oldvalue, initiator):
+    return value
+
+
+for _model, _column in REFERENCE_COLUMNS:
+    event.listen(getattr(_model, _column), "set", _load_previous_reference, active_history=True, retval=True)
+
+
+def _reference_values(instance, column: str, state: str) -> List[str]:
+    history = attributes.get_history(instance, column)
+    if state == "new":
+        return list(history.added)
+    if state == "deleted":
+        if not (history.deleted or history.unchanged or history.added):
+            getattr(instance, column)  # süresi dolmuş nesne: mevcut değeri yükle
+            history = attributes.get_history(instance, column)
+        return list(history.deleted or history.unchanged)
+    return []
+
+
+@event.listens_for(Session, "before_flush")
+def _track_blob_references(session, flush_context, instances):
+    deltas: Dict[str, int] = {}
+
+    def count(values, step):
+        for value in values:
+            key = reference_key(value)
+            if key:
+                deltas[key] = deltas.get(key, 0) + step
+
+    for model, column in REFERENCE_COLUMNS:
+        for instance in session.new:
+            if isinstance(instance, model):
+                count(_reference_values(instance, column, "new"), 1)
+        for instance in session.dirty:
+            if isinstance(instance, model):
+                history = attributes.get_history(instance, column)
+                count(history.added, 1)
+                count(history.deleted, -1)
+        for instance in session.deleted:
+            if isinstance(instance, model):
+                count(_reference_values(instance, column, "deleted"), -1)
+
+    if any(deltas.values()):
+        apply_reference_deltas(session.connection(), deltas)
@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from . import database
+from .blobs import acquire_references
+from .search import index_events
+from ..models import Category, Event
+from ..models.event import compose_starts_at
+from ..schemas.event import EventCreate
+
+# Toplu etkinlik içe/dışa aktarma (CSV veya JSON Lines).
+# İçe aktarmada dosya satır satır okunur, satırlar parti parti EventCreate ile
+# doğrulanır ve her parti tek bir INSERT ... RETURNING (executemany) ile eklenir.
+# Kategoriler (id veya slug) tek sorguyla çözülür. Hatalı satırlar atlanır ve
+# satır numarasıyla raporlanır; geçerli satırlar tek transaction'da commit edilir.
+
+IMPORT_FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+IMPORT_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+# Dışa aktarılan kolonlar; "category" kategori slug'ıdır. Çıktı aynen geri içe aktarılabilir (id yok sayılır).
+EXPORT_FIELDS = (
+    "id", "title", "description", "date", "time", "location", "organizer", "category_id", "category",
+    "image_url", "latitude", "longitude", "address", "requires_registration", "registration_link",
+    "is_active", "is_featured",
+)
+
+Record = Tuple[int, Any]  # (dosyadaki satır numarası, satır sözlüğü veya ayrıştırma hatası)
+
+
+def resolve_format(explicit: Optional[str], filename: Optional[str] = None) -> str:
+    """Açıkça verilen veya dosya uzantısından çıkarılan formatı döndür; desteklenmiyorsa 400"""
+    fmt = (explicit or "").lower()
+    if not fmt and filename and "." in filename:
+        fmt = filename.rsplit(".", 1)[-1].lower()
+        fmt = "jsonl" if fmt in ("ndjson", "json") else fmt
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format. Supported formats: {sorted(IMPORT_FORMATS)}"
+        )
+    return fmt
+
+
+def iter_records(binary_file: BinaryIO, fmt: str) -> Iterator[Record]:
+    """Dosyayı belleğe almadan satır satır oku"""
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                # Boş hücreler alanın verilmediği anlamına gelir (şema varsayılanları uygulanır)
+                yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+            return
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, f"Invalid JSON: {e}"
+                continue
+            yield line_number, record if isinstance(record, dict) else "Each line must be a JSON object"
+    finally:
+        text.detach()  # UploadFile'ın kendi dosyasını kapatmaz
+
+
+def _format_errors(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}" for item in error.errors()]
+
+
+def _prepare_row(record: Any, category_ids: set, category_slugs: Dict[str, int]) -> Tuple[Optional[dict], List[str]]:
+    if not isinstance(record, dict):
+        return None, [str(record)]
+    record = dict(record)
+    record.pop("id", None)
+    slug = record.pop("category", None)
+    if record.get("category_id") in (None, "") and slug:
+        if slug not in category_slugs:
+            return None, [f"category: unknown category slug '{slug}'"]
+        record["category_id"] = category_slugs[slug]
+    try:
+        event_in = EventCreate.model_validate(record)
+    except ValidationError as e:
+        return None, _format_errors(e)
+    if event_in.category_id not in category_ids:
+        return None, ["category_id: Invalid category ID"]
+    values = event_in.model_dump()
+    values["starts_at"] = compose_starts_at(event_in.date, event_in.time)
+    return values, []
+
+
+def _insert_batch(db: Session, rows: List[dict]) -> int:
+    # executemany tarzı toplu ekleme; flush ve mapper olayları çalışmadığı için
+    # arama indeksi ve blob referans sayaçları burada, aynı transaction içinde güncellenir
+    events = db.scalars(insert(Event).returning(Event), rows).all()
+    connection = db.connection()
+    index_events(connection, events)
+    acquire_references(connection, (item.image_url for item in events))
+    return len(events)
+
+
+def import_events(db: Session, records: Iterator[Record], dry_run: bool = False) -> dict:
+    """Kayıtları doğrula ve ekle; satır bazlı hata raporu döndür"""
+    categories = db.execute(select(Category.id, Category.slug)).all()
+    category_ids = {row.id for row in categories}
+    category_slugs = {row.slug: row.id for row in categories}
+
+    total = imported = failed = 0
+    errors: List[dict] = []
+    batch: List[dict] = []
+    try:
+        for line_number, record in records:
+            total += 1
+            values, row_errors = _prepare_row(record, category_ids, category_slugs)
+            if row_errors:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": line_number, "errors": row_errors})
+                continue
+            batch.append(values)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported += len(batch) if dry_run else _insert_batch(db, batch)
+                batch = []
+        if batch:
+            imported += len(batch) if dry_run else _insert_batch(db, batch)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be UTF-8 encoded")
+    except csv.Error as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV: {e}")
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return {
+        "total": total,
+        "imported": imported,
+        "failed": failed,
+        "dry_run": dry_run,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else value
+
+
+def export_events(fmt: str, active_only: bool = False) -> Iterator[str]:
+    """Etkinlikleri parça parça (CSV veya JSONL) üret; yanıt akışı boyunca kendi session'ını kullanır"""
+    columns = [Event.__table__.c[name] for name in EXPORT_FIELDS if name != "category"]
+    statement = (
+        select(*columns, Category.slug.label("category"))
+        .join(Category, Category.id == Event.category_id)
+        .order_by(Event.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if active_only:
+        statement = statement.where(Event.is_active == True)
+
+    db = database.primary_session()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(EXPORT_FIELDS)
+        for partition in db.execute(statement).partitions():
+            for row in partition:
+                values = row._mapping
+                if fmt == "csv":
+                    writer.writerow([_csv_value(values[name]) for name in EXPORT_FIELDS])
+                else:
+                    buffer.write(json.dumps({name: values[name] for name in EXPORT_FIELDS}, ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .conditional import etag_matches
+from ..models import Category, Event, Settings, Story
+
+# Public GET yanıtları için süreli (TTL) ve boyut sınırlı LRU önbellek.
+# Her worker süreci kendi önbelleğini tutar; geçersizleştirme yereldir,
+# diğer worker'lar en geç TTL sonunda güncellenir.
+
+# Model değiştiğinde geçersiz kılınacak etiketler (etkinlik listeleri kategori bilgisini de içerir)
+TAGS_BY_MODEL = {
+    Event: ("events",),
+    Category: ("categories", "events"),
+    Story: ("stories",),
+    Settings: ("settings",),
+}
+
+CacheEntry = Tuple[float, int, List[Tuple[bytes, bytes]], bytes]  # (bitiş, status, headers, body)
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._keys_by_tag: Dict[str, set] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Kayıt varsa ve süresi dolmadıysa döndür"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Etiketlerin mevcut sürümü (istek başında alınır)"""
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(self, key: str, tags: Sequence[str], generation: Tuple[int, ...],
+            status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> bool:
+        """Yanıtı sakla; istek sırasında etiketler geçersiz kılındıysa saklamaz"""
+        with self._lock:
+            if tuple(self._generations.get(tag, 0) for tag in tags) != generation:
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, status, headers, body)
+            self._entries.move_to_end(key)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, *tags: str) -> None:
+        """Etiketlere bağlı tüm kayıtları sil"""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._keys_by_tag.pop(tag, set()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            for tag in list(self._generations):
+                self._generations[tag] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+        for keys in self._keys_by_tag.values():
+            keys.discard(key)
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    """path + sıralanmış query parametrelerinden anahtar üret"""
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+class ResponseCacheMiddleware:
+    """Belirli GET yollarının 200 yanıtlarını önbellekten sunan ASGI middleware"""
+
+    def __init__(self, app, routes: Dict[str, Sequence[str]], cache: ResponseCache = response_cache,
+                 bypass: Optional[Dict[str, Callable[[Request], bool]]] = None):
+        self.app = app
+        self.routes = routes  # yol -> etiketler
+        self.cache = cache
+        # yol -> True dönerse önbelleğe bakılmaz ve yazılmaz (zamana bağlı yanıtlar; conditional_get ile aynı)
+        self.bypass = bypass or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        bypass = self.bypass.get(scope["path"])
+        if bypass is not None and bypass(Request(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        tags = self.routes[scope["path"]]
+        key = cache_key(scope["path"], scope.get("query_string", b""))
+        entry = self.cache.get(key)
+        if entry is not None:
+            _, status, headers, body = entry
+            etag = next((value.decode("latin-1") for name, value in headers if name == b"etag"), None)
+            if_none_match = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"if-none-match"), None)
+            if etag_matches(if_none_match, etag):
+                # İstemcideki kopya güncel: gövde gönderilmeden 304
+                validators = [(name, value) for name, value in headers if name in (b"etag", b"last-modified", b"cache-control")]
+                await send({"type": "http.response.start", "status": 304,
+                            "headers": validators + [(b"x-cache", b"HIT")]})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({"type": "http.response.start", "status": status,
+                        "headers": headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        generation = self.cache.generation(tags)
+        captured = {"status": None, "headers": [], "body": []}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+                message = dict(message)
+                message["headers"] = captured["headers"] + [(b"x-cache", b"MISS")]
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+                if not message.get("more_body", False) and captured["status"] == 200:
+                    self.cache.set(key, tags, generation, captured["status"],
+                                   captured["headers"], b"".join(captured["body"]))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# ORM üzerinden yapılan her commit, değişen modellerin etiketlerini geçersiz kılar
+@event.listens_for(Session, "after_flush")
+def _collect_invalidated_tags(session, flush_context):
+    tags = session.info.setdefault("response_cache_tags", set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        tags.update(TAGS_BY_MODEL.get(type(instance), ()))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tags(orm_execute_state):
+    # query.update()/query.delete() ve session.execute(insert(...)) gibi toplu işlemler flush'tan geçmez
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            tags = orm_execute_state.session.info.setdefault("response_cache_tags", set())
+            tags.update(TAGS_BY_MODEL.get(mapper.class_, ()))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("response_cache_tags", None)
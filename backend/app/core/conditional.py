@@ -0,0 +1,209 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..api import deps
+from ..models import TableVersion
+
+# Koşullu GET (ETag / Last-Modified -> 304) desteği.
+# Doğrulayıcılar table_versions tablosundaki sayaçlardan türetilir. Sayaçlar
+# yazma işlemiyle aynı transaction içinde artırıldığı için tüm worker'larda
+# tutarlıdır ve doğrulama tek bir birincil anahtar sorgusuyla yapılır.
+
+TRACKED_TABLES = frozenset({"events", "categories", "settings", "clubs", "forms", "stories"})
+
+_table_versions = TableVersion.__table__
+
+
+def bump_table_versions(connection, tables: Iterable[str]) -> None:
+    """Verilen tabloların sayacını artır (yoksa oluştur)"""
+    now = datetime.utcnow()
+    for table_name in sorted(set(tables)):
+        dialect = connection.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+            statement = insert(_table_versions).values(table_name=table_name, version=1, updated_at=now)
+            statement = statement.on_conflict_do_update(
+                index_elements=[_table_versions.c.table_name],
+                set_={"version": _table_versions.c.version + 1, "updated_at": now},
+            )
+            connection.execute(statement)
+            continue
+        result = connection.execute(
+            _table_versions.update()
+            .where(_table_versions.c.table_name == table_name)
+            .values(version=_table_versions.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(_table_versions.insert().values(table_name=table_name, version=1, updated_at=now))
+
+
+def read_table_versions(db: Session, tables: Iterable[str]) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """Tabloların (sürüm, son değişiklik) bilgisini oku"""
+    rows = db.execute(_table_versions_statement(tables)).all()
+    return {row.table_name: (row.version, row.updated_at) for row in rows}
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match başlığı ETag ile (zayıf karşılaştırma) eşleşiyor mu"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = _strip_weak(etag)
+    return any(_strip_weak(candidate) == target for candidate in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP tarihleri saniye hassasiyetindedir
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def _route_key(request: Request) -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _table_versions_statement(tables: Iterable[str]):
+    return (
+        select(_table_versions.c.table_name, _table_versions.c.version, _table_versions.c.updated_at)
+        .where(_table_versions.c.table_name.in_(list(tables)))
+    )
+
+
+async def read_table_versions_async(db: AsyncSession, tables: Iterable[str]) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """read_table_versions'ın AsyncSession karşılığı"""
+    rows = (await db.execute(_table_versions_statement(tables))).all()
+    return {row.table_name: (row.version, row.updated_at) for row in rows}
+
+
+def _evaluate(request: Request, response: Response, versions: Dict[str, Tuple[int, Optional[datetime]]],
+              tables: Tuple[str, ...], user_key: Optional[str]) -> None:
+    token = "|".join(f"{t}:{versions.get(t, (0, None))[0]}" for t in tables)
+    if user_key is not None:
+        token += f"|user:{user_key}"
+    digest = hashlib.sha1(f"{_route_key(request)}|{token}".encode()).hexdigest()[:20]
+    etag = f'W/"{digest}"'
+
+    modified_times = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+    last_modified = max(modified_times) if modified_times else None
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    if user_key is not None:
+        headers["Vary"] = "Authorization, X-User-Email"
+
+    if_none_match = request.headers.get("if-none-match")
+    # If-None-Match varsa If-Modified-Since yok sayılır (RFC 9110)
+    if etag_matches(if_none_match, etag) or (
+        if_none_match is None and _not_modified_since(request.headers.get("if-modified-since"), last_modified)
+    ):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional_get(
+    *tables: str,
+    user_dependency: Optional[Callable] = None,
+    bypass: Optional[Callable[[Request], bool]] = None,
+) -> Callable:
+    """Route'a ETag/Last-Modified ekleyen ve eşleşmede 304 dönen dependency üret.
+
+    tables: yanıtın bağlı olduğu tablolar. user_dependency verilirse önce
+    yetkilendirme çalışır ve ETag kullanıcıya göre değişir. bypass True
+    dönerse (örn. zamana bağlı filtreler) koşullu yanıt devre dışı kalır.
+    Public route'larda sürümler async session ile okunur (thread havuzu kullanılmaz).
+    """
+    tables = tuple(sorted(tables))
+
+    if user_dependency is None:
+        async def dependency(request: Request, response: Response, db: AsyncSession = Depends(deps.get_async_db)) -> None:
+            if bypass is not None and bypass(request):
+                return
+            _evaluate(request, response, await read_table_versions_async(db, tables), tables, None)
+        return dependency
+
+    def user_scoped_dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(deps.get_db),
+        current_user=Depends(user_dependency),
+    ) -> None:
+        if bypass is not None and bypass(request):
+            return
+        _evaluate(request, response, read_table_versions(db, tables), tables, str(current_user.id))
+    return user_scoped_dependency
+
+
+def query_flag_set(name: str) -> Callable[[Request], bool]:
+    """Query parametresi doğru değerliyse True dönen bypass yardımcısı"""
+    def check(request: Request) -> bool:
+        return request.query_params.get(name, "").lower() in ("1", "true", "yes", "on")
+    return check
+
+
+# Takip edilen tablolara yapılan ORM yazımları oturumda toplanır; sayaçlar
+# commit'ten hemen önce, aynı transaction içinde tablo başına bir kez artırılır.
+# Böylece çok adımlı işlemler (flush başına değil) tek bir upsert ile kapanır.
+_PENDING_TABLES = "pending_table_versions"
+
+
+def _mark_changed(session: Session, tables: Iterable[str]) -> None:
+    session.info.setdefault(_PENDING_TABLES, set()).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_after_flush(session, flush_context):
+    # dirty, yalnızca attribute set edilmiş (değeri değişmemiş) nesneleri de içerir
+    instances = list(session.new) + list(session.deleted) + [
+        instance for instance in session.dirty if session.is_modified(instance)
+    ]
+    tables = {getattr(instance, "__tablename__", None) for instance in instances} & TRACKED_TABLES
+    if tables:
+        _mark_changed(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk(orm_execute_state):
+    # Toplu insert/update/delete flush'tan geçmez
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table.name in TRACKED_TABLES:
+        _mark_changed(orm_execute_state.session, [mapper.local_table.name])
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session):
+    if session.new or session.dirty or session.deleted:
+        session.flush()  # commit'in kendi flush'ı bu olaydan sonra çalışır
+    tables = session.info.pop(_PENDING_TABLES, None)
+    if tables:
+        bump_table_versions(session.connection(), tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_TABLES, None)
@@ -12,9 +12,40 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_BACKEND: str = "jose"  # "pyjwt": PyJWT kuruluysa daha hızlı imzalama/doğrulama
+    TOKEN_CACHE_MAX_ENTRIES: int = 4096  # doğrulanmış token önbelleği (worker başına)
+    TOKEN_CACHE_TTL_SECONDS: int = 300  # exp'ten önce dolarsa token yeniden doğrulanır
+    PASSWORD_HASH_WORKERS: int = 4  # bcrypt için ayrılmış thread sayısı
+
+    # Login Rate Limiting (jeton kovası; varsayılan arka uç worker başına)
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_IP_BURST: int = 20  # IP başına art arda deneme
+    LOGIN_IP_PER_MINUTE: float = 10  # IP kovasının dakikalık yenilenmesi
+    LOGIN_USER_FAILURE_BURST: int = 5  # kullanıcı adı başına kilitlenmeden önceki hatalı deneme
+    LOGIN_USER_FAILURE_REFILL_SECONDS: float = 60  # kilitli hesapta bir denemenin açılma süresi
+    RATE_LIMIT_BACKEND: str = "memory"  # veya paylaşılan arka uç: "paket.modul:Sinif"
     
     # Database
     DATABASE_URL: str
+    QUERY_COUNT_HEADER: bool = False  # yanıtlara X-Query-Count (istek başına SQL ifadesi sayısı) ekle
+    DEBUG: bool = False  # yanıtlara Server-Timing (istek başına SQL süresi ve en yavaş ifadeler) ekle
+    SLOW_QUERY_THRESHOLD_MS: float = 250  # bu süreyi aşan ifadeler app.sql.slow günlüğüne yazılır (0: kapalı)
+    SLOW_QUERY_LOG_FILE: Optional[str] = None  # verilirse yavaş sorgular ayrıca bu dosyaya yazılır
+    DATABASE_READ_REPLICA_URLS: Optional[str] = None  # virgülle ayrılmış; salt okunur SELECT'ler buraya yönlenir
+
+    # Connection pool (PostgreSQL vb. sunucu veritabanları)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite bağlantı ayarları (her bağlantıda PRAGMA olarak uygulanır)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # WAL ile güvenli ve fsync sayısını azaltır
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # kilitli veritabanında hata vermeden önce bekleme
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456  # 256MB
     
     # Admin
     ADMIN_USERNAME: str
@@ -28,6 +59,36 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 5242880  # 5MB
     ALLOWED_EXTENSIONS: set = {"png", "jpg", "jpeg", "gif", "webp"}
     UPLOAD_DIR: str = os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "..", "uploads") # New setting for forms, more robust path
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 1MB; yüklemeler bu boyutta parçalarla diske yazılır
+    MAX_REQUEST_BODY_SIZE: int = 26214400  # 25MB; tüm istek gövdesi (çoklu dosya dahil)
+    BLOB_GC_GRACE_SECONDS: int = 3600  # referansı kalmayan blob'lar bu süreden sonra silinebilir
+
+    # Story Sweeper (süresi dolmuş storyleri arka planda siler; worker'lar arasında tek çalıştırıcı)
+    STORY_SWEEP_ENABLED: bool = True
+    STORY_SWEEP_INTERVAL_SECONDS: int = 300
+    STORY_SWEEP_BATCH_SIZE: int = 500  # her DELETE ifadesinin sildiği en fazla satır
+
+    # Response Cache (public GET endpoint'leri için, worker başına)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+
+    # Principal Cache (kimliği doğrulanan kullanıcı + rolleri, worker başına)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+
+    # Form Validators (derlenmiş başvuru doğrulayıcıları, worker başına)
+    FORM_VALIDATOR_CACHE_MAX_ENTRIES: int = 1024
+
+    # Image Processing (görsel işleme süreç havuzu)
+    IMAGE_PROCESS_WORKERS: int = 2
+    IMAGE_PROCESS_MAX_PENDING: int = 16  # kuyruk dolunca yüklemeler 503 alır
+
+    # Metrics (Prometheus metin formatında /metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_REQUIRE_ADMIN: bool = True  # /metrics yalnızca admin'e açık; False ise kimlik doğrulamasız (iç ağ scrape'i)
+    METRICS_MULTIPROC_DIR: Optional[str] = None  # birden çok worker'da zorunlu; ana süreç başlamadan temizlenmeli
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 5  # worker'ların anlık görüntülerini dizine yazma aralığı
 
     class Config:
         env_file = ".env"
@@ -1,19 +1,259 @@
-from sqlalchemy import create_engine
+import asyncio
+import logging
+import random
+from typing import List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import NoSuchModuleError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
 from .config import settings
+from .metrics import instrument_pool
 
-# SQLite için özel ayarlar
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+logger = logging.getLogger(__name__)
+
+# Async sürücü karşılıkları (public okuma endpoint'leri thread havuzunu kullanmadan çalışır)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> Optional[str]:
+    """Senkron bağlantı adresinin async sürücülü karşılığı (desteklenmiyorsa None)"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return None
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_options(url: str) -> dict:
+    """Settings'e göre engine ayarları: SQLite için thread ayarı, sunucu veritabanları için havuz"""
+    if _is_sqlite(url):
+        # SQLite için özel ayarlar
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas() -> List[str]:
+    """Her yeni SQLite bağlantısında çalıştırılacak PRAGMA'lar"""
+    pragmas = [f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}"]
+    if settings.SQLITE_JOURNAL_MODE:
+        # WAL: okuyucular yazıcıyı, yazıcı okuyucuları bloklamaz
+        pragmas.append(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    if settings.SQLITE_SYNCHRONOUS:
+        pragmas.append(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    if settings.SQLITE_CACHE_SIZE_KB:
+        pragmas.append(f"PRAGMA cache_size = -{settings.SQLITE_CACHE_SIZE_KB}")  # negatif değer KiB cinsindendir
+    if settings.SQLITE_MMAP_SIZE:
+        pragmas.append(f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}")
+    pragmas.append("PRAGMA temp_store = MEMORY")
+    return pragmas
+
+
+def configure_sqlite_engine(sync_engine: Engine) -> None:
+    """SQLite bağlantılarına açılışta PRAGMA ayarlarını uygula (sync ve async engine için)"""
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in sqlite_pragmas():
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def create_async_engine_for(url: str, name: str) -> Optional[AsyncEngine]:
+    """Adresin async sürücülü engine'i; sürücü tanımlı değilse veya kurulu değilse None"""
+    async_url = async_database_url(url)
+    if async_url is None:
+        return None
+    try:
+        async_engine = create_async_engine(async_url, **engine_options(url))
+    except (ImportError, NoSuchModuleError) as e:
+        logger.warning("Async driver for %s is not available (%s); async reads use the sync session", name, e)
+        return None
+    configure_sqlite_engine(async_engine.sync_engine)
+    instrument_pool(async_engine.sync_engine, f"{name}_async")
+    return async_engine
+
+
+def _create_engines(url: str, name: str):
+    sync_engine = create_engine(url, **engine_options(url))
+    configure_sqlite_engine(sync_engine)
+    instrument_pool(sync_engine, name)
+    return sync_engine, create_async_engine_for(url, name)
+
+
+# Engine oluştur (birincil veritabanı; tüm yazmalar buraya gider)
+engine, async_engine = _create_engines(settings.DATABASE_URL, "primary")
+
+# Okuma replikaları (DATABASE_READ_REPLICA_URLS, virgülle ayrılmış)
+replica_engines: List[Engine] = []
+async_replica_engines: List[AsyncEngine] = []
+for _index, _replica_url in enumerate(
+    filter(None, (url.strip() for url in (settings.DATABASE_READ_REPLICA_URLS or "").split(",")))
+):
+    _replica, _async_replica = _create_engines(_replica_url, f"replica{_index}")
+    replica_engines.append(_replica)
+    if _async_replica is not None:
+        async_replica_engines.append(_async_replica)
+
+
+class RoutingSession(Session):
+    """Salt okunur SELECT'leri replikaya, diğer her şeyi birincil veritabanına yönlendiren session.
+
+    Session bir kez yazma yaptığında (flush, toplu UPDATE/DELETE veya
+    SELECT ... FOR UPDATE) kalan ömrü boyunca birincil veritabanını kullanır;
+    böylece aynı istekte yazılan veri replikadan gecikmeli okunmaz ve satır
+    kilitleri yazmanın yapılacağı veritabanında alınır.
+    """
+
+    primary: Engine
+    replicas: List[Engine] = []
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self._flushing
+            or isinstance(clause, UpdateBase)
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            self.info["use_primary"] = True
+        if not self.replicas or self.info.get("use_primary") or not isinstance(clause, Select):
+            return self.primary
+        return random.choice(self.replicas)
+
+
+def routing_session_class(primary: Engine, replicas: List[Engine]) -> type:
+    return type("RoutingSession", (RoutingSession,), {"primary": primary, "replicas": list(replicas)})
+
+
+def writer_bind(db: Session) -> Engine:
+    """Yazma işlemleri için birincil bağlantı (replika yönlendirmesinden bağımsız)"""
+    return getattr(db, "primary", None) or db.get_bind()
 
-# Engine oluştur
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=connect_args
-)
 
 # Session oluştur
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if replica_engines:
+    SessionLocal = sessionmaker(
+        class_=routing_session_class(engine, replica_engines), autocommit=False, autoflush=False
+    )
+else:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class ThreadedAsyncSession:
+    """Async sürücü yokken AsyncSession yerine geçen sarmalayıcı.
+
+    get_async_db kullanan endpoint'lerin çağırdığı AsyncSession metotlarını
+    senkron session üzerinde, event loop'u bloklamadan bir thread'de çalıştırır.
+    Sonuçlar thread içinde belleğe alınır; imleç thread'ler arasında taşınmaz.
+    """
+
+    def __init__(self, sync_session: Session):
+        self.sync_session = sync_session
+
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+
+    def get_bind(self, *args, **kwargs):
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    async def _run(self, method, *args, **kwargs):
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await self._run(lambda: self.sync_session.execute(statement, *args, **kwargs).freeze()())
+
+    async def scalars(self, statement, *args, **kwargs):
+        return (await self.execute(statement, *args, **kwargs)).scalars()
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await self._run(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self._run(self.sync_session.get, *args, **kwargs)
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await self._run(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await self._run(self.sync_session.delete, instance)
+
+    async def flush(self, *args, **kwargs) -> None:
+        await self._run(self.sync_session.flush, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await self._run(self.sync_session.close)
+
+    async def __aenter__(self) -> "ThreadedAsyncSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def threaded_async_sessionmaker(session_factory: sessionmaker):
+    """AsyncSessionLocal yerine: senkron fabrikanın session'larını ThreadedAsyncSession ile sarar"""
+    def factory() -> ThreadedAsyncSession:
+        # Commit sonrası nesneler yanıt serileştirmesi için yüklü kalır (AsyncSessionLocal gibi)
+        return ThreadedAsyncSession(session_factory(expire_on_commit=False))
+    return factory
+
+
+# Async session; commit sonrası nesneler yanıt serileştirmesi için yüklü kalır.
+# Async sürücü yoksa (ör. asyncpg kurulu değil) aynı arayüz senkron session üzerinden sağlanır.
+if async_engine is None:
+    AsyncSessionLocal = threaded_async_sessionmaker(SessionLocal)
+elif async_replica_engines:
+    AsyncSessionLocal = async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=routing_session_class(
+            async_engine.sync_engine, [replica.sync_engine for replica in async_replica_engines]
+        ),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+
+def primary_session() -> Session:
+    """Tüm sorguları birincil veritabanına gönderen session (arka plan işleri, dışa aktarmalar).
+
+    SessionLocal çağrı anında okunur; testlerde veya yapılandırmada değiştirilen
+    fabrika da kullanılır.
+    """
+    db = SessionLocal()
+    db.info["use_primary"] = True
+    return db
 
 # Base model
 Base = declarative_base()
@@ -25,3 +265,4 @@ def get_db():
         yield db
     finally:
         db.close()
+
@@ -0,0 +1,219 @@
+import asyncio
+import os
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from PIL import Image
+
+from .config import settings
+from .blobs import blob_reference, ingest_upload, is_blob_reference
+
+# Görsel işleme hattı: PIL işlemleri event loop'u bloklamaması için ayrı bir
+# süreç havuzunda, dosya G/Ç'si ise thread havuzunda çalışır. Bekleyen iş
+# sayısı sınırlıdır; sınır aşılırsa istek 503 ile geri çevrilir.
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending_jobs = 0
+
+
+# Duyarlı (responsive) görsel varyantları: her genişlik için WebP + orijinal format
+VARIANT_WIDTHS = (160, 400, 800, 1200)
+VARIANT_QUALITY = 80
+
+# Varyant bilgisi: {"file": dosya adı, "width": .., "height": .., "format": ..}
+Variant = Dict[str, Any]
+
+_SAVE_FORMATS = {"jpg": "JPEG", "jpeg": "JPEG", "png": "PNG", "gif": "GIF", "webp": "WEBP"}
+
+
+# --- Süreç havuzunda çalışan işlemciler (pickle edilebilir, modül seviyesinde) ---
+
+def _save_variant(img: Image.Image, path: str, extension: str) -> None:
+    save_format = _SAVE_FORMATS.get(extension, "PNG")
+    if save_format == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.save(path, save_format, optimize=True, quality=VARIANT_QUALITY)
+
+
+def build_variants(path: str) -> List[Variant]:
+    """İşlenmiş görselden VARIANT_WIDTHS genişliklerinde WebP ve orijinal format kopyalar üret"""
+    img = Image.open(path)
+    img.load()
+    stem, extension = os.path.splitext(path)
+    extension = extension.lstrip(".").lower()
+    widths = [width for width in VARIANT_WIDTHS if width < img.width] + [img.width]
+
+    variants: List[Variant] = []
+    for width in widths:
+        if width == img.width:
+            resized = img
+        else:
+            resized = img.resize((width, max(1, round(img.height * width / img.width))), Image.Resampling.LANCZOS)
+        formats = ["webp"] if extension == "webp" else ["webp", extension]
+        for fmt in formats:
+            if width == img.width and fmt == extension:
+                variant_path = path  # en büyük boyut, orijinal format: ana dosyanın kendisi
+            else:
+                variant_path = f"{stem}_w{width}.{fmt}"
+                _save_variant(resized, variant_path, fmt)
+            variants.append({
+                "file": os.path.basename(variant_path),
+                "width": resized.width,
+                "height": resized.height,
+                "format": fmt,
+            })
+    return variants
+
+
+def fit_within(path: str, max_width: int, max_height: int) -> List[Variant]:
+    """Görseli oranını koruyarak verilen kutuya sığdır"""
+    img = Image.open(path)
+    img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+    img.save(path, optimize=True, quality=85)
+    return build_variants(path)
+
+
+def square_crop(path: str, size: int) -> List[Variant]:
+    """Görseli ortadan kare kırp ve küçült"""
+    img = Image.open(path)
+    side = min(img.width, img.height)
+    left = (img.width - side) // 2
+    top = (img.height - side) // 2
+    img_cropped = img.crop((left, top, left + side, top + side))
+    img_cropped.thumbnail((size, size), Image.Resampling.LANCZOS)
+    img_cropped.save(path, optimize=True, quality=85)
+    return build_variants(path)
+
+
+# Etkinlikler: maksimum 1200x800; stories: 1:1 oran, maksimum 800x800
+EVENT_IMAGE_PROCESSOR = partial(fit_within, max_width=1200, max_height=800)
+STORY_IMAGE_PROCESSOR = partial(square_crop, size=800)
+
+
+# --- Havuz yönetimi ---
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_PROCESS_WORKERS)
+    return _executor
+
+
+async def shutdown_image_pool() -> None:
+    """Uygulama kapanırken süreç havuzunu kapat.
+
+    Çalışan işlerin bitmesi thread havuzunda beklenir; event loop bu sürede
+    bloklanmaz, süren istekler ve diğer görevler çalışmaya devam eder.
+    """
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        await run_in_threadpool(executor.shutdown, wait=True, cancel_futures=True)
+
+
+@contextmanager
+def image_job_slot():
+    """İşleme kuyruğunda yer ayır; kuyruk doluysa 503.
+
+    Çok parçalı gövde bu noktada FastAPI tarafından zaten ayrıştırılmıştır
+    (dosya geçici olarak tamponlanmış olur); reddedilen istek yalnızca depoya
+    kopyalama ve görsel işleme maliyetinden kurtulur.
+    """
+    global _pending_jobs
+    if _pending_jobs >= settings.IMAGE_PROCESS_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Image processing queue is full, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+    _pending_jobs += 1
+    try:
+        yield
+    finally:
+        _pending_jobs -= 1
+
+
+def pending_image_jobs() -> int:
+    """İşleme kuyruğunda bekleyen veya çalışan iş sayısı"""
+    return _pending_jobs
+
+
+async def run_image_job(processor: Callable[[str], List[Variant]], path: str) -> List[Variant]:
+    """İşlemciyi süreç havuzunda çalıştır (event loop bloklanmaz)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), processor, path)
+
+
+# --- Dosya yardımcıları ---
+
+def delete_upload_file(image_url: Optional[str], image_variants: Optional[dict] = None) -> None:
+    """/uploads/ altındaki eski (blob deposu dışı) görseli ve varyantlarını sil.
+
+    Blob deposundaki dosyalar başka kayıtlarca paylaşılabilir; onları referans
+    sayacı düştükten sonra collect_garbage siler.
+    """
+    if is_blob_reference(image_url):
+        return
+    urls = [image_url]
+    if image_variants:
+        urls += [variant.get("url") for variant in image_variants.get("variants", [])]
+    for url in set(urls):
+        if url and url.startswith("/uploads/"):
+            file_path = url.replace("/uploads/", settings.UPLOAD_FOLDER + "/")
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+
+def build_image_manifest(variants: List[Variant], url_prefix: str = "/uploads") -> Optional[dict]:
+    """Varyant listesinden srcset'e hazır manifest üret (Event/Story.image_variants)"""
+    if not variants:
+        return None
+    items = sorted(
+        ({"url": f"{url_prefix}/{v['file']}", "width": v["width"], "height": v["height"], "format": v["format"]}
+         for v in variants),
+        key=lambda v: (v["format"], v["width"]),
+    )
+    srcset: Dict[str, str] = {}
+    for fmt in sorted({v["format"] for v in items}):
+        srcset[fmt] = ", ".join(f"{v['url']} {v['width']}w" for v in items if v["format"] == fmt)
+    largest = max(items, key=lambda v: v["width"])
+    return {"width": largest["width"], "height": largest["height"], "srcset": srcset, "variants": items}
+
+
+async def store_uploaded_image(
+    db: Session,
+    file: UploadFile,
+    processor: Callable[[str], List[Variant]],
+    bucket: str,
+) -> Tuple[str, Optional[dict]]:
+    """Yüklenen görseli doğrula, blob deposuna al ve işle; (URL, varyant manifesti) döndür.
+
+    Aynı görsel daha önce bu bucket'a yüklendiyse işlenmiş dosya ve manifest
+    yeniden kullanılır; görsel tekrar işlenmez.
+    """
+    # Dosya uzantısı kontrolü
+    file_extension = file.filename.split(".")[-1].lower()
+    if file_extension not in settings.ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+        )
+
+    async def process(key: str, path: str) -> Optional[dict]:
+        try:
+            variants = await run_image_job(processor, path)
+        except Exception:
+            # Görsel işlenemezse orijinal haliyle bırak (varyant üretilmez)
+            variants = []
+        return build_image_manifest(variants, url_prefix=os.path.dirname(blob_reference(key)))
+
+    with image_job_slot():
+        # Parça parça diske yazılır; boyut sınırı aşılırsa okuma kesilir (413)
+        blob = await ingest_upload(db, file, bucket, file_extension, settings.MAX_FILE_SIZE, prepare=process)
+
+    return blob_reference(blob.key), blob.meta
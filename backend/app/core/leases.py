@@ -0,0 +1,46 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from ..models import JobLease
+
+# Veritabanı tabanlı iş kilitleri (lease). Periyodik işler her turda kilidi
+# alır veya yeniler; kilidi tutan worker ölürse süre dolunca başka bir worker
+# devralır. Aynı makinedeki uvicorn worker'ları kadar farklı makineler için de çalışır.
+
+_leases = JobLease.__table__
+
+
+def lease_owner_id() -> str:
+    """Bu süreci tanımlayan sahip kimliği"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(bind: Engine, name: str, owner: str, ttl_seconds: float) -> bool:
+    """Kilidi al veya yenile; başka bir sahipte ve süresi dolmamışsa False"""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    with bind.begin() as connection:
+        result = connection.execute(
+            _leases.update()
+            .where(_leases.c.name == name, or_(_leases.c.owner == owner, _leases.c.expires_at < now))
+            .values(owner=owner, expires_at=expires_at)
+        )
+        if result.rowcount:
+            return True
+    try:
+        with bind.begin() as connection:
+            connection.execute(_leases.insert().values(name=name, owner=owner, expires_at=expires_at))
+        return True
+    except IntegrityError:
+        return False  # kilit başka bir sahipte
+
+
+def release_lease(bind: Engine, name: str, owner: str) -> None:
+    with bind.begin() as connection:
+        connection.execute(_leases.delete().where(_leases.c.name == name, _leases.c.owner == owner))
@@ -0,0 +1,49 @@
+from typing import Sequence, TypeVar
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from ..models import Application, ClubMember, ContentRequest, Event, User
+
+# Yanıt şemalarının ihtiyaç duyduğu ilişkiler için yükleme stratejileri.
+# Modellerdeki tüm ilişkiler lazy="raise" tanımlıdır: bir endpoint burada
+# (veya sorgusunda) belirtmediği bir ilişkiye erişirse satır başına sorgu
+# (N+1) yerine hata alır. Tekil ilişkiler joinedload, koleksiyonlar
+# selectinload ile (sayfa başına tek ek sorgu) yüklenir.
+
+# UserRead.roles
+USER_READ_OPTIONS = (selectinload(User.roles),)
+
+# EventSchema / EventList.category (liste sorguları join + contains_eager kullanır)
+EVENT_READ_OPTIONS = (joinedload(Event.category),)
+
+# ApplicationRead.submitter (+roles) ve application_files
+APPLICATION_READ_OPTIONS = (
+    joinedload(Application.submitter).selectinload(User.roles),
+    selectinload(Application.application_files),
+)
+
+# ContentRequestRead.club ve reviewer (+roles)
+CONTENT_REQUEST_READ_OPTIONS = (
+    joinedload(ContentRequest.club),
+    joinedload(ContentRequest.reviewer).selectinload(User.roles),
+)
+
+# ClubMemberRead.user (+roles)
+CLUB_MEMBER_READ_OPTIONS = (joinedload(ClubMember.user).selectinload(User.roles),)
+
+T = TypeVar("T")
+
+
+def load_for_response(db: Session, instance: T, options: Sequence[LoaderOption]) -> T:
+    """Commit sonrası nesneyi yanıt şemasının ilişkileriyle birlikte tek seferde yeniden yükle"""
+    state = inspect(instance)
+    mapper, primary_key = state.mapper, state.identity  # identity commit sonrası da yüklü; ek sorgu yok
+    statement = (
+        select(mapper.class_)
+        .options(*options)
+        .where(*(column == value for column, value in zip(mapper.primary_key, primary_key)))
+        .execution_options(populate_existing=True)
+    )
+    return db.scalars(statement).unique().one()
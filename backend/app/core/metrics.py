@@ -0,0 +1,473 @@
+import asyncio
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Prometheus metin formatında (/metrics) uygulama metrikleri; bağımlılıksız.
+# Her worker süreci metriklerini bellekte tutar. METRICS_MULTIPROC_DIR
+# verildiğinde her süreç anlık görüntüsünü (snapshot) periyodik olarak bu
+# dizine pid + başlangıç zamanıyla adlandırılmış dosyaya yazar (atomik rename);
+# /metrics isteğini hangi worker alırsa alsın tüm dosyaları birleştirir.
+# Sayaçlar ve histogramlar tüm süreçlerden toplanır; gauge'lar yalnızca yaşayan
+# süreçlerden. Ölen bir sürecin dosyası yaşayan bir worker tarafından devralınır:
+# sayaçları o worker'ın "retired" bölümüne eklenir, önce kendi dosyası yazılır,
+# sonra ölü dosya silinir. Devralınan dosyalar "absorbed" listesiyle işaretlendiği
+# için okuyucular arada iki kez saymaz ve toplamlar hiçbir zaman geri gitmez.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+UNMATCHED_ROUTE = "unmatched"  # eşleşmeyen yollar tek etikette toplanır (etiket sayısı sınırlı kalır)
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric:
+    """Etiketli tek bir metrik ailesi (counter, gauge veya histogram)"""
+
+    def __init__(self, kind: str, name: str, documentation: str,
+                 labelnames: Sequence[str] = (), buckets: Sequence[float] = ()):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(float(bound) for bound in buckets)
+        self._values: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: LabelValues = (), value: float = 0.0) -> None:
+        """Değeri doğrudan yaz (gauge'lar ve başka yerde tutulan kümülatif sayaçlar için)"""
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        # Kovalar birikimsiz tutulur; son eleman +Inf kovasıdır
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def samples(self) -> List[list]:
+        with self._lock:
+            if self.kind == "histogram":
+                return [[list(labels), [list(state[0]), state[1]]] for labels, state in self._values.items()]
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def describe(self) -> dict:
+        return {
+            "kind": self.kind,
+            "help": self.documentation,
+            "labels": list(self.labelnames),
+            "buckets": list(self.buckets),
+            "samples": self.samples(),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.directory: Optional[str] = None
+        self._pid: Optional[int] = None
+        self._started_at = 0.0
+        self._retired: Dict[str, dict] = {}  # devralınan ölü süreçlerin sayaç/histogramları
+        self._absorbed: set = set()  # devralınan süreç kimlikleri
+        self._retired_lock = threading.Lock()
+
+    @property
+    def instance(self) -> str:
+        """Süreç kimliği: pid + başlangıç zamanı (fork sonrası ve pid yeniden kullanımında değişir)"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._started_at = time.time()
+            self._retired, self._absorbed = {}, set()
+        return f"{self._pid}_{int(self._started_at * 1000)}"
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Metric:
+        return self._register(Metric("counter", name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Metric:
+        return self._register(Metric("gauge", name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Metric:
+        return self._register(Metric("histogram", name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """Anlık görüntüden hemen önce çağrılır; başka yerde tutulan değerleri metriklere yazar"""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        """Bu sürecin metrikleri (event loop'ta çağrılmalı; thread havuzu istatistikleri oradan okunur)"""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        instance = self.instance
+        with self._retired_lock:
+            retired = {
+                name: {**family, "samples": [[list(labels), value] for labels, value in family["samples"].items()]}
+                for name, family in self._retired.items()
+            }
+            absorbed = sorted(self._absorbed)
+        return {
+            "pid": self._pid,
+            "instance": instance,
+            "started_at": self._started_at,
+            "written_at": time.time(),
+            "metrics": {name: metric.describe() for name, metric in self._metrics.items()},
+            "retired": retired,
+            "absorbed": absorbed,
+        }
+
+    # --- Çok süreçli depo ---
+
+    def _snapshot_path(self, instance: str) -> str:
+        return os.path.join(self.directory, f"metrics_{instance}.json")
+
+    def write_snapshot(self, snapshot: dict) -> None:
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".metrics_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(snapshot, handle, separators=(",", ":"))
+            os.replace(temp_path, self._snapshot_path(snapshot["instance"]))  # okuyucular yarım dosya görmez
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def _load_snapshots(self) -> List[Tuple[str, dict]]:
+        loaded = []
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.json")):
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    loaded.append((path, json.load(handle)))
+            except (OSError, ValueError):
+                continue
+        return loaded
+
+    def _read_snapshots(self, own: dict) -> List[dict]:
+        snapshots = [own]
+        if not self.directory:
+            return snapshots
+        snapshots.extend(
+            snapshot for _, snapshot in self._load_snapshots() if snapshot.get("instance") != own["instance"]
+        )
+        return snapshots
+
+    def reap_snapshots(self) -> int:
+        """Ölü süreçlerin dosyalarını devral: sayaçları bu sürece ekle, kendi dosyanı yaz, sonra sil"""
+        if not self.directory:
+            return 0
+        own = self.instance
+        loaded = self._load_snapshots()
+        snapshots = [snapshot for _, snapshot in loaded]
+        # Başka bir worker'ın devraldığı (silinmeyi bekleyen) dosyalar atlanır
+        absorbed = {instance for snapshot in snapshots for instance in snapshot.get("absorbed", ())}
+        reaped = []
+        for path, snapshot in loaded:
+            instance = snapshot.get("instance")
+            if instance in (None, own) or instance in absorbed or _snapshot_alive(snapshot, snapshots):
+                continue
+            # Aynı dosyayı iki worker'ın devralmaması için kilit dosyası
+            lock_path = path + ".lock"
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            if not os.path.exists(path):
+                # Başka bir worker okunduktan sonra devralıp sildi
+                os.unlink(lock_path)
+                continue
+            with self._retired_lock:
+                for name, family in chain(snapshot.get("metrics", {}).items(), snapshot.get("retired", {}).items()):
+                    if family["kind"] != "gauge":
+                        _merge_family(self._retired, name, family)
+                self._absorbed.update([instance, *snapshot.get("absorbed", ())])
+            reaped.append((path, lock_path))
+        if reaped:
+            # Devralınan sayaçlar önce bu sürecin dosyasına yazılır; okuyucular ölü dosyaları "absorbed" ile atlar
+            self.write_snapshot(self.snapshot())
+            for path, lock_path in reaped:
+                for stale in (path, lock_path):
+                    try:
+                        os.unlink(stale)
+                    except OSError:
+                        pass
+        return len(reaped)
+
+    def render(self, own: dict) -> str:
+        """Bu sürecin ve (çok süreçli modda) diğer worker'ların metriklerini Prometheus formatında birleştir"""
+        return render_families(merge_snapshots(self._read_snapshots(own)))
+
+    async def _flush_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_threadpool(self.write_snapshot, self.snapshot())
+                await run_in_threadpool(self.reap_snapshots)
+            except Exception as e:
+                print(f"Metrics flush failed: {e}")
+
+    def start(self, directory: Optional[str], interval_seconds: float) -> None:
+        self.directory = directory
+        if directory and self._task is None:
+            self.write_snapshot(self.snapshot())
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop(interval_seconds))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # Son değerler kalıcı olsun; kapanan sürecin sayaçları toplamda yer almaya devam eder
+            await run_in_threadpool(self.write_snapshot, self.snapshot())
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _snapshot_alive(snapshot: dict, snapshots: Sequence[dict]) -> bool:
+    pid = snapshot.get("pid", 0)
+    started_at = snapshot.get("started_at", 0)
+    # Aynı pid'le daha sonra başlamış bir süreç varsa bu dosyanın sahibi ölmüştür (pid yeniden kullanımı)
+    if any(other.get("pid") == pid and other.get("started_at", 0) > started_at for other in snapshots):
+        return False
+    return pid == os.getpid() or _process_alive(pid)
+
+
+def _merge_family(families: Dict[str, dict], name: str, family: dict) -> None:
+    merged = families.setdefault(name, {**family, "samples": {}})
+    samples = merged["samples"]
+    for labels, value in family["samples"]:
+        key = tuple(labels)
+        if family["kind"] != "histogram":
+            samples[key] = samples.get(key, 0.0) + value
+            continue
+        counts, total = value
+        if key not in samples or len(samples[key][0]) != len(counts):
+            samples[key] = [list(counts), total]  # kova tanımı değişmişse en yeni süreç geçerli
+        else:
+            samples[key] = [[a + b for a, b in zip(samples[key][0], counts)], samples[key][1] + total]
+
+
+def merge_snapshots(snapshots: Iterable[dict]) -> Dict[str, dict]:
+    """Süreç anlık görüntülerini aile bazında topla"""
+    snapshots = list(snapshots)
+    absorbed = {instance for snapshot in snapshots for instance in snapshot.get("absorbed", ())}
+    families: Dict[str, dict] = {}
+    for snapshot in snapshots:
+        if snapshot.get("instance") in absorbed:
+            continue  # sayaçları başka bir sürecin "retired" bölümünde
+        alive = _snapshot_alive(snapshot, snapshots)
+        for name, family in snapshot.get("metrics", {}).items():
+            if family["kind"] == "gauge" and not alive:
+                continue
+            _merge_family(families, name, family)
+        for name, family in snapshot.get("retired", {}).items():
+            _merge_family(families, name, family)
+    _add_hit_ratio(families)
+    return families
+
+
+def _add_hit_ratio(families: Dict[str, dict]) -> None:
+    # Önbellek isabet oranı, toplanmış hit/miss sayaçlarından hesaplanır (süreç oranlarının ortalaması yanıltıcı olur)
+    hits = families.get("app_cache_hits_total")
+    misses = families.get("app_cache_misses_total")
+    if not hits:
+        return
+    ratios = {}
+    for key, hit_count in hits["samples"].items():
+        lookups = hit_count + (misses["samples"].get(key, 0.0) if misses else 0.0)
+        ratios[key] = hit_count / lookups if lookups else 0.0
+    families["app_cache_hit_ratio"] = {
+        "kind": "gauge",
+        "help": "Cache hit ratio across all workers",
+        "labels": hits["labels"],
+        "buckets": [],
+        "samples": ratios,
+    }
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def render_families(families: Dict[str, dict]) -> str:
+    lines: List[str] = []
+    for name in sorted(families):
+        family = families[name]
+        names = family["labels"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        for labels, value in sorted(family["samples"].items()):
+            if family["kind"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip([*family["buckets"], float("inf")], counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(names, labels, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+HTTP_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served", ("method",))
+HTTP_RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes", "HTTP response body size by route template", ("method", "route"), SIZE_BUCKETS)
+DB_POOL_CHECKOUT = registry.histogram(
+    "db_pool_checkout_duration_seconds", "Time a pooled database connection stays checked out", ("engine",))
+DB_POOL_IN_USE = registry.gauge(
+    "db_pool_connections_in_use", "Pooled database connections currently checked out", ("engine",))
+THREADPOOL_BUSY = registry.gauge(
+    "threadpool_busy_threads", "Worker threads busy in the default request threadpool")
+THREADPOOL_QUEUE = registry.gauge(
+    "threadpool_queue_depth", "Tasks waiting for a thread in the default request threadpool")
+WORK_QUEUE = registry.gauge(
+    "app_work_queue_depth", "Jobs queued or running in dedicated executors", ("pool",))
+CACHE_HITS = registry.counter("app_cache_hits_total", "Cache lookups that found an entry", ("cache",))
+CACHE_MISSES = registry.counter("app_cache_misses_total", "Cache lookups that missed", ("cache",))
+CACHE_ENTRIES = registry.gauge("app_cache_entries", "Entries currently held in the cache", ("cache",))
+
+
+def _collect_threadpool() -> None:
+    # run_in_threadpool / sync endpoint'lerin kullandığı anyio sınırlayıcısı (yalnızca event loop'tan okunabilir)
+    try:
+        statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    except RuntimeError:
+        return
+    THREADPOOL_BUSY.set((), statistics.borrowed_tokens)
+    THREADPOOL_QUEUE.set((), statistics.tasks_waiting)
+
+
+registry.register_collector(_collect_threadpool)
+
+
+def instrument_pool(sync_engine: Engine, name: str) -> None:
+    """Engine havuzunun bağlantı kullanım sürelerini ve anlık kullanımını ölç"""
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["metrics_checked_out_at"] = time.perf_counter()
+        DB_POOL_IN_USE.inc((name,))
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("metrics_checked_out_at", None)
+        if started is None:
+            return
+        DB_POOL_IN_USE.dec((name,))
+        DB_POOL_CHECKOUT.observe((name,), time.perf_counter() - started)
+
+
+def route_label(scope: Scope) -> str:
+    """Eşleşen route şablonu (örn. /api/v1/events/{event_id}); ham yol etiket olarak kullanılmaz"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """İstek sayısı, gecikme, eşzamanlı istek ve yanıt boyutu metriklerini kaydet"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500  # yanıt başlamadan oluşan hatalar
+        body_size = 0
+        cache_hit = False
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, body_size, cache_hit
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                cache_hit = (b"x-cache", b"HIT") in message.get("headers", ())
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_IN_PROGRESS.inc((method,))
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec((method,))
+            # Önbellekten dönen yanıtlar router'a ulaşmaz; önbelleğe alınan yollar parametresizdir
+            route = scope["path"] if cache_hit else route_label(scope)
+            HTTP_REQUESTS.inc((method, route, str(status_code)))
+            HTTP_LATENCY.observe((method, route), elapsed)
+            HTTP_RESPONSE_SIZE.observe((method, route), body_size)
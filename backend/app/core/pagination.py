@@ -0,0 +1,155 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, String, and_, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Opak cursor tabanlı (keyset) sayfalama yardımcıları
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (kolon, azalan mı) çiftleri; son anahtar benzersiz olmalı (genellikle id)
+SortKey = Tuple[Any, bool]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    # Yalnızca _encode_value'nun üretebileceği biçimler kabul edilir (aksi halde ValueError -> 400)
+    if isinstance(value, dict):
+        if len(value) == 1 and isinstance(value.get("dt"), str):
+            return datetime.fromisoformat(value["dt"])
+        if len(value) == 1 and isinstance(value.get("d"), str):
+            return date.fromisoformat(value["d"])
+        raise ValueError("unsupported cursor value")
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        raise ValueError("unsupported cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Sıralama anahtarı değerlerinden opak cursor üret"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> List[Any]:
+    """Cursor'ı çöz; geçersizse 400 döner"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != key_count:
+            raise ValueError("cursor key count mismatch")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _sqlite_datetime_bounds(value: datetime):
+    # SQLite'da DateTime metin olarak saklanır: server_default (CURRENT_TIMESTAMP)
+    # kesirsiz, Python tarafı değerler ise her zaman mikrosaniyeli yazılır. Tam
+    # saniyelik bir an iki farklı metinle saklanabildiğinden alt/üst sınır döner.
+    long_form = literal(value.strftime("%Y-%m-%d %H:%M:%S.%f"), String)
+    if value.microsecond:
+        return long_form, long_form
+    return literal(value.strftime("%Y-%m-%d %H:%M:%S"), String), long_form
+
+
+def _compare(column, value, op: str, dialect_name: str):
+    if dialect_name == "sqlite" and isinstance(value, datetime):
+        low, high = _sqlite_datetime_bounds(value)
+        if op == "gt":
+            return column > high
+        if op == "lt":
+            return column < low
+        return column.between(low, high)
+    if op == "gt":
+        return column > value
+    if op == "lt":
+        return column < value
+    return column == value
+
+
+def keyset_filter(sort_keys: Sequence[SortKey], values: Sequence[Any], dialect_name: str = ""):
+    """Cursor'dan sonraki satırları seçen WHERE ifadesi (karışık yönleri destekler)"""
+    clauses = []
+    for index, (column, descending) in enumerate(sort_keys):
+        equal_prefix = [_compare(sort_keys[i][0], values[i], "eq", dialect_name) for i in range(index)]
+        step = _compare(column, values[index], "lt" if descending else "gt", dialect_name)
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def order_by_keys(query, sort_keys: Sequence[SortKey]):
+    """Sorguyu sıralama anahtarlarına göre sırala"""
+    return query.order_by(*(column.desc() if descending else column.asc() for column, descending in sort_keys))
+
+
+def _page_statement(statement, sort_keys: Sequence[SortKey], limit: int, skip: int,
+                    cursor: Optional[str], dialect_name: str):
+    # Query ve Select nesneleri order_by/filter/offset/limit arayüzünü paylaşır
+    statement = order_by_keys(statement, sort_keys)
+    if cursor:
+        values = decode_cursor(cursor, len(sort_keys))
+        statement = statement.filter(keyset_filter(sort_keys, values, dialect_name))
+    elif skip:
+        statement = statement.offset(skip)
+    return statement.limit(limit + 1)
+
+
+def _finish_page(rows: list, sort_keys: Sequence[SortKey], limit: int, response: Optional[Response]) -> list:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if response is not None and has_more and rows:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, column.key) for column, _ in sort_keys]
+        )
+    return rows
+
+
+def paginate(
+    query,
+    sort_keys: Sequence[SortKey],
+    *,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    response: Optional[Response] = None,
+) -> list:
+    """Sorguyu sırala ve sayfala.
+
+    cursor verilirse keyset sayfalama yapılır ve skip yok sayılır; aksi halde
+    eski offset davranışı korunur. Devamı varsa bir sonraki cursor
+    X-Next-Cursor başlığında döner.
+    """
+    dialect_name = query.session.get_bind().dialect.name
+    rows = _page_statement(query, sort_keys, limit, skip, cursor, dialect_name).all()
+    return _finish_page(rows, sort_keys, limit, response)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    statement: Select,
+    sort_keys: Sequence[SortKey],
+    *,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    response: Optional[Response] = None,
+) -> list:
+    """paginate'in AsyncSession + select() karşılığı"""
+    dialect_name = db.get_bind().dialect.name
+    result = await db.execute(_page_statement(statement, sort_keys, limit, skip, cursor, dialect_name))
+    return _finish_page(list(result.scalars().all()), sort_keys, limit, response)
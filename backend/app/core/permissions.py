@@ -0,0 +1,74 @@
+from operator import attrgetter
+from typing import Any, Callable, FrozenSet, Iterable, List, NamedTuple, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import false, true
+
+from .roles import RoleType
+
+# Yetkilendirme indeksi: bir principal'ın rolleri bir kez taranır, yönettiği
+# kulüpler ve sistem yetkileri değiştirilemez bir yapıda tutulur. Böylece
+# "bu kulübü yönetebilir mi" kontrolü rol listesi taranmadan O(1) yapılır;
+# aynı bilgi listeleme sorgularına SQL koşulu olarak da eklenebilir.
+
+SYSTEM_ROLES = frozenset({RoleType.ADMIN, RoleType.SUPER_ADMIN})
+
+T = TypeVar("T")
+
+
+class PermissionIndex(NamedTuple):
+    managed_club_ids: FrozenSet[int]
+    is_system_admin: bool  # ADMIN veya SUPER_ADMIN
+    is_super_admin: bool
+    has_roles: bool
+
+    def can_manage_club(self, club_id: Optional[int]) -> bool:
+        """Kulübün yöneticisi veya sistem yöneticisi mi"""
+        return self.is_system_admin or club_id in self.managed_club_ids
+
+    def manageable(self, items: Iterable[T], club_id: Callable[[T], Any] = attrgetter("club_id")) -> List[T]:
+        """Yalnızca yönetilebilen kulüplere ait öğeleri döndür (toplu filtreleme)"""
+        if self.is_system_admin:
+            return list(items)
+        return [item for item in items if club_id(item) in self.managed_club_ids]
+
+    def club_clause(self, column):
+        """Listeleme sorguları için SQL koşulu: column yönetilen kulüplerden biri mi"""
+        if self.is_system_admin:
+            return true()
+        if not self.managed_club_ids:
+            return false()
+        return column.in_(sorted(self.managed_club_ids))
+
+
+def build_permission_index(roles: Iterable[Any]) -> PermissionIndex:
+    """Rol listesinden (role_type, club_id alanları olan nesneler) indeks üret"""
+    roles = tuple(roles)
+    role_types = {role.role_type for role in roles}
+    return PermissionIndex(
+        managed_club_ids=frozenset(
+            role.club_id for role in roles
+            if role.role_type == RoleType.CLUB_MANAGER and role.club_id is not None
+        ),
+        is_system_admin=bool(role_types & SYSTEM_ROLES),
+        is_super_admin=RoleType.SUPER_ADMIN in role_types,
+        has_roles=bool(roles),
+    )
+
+
+def permissions_for(principal) -> PermissionIndex:
+    """Principal (veya rolleri yüklenmiş kullanıcı) için yetki indeksi"""
+    permissions = getattr(principal, "permissions", None)
+    if isinstance(permissions, PermissionIndex):
+        return permissions  # principal oluşturulurken hesaplanmış
+    return build_permission_index(getattr(principal, "roles", None) or ())
+
+
+def require_club_manager(principal, club_id: Optional[int], detail: str) -> PermissionIndex:
+    """Kulübü yönetemiyorsa 403 döndür; yetki indeksini geri verir"""
+    permissions = permissions_for(principal)
+    if not permissions.has_roles:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no roles assigned")
+    if not permissions.can_manage_club(club_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    return permissions
@@ -0,0 +1,193 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from .config import settings
+from .permissions import PermissionIndex, build_permission_index
+from .roles import RoleType
+from ..models import User, UserRole
+
+# Kimliği doğrulanan kullanıcıların (principal) çözümlenmesi.
+# Kullanıcı ve rolleri users/user_roles tablolarından tek seferde yüklenir,
+# değiştirilemez (immutable) bir nesneye dönüştürülür ve süreli (TTL) LRU
+# önbellekte tutulur. Rol veya kullanıcı kaydı değişen commit'ler ilgili
+# girdileri geçersiz kılar; diğer worker'lar en geç TTL sonunda güncellenir.
+
+
+class RoleGrant(NamedTuple):
+    id: int
+    role_type: RoleType
+    club_id: Optional[int] = None
+
+
+class Principal(NamedTuple):
+    id: int
+    email: str
+    is_active: bool
+    full_name: Optional[str] = None
+    student_id: Optional[str] = None
+    roles: Tuple[RoleGrant, ...] = ()
+    permissions: PermissionIndex = build_permission_index(())  # roles'tan bir kez hesaplanır
+
+
+CacheEntry = Tuple[float, Optional[Principal]]  # (bitiş, principal; bilinmeyen e-posta için None)
+
+
+class PrincipalCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, email: str) -> Tuple[bool, Optional[Principal]]:
+        """(bulundu mu, principal) döndür; süresi dolan kayıt silinir"""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[email]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return True, entry[1]
+
+    def generation(self) -> int:
+        """Yükleme başında alınır; arada geçersiz kılma olduysa sonuç saklanmaz"""
+        with self._lock:
+            return self._generation
+
+    def set(self, email: str, principal: Optional[Principal], generation: int) -> bool:
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[email] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, user_ids: Iterable[int] = (), emails: Iterable[str] = ()) -> None:
+        """Verilen kullanıcılara ait kayıtları sil"""
+        user_ids, emails = set(user_ids), set(emails)
+        with self._lock:
+            self._generation += 1
+            for key, (_, principal) in list(self._entries.items()):
+                if key in emails or (principal is not None and principal.id in user_ids):
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def principal_from_user(user: User) -> Principal:
+    """ORM kullanıcısını (rolleri yüklenmiş) principal'a dönüştür"""
+    roles = tuple(RoleGrant(role.id, role.role_type, role.club_id) for role in user.roles)
+    return Principal(
+        id=user.id,
+        email=user.email,
+        is_active=bool(user.is_active),
+        full_name=user.full_name,
+        student_id=user.student_id,
+        roles=roles,
+        permissions=build_permission_index(roles),
+    )
+
+
+async def load_principal(db: AsyncSession, email: str) -> Optional[Principal]:
+    """Kullanıcıyı ve rollerini veritabanından yükle (iki sorgu, önbelleksiz)"""
+    result = await db.execute(
+        select(User).options(selectinload(User.roles)).where(User.email == email)
+    )
+    user = result.scalars().first()
+    return principal_from_user(user) if user is not None else None
+
+
+async def resolve_principal(
+    email: str,
+    db: AsyncSession,
+    fallback: Optional[Callable[[str], Optional[Principal]]] = None,
+) -> Optional[Principal]:
+    """E-postaya karşılık gelen principal'ı önbellekten veya veritabanından döndür.
+
+    Session çağıran tarafından (dependency olarak) verilir; önbellek isabetinde
+    bağlantı açılmaz. Veritabanında bulunmayan e-postalar için fallback (örn.
+    geliştirme kullanıcıları) denenir; sonuç, bulunamasa bile önbelleğe yazılır.
+    """
+    found, principal = principal_cache.get(email)
+    if found:
+        return principal
+    generation = principal_cache.generation()
+    principal = await load_principal(db, email)
+    if principal is None and fallback is not None:
+        principal = fallback(email)
+    principal_cache.set(email, principal, generation)
+    return principal
+
+
+# Kullanıcı/rol kayıtlarını değiştiren her commit ilgili principal'ları geçersiz kılar
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session, flush_context):
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instance, UserRole):
+            session.info.setdefault("principal_user_ids", set()).add(instance.user_id)
+        elif isinstance(instance, User):
+            session.info.setdefault("principal_user_ids", set()).add(instance.id)
+            session.info.setdefault("principal_emails", set()).add(instance.email)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_principal_changes(orm_execute_state):
+    # Toplu insert/update/delete hangi kullanıcıları etkilediğini söylemez
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in (User, UserRole):
+            orm_execute_state.session.info["principal_clear_all"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals_after_commit(session):
+    user_ids = session.info.pop("principal_user_ids", None)
+    emails = session.info.pop("principal_emails", None)
+    if session.info.pop("principal_clear_all", False):
+        principal_cache.clear()
+    elif user_ids or emails:
+        principal_cache.invalidate(user_ids or (), emails or ())
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principals_after_rollback(session):
+    for key in ("principal_user_ids", "principal_emails", "principal_clear_all"):
+        session.info.pop(key, None)
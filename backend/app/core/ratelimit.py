@@ -0,0 +1,180 @@
+import importlib
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .config import settings
+
+# Giriş denemeleri için jeton kovası (token bucket) tabanlı sınırlayıcı.
+# - IP kovası: her deneme bir jeton harcar (kaba kuvvet / credential stuffing)
+# - Kullanıcı adı kovası: her deneme baştan bir jeton harcar, başarılı giriş
+#   kovayı sıfırlar (jeton iade edilir); böylece yalnızca başarısız denemeler
+#   sayılır ve aynı anda gönderilen denemeler de sınırı aşamaz. Kova boşalınca
+#   hesap, jeton yenilenene kadar kilitlenir
+# Kontrol veritabanı sorgusundan ve bcrypt'ten önce yapılır; reddedilen
+# denemeler CPU harcamaz. Varsayılan arka uç süreç içidir (worker başına);
+# worker'lar arasında paylaşılan bir arka uç RATE_LIMIT_BACKEND ile verilebilir.
+
+
+class RateLimitBackend(ABC):
+    """Jeton kovası deposu arayüzü (örn. Redis tabanlı paylaşılan bir uygulama)"""
+
+    @abstractmethod
+    async def acquire(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Bir jeton harca; kova boşsa harcamadan kaç saniye beklenmesi gerektiğini döndür (0 = izin)"""
+
+    @abstractmethod
+    async def refund(self, key: str, capacity: float, refill_per_second: float) -> None:
+        """acquire ile harcanan bir jetonu geri ver (kapasiteyi aşmadan)"""
+
+    @abstractmethod
+    async def peek(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Jeton harcamadan bekleme süresini döndür (0 = en az bir jeton var)"""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Kovayı sil (sonraki istek dolu kovayla başlar)"""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Süreç içi arka uç; kova sayısı sınırlıdır, en eski kovalar atılır"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (jeton, son güncelleme)
+        self._lock = threading.Lock()
+
+    def _refill(self, key: str, capacity: float, refill_per_second: float, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + (now - updated) * refill_per_second)
+
+    def _wait(self, tokens: float, refill_per_second: float) -> float:
+        return (1 - tokens) / refill_per_second if refill_per_second > 0 else math.inf
+
+    async def acquire(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._refill(key, capacity, refill_per_second, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return 0.0 if allowed else self._wait(tokens, refill_per_second)
+
+    async def refund(self, key: str, capacity: float, refill_per_second: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if key in self._buckets:
+                tokens = self._refill(key, capacity, refill_per_second, now)
+                self._buckets[key] = (min(capacity, tokens + 1), now)
+
+    async def peek(self, key: str, capacity: float, refill_per_second: float) -> float:
+        with self._lock:
+            if key not in self._buckets:
+                return 0.0
+            tokens = self._refill(key, capacity, refill_per_second, time.monotonic())
+        return 0.0 if tokens >= 1 else self._wait(tokens, refill_per_second)
+
+    async def reset(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+def load_backend(spec: str) -> RateLimitBackend:
+    """"memory" veya "paket.modul:Sinif" biçimindeki ayardan arka uç oluştur"""
+    if spec == "memory":
+        return MemoryRateLimitBackend()
+    module_name, _, class_name = spec.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
+
+
+class LoginRateLimiter:
+    def __init__(self, backend: RateLimitBackend, ip_burst: int, ip_per_minute: float,
+                 user_failure_burst: int, user_failure_refill_seconds: float):
+        self.backend = backend
+        self.ip_burst = ip_burst
+        self.ip_rate = ip_per_minute / 60.0
+        self.user_burst = user_failure_burst
+        self.user_rate = 1.0 / user_failure_refill_seconds
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "allowed": 0, "throttled_ip": 0, "throttled_username": 0, "failures": 0, "lockouts": 0,
+        }
+
+    @staticmethod
+    def _user_key(username: str) -> str:
+        return f"login:user:{username.strip().lower()}"
+
+    @staticmethod
+    def _ip_key(client_ip: str) -> str:
+        return f"login:ip:{client_ip}"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _reject(self, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def check(self, username: str, client_ip: Optional[str]) -> None:
+        """Denemeye izin ver veya 429 döndür (veritabanı/bcrypt'ten önce çağrılır).
+
+        Kullanıcı adı jetonu burada harcanır; kontrol ile sonuç arasında
+        eşzamanlı denemeler aynı boş olmayan kovayı göremez.
+        """
+        user_key = self._user_key(username)
+        retry_after = await self.backend.acquire(user_key, self.user_burst, self.user_rate)
+        if retry_after:
+            self._count("throttled_username")
+            raise self._reject(retry_after)
+        if client_ip:
+            retry_after = await self.backend.acquire(self._ip_key(client_ip), self.ip_burst, self.ip_rate)
+            if retry_after:
+                # Deneme yapılmadı; kullanıcı adı jetonu iade edilir
+                await self.backend.refund(user_key, self.user_burst, self.user_rate)
+                self._count("throttled_ip")
+                raise self._reject(retry_after)
+        self._count("allowed")
+
+    async def record_failure(self, username: str) -> None:
+        # Jeton check() içinde harcandı; yalnızca kilitlenme tespit edilir
+        self._count("failures")
+        if await self.backend.peek(self._user_key(username), self.user_burst, self.user_rate):
+            self._count("lockouts")  # kova bu denemeyle boşaldı: hesap geçici olarak kilitli
+
+    async def record_success(self, username: str) -> None:
+        # Başarılı giriş harcanan jetonu ve önceki hataları geri verir
+        await self.backend.reset(self._user_key(username))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "backend": type(self.backend).__name__,
+                "ip_burst": self.ip_burst,
+                "ip_per_minute": round(self.ip_rate * 60, 4),
+                "user_failure_burst": self.user_burst,
+                "user_failure_refill_seconds": round(1 / self.user_rate, 4),
+            }
+
+
+login_limiter = LoginRateLimiter(
+    backend=load_backend(settings.RATE_LIMIT_BACKEND),
+    ip_burst=settings.LOGIN_IP_BURST,
+    ip_per_minute=settings.LOGIN_IP_PER_MINUTE,
+    user_failure_burst=settings.LOGIN_USER_FAILURE_BURST,
+    user_failure_refill_seconds=settings.LOGIN_USER_FAILURE_REFILL_SECONDS,
+)
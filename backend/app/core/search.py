@@ -0,0 +1,154 @@
+import re
+import unicodedata
+import weakref
+from typing import Iterable, Optional
+
+from sqlalchemy import column, event, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection, Engine
+
+from ..models.event import Event
+
+# SQLite FTS5 tam metin indeksi (events tablosu için)
+EVENTS_FTS_TABLE = "events_fts"
+INDEXED_FIELDS = ("title", "description", "location", "organizer")
+# bm25 ağırlıkları: başlık > konum/düzenleyen > açıklama
+FIELD_WEIGHTS = (10.0, 1.0, 3.0, 3.0)
+
+events_fts = table(EVENTS_FTS_TABLE, column("rowid"), *(column(name) for name in INDEXED_FIELDS))
+
+# Türkçe karakterlerin ASCII karşılıkları (aramada "İstanbul" == "istanbul" == "ıstanbul")
+_TURKISH_FOLD = str.maketrans({
+    "I": "ı", "İ": "i",
+})
+_TURKISH_ASCII = str.maketrans({
+    "ı": "i", "ç": "c", "ğ": "g", "ö": "o", "ş": "s", "ü": "u", "â": "a", "î": "i", "û": "u",
+})
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# İndeksin hazır olduğu engine'ler (FTS5 destekli SQLite)
+_ready_engines: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+
+def normalize_search_text(value: Optional[str]) -> str:
+    """Metni Türkçe kurallarına göre küçült ve aksanlardan arındır"""
+    if not value:
+        return ""
+    folded = value.translate(_TURKISH_FOLD).lower().translate(_TURKISH_ASCII)
+    decomposed = unicodedata.normalize("NFKD", folded)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """Kullanıcı aramasını FTS5 MATCH ifadesine çevir (kelime başı eşleşmesi)"""
+    tokens = _TOKEN_RE.findall(normalize_search_text(search))
+    if not tokens:
+        return None
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+def is_search_index_ready(bind) -> bool:
+    """Verilen engine/connection için FTS indeksi kullanılabilir mi"""
+    engine = bind.engine if isinstance(bind, Connection) else bind
+    return _ready_engines.get(engine, False)
+
+
+def mark_search_index_ready(engine: Engine) -> None:
+    """Aynı veritabanına bağlanan başka bir engine'i (örn. async engine) hazır işaretle"""
+    _ready_engines[engine] = True
+
+
+def _index_row(connection: Connection, event_id: int, values: Iterable[Optional[str]]) -> None:
+    connection.execute(
+        text(f"DELETE FROM {EVENTS_FTS_TABLE} WHERE rowid = :rowid"),
+        {"rowid": event_id},
+    )
+    params = {"rowid": event_id}
+    params.update({name: normalize_search_text(value) for name, value in zip(INDEXED_FIELDS, values)})
+    connection.execute(
+        text(
+            f"INSERT INTO {EVENTS_FTS_TABLE} (rowid, {', '.join(INDEXED_FIELDS)}) "
+            f"VALUES (:rowid, {', '.join(':' + name for name in INDEXED_FIELDS)})"
+        ),
+        params,
+    )
+
+
+def index_events(connection: Connection, events: Iterable[Event]) -> None:
+    """Etkinlikleri indekse ekle/güncelle (toplu işlemler için)"""
+    if not is_search_index_ready(connection):
+        return
+    for item in events:
+        _index_row(connection, item.id, (getattr(item, name) for name in INDEXED_FIELDS))
+
+
+def remove_events(connection: Connection, event_ids: Iterable[int]) -> None:
+    """Etkinlikleri indeksten çıkar (toplu işlemler için)"""
+    if not is_search_index_ready(connection):
+        return
+    for event_id in event_ids:
+        connection.execute(
+            text(f"DELETE FROM {EVENTS_FTS_TABLE} WHERE rowid = :rowid"),
+            {"rowid": event_id},
+        )
+
+
+def rebuild_event_search_index(connection: Connection) -> int:
+    """İndeksi events tablosundan baştan oluştur"""
+    connection.execute(text(f"DELETE FROM {EVENTS_FTS_TABLE}"))
+    rows = connection.execute(
+        select(Event.id, *(getattr(Event, name) for name in INDEXED_FIELDS))
+    ).all()
+    for row in rows:
+        _index_row(connection, row[0], row[1:])
+    return len(rows)
+
+
+def ensure_event_search_index(engine: Engine) -> bool:
+    """FTS tablosunu oluştur, gerekirse yeniden indeksle; desteklenmiyorsa False döner"""
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {EVENTS_FTS_TABLE} "
+                f"USING fts5({', '.join(INDEXED_FIELDS)}, tokenize = 'unicode61')"
+            ))
+            indexed = connection.execute(text(f"SELECT count(*) FROM {EVENTS_FTS_TABLE}")).scalar()
+            total = connection.execute(select(func.count(Event.id))).scalar()
+            if indexed != total:
+                rebuild_event_search_index(connection)
+    except Exception as e:
+        # FTS5 derlenmemiş SQLite sürümleri: ILIKE aramasına geri dönülür
+        print(f"Event search index unavailable: {e}")
+        return False
+    _ready_engines[engine] = True
+    return True
+
+
+def event_search_subquery(search: str):
+    """Eşleşen etkinlik id'lerini bm25 skoruyla döndüren alt sorgu (düşük skor = daha alakalı)"""
+    match = build_match_query(search)
+    if match is None:
+        return None
+    fts = literal_column(EVENTS_FTS_TABLE)
+    return (
+        select(
+            events_fts.c.rowid.label("event_id"),
+            func.bm25(fts, *FIELD_WEIGHTS).label("rank"),
+        )
+        .select_from(events_fts)
+        .where(fts.op("MATCH")(match))
+        .subquery()
+    )
+
+
+# ORM ile yapılan ekleme/güncelleme/silmeleri aynı transaction içinde indekse yansıt
+@event.listens_for(Event, "after_insert")
+@event.listens_for(Event, "after_update")
+def _sync_event_after_save(mapper, connection, target):
+    index_events(connection, [target])
+
+
+@event.listens_for(Event, "after_delete")
+def _sync_event_after_delete(mapper, connection, target):
+    remove_events(connection, [target.id])
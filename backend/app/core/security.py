@@ -1,5 +1,11 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from .config import settings
@@ -7,6 +13,36 @@ from .config import settings
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt bilinçli olarak yavaştır; giriş yoğunluğunda ortak thread havuzunu
+# (ve dolayısıyla diğer istekleri) bloklamaması için ayrı bir havuzda çalışır.
+# bcrypt GIL'i bıraktığından işlemler bu havuzda gerçekten paralel yürür.
+_password_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+    return _password_executor
+
+
+def shutdown_password_pool() -> None:
+    """Uygulama kapanırken şifre havuzunu kapat"""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+
+def password_queue_depth() -> int:
+    """Şifre havuzunda thread bekleyen işlem sayısı"""
+    if _password_executor is None:
+        return 0
+    return _password_executor._work_queue.qsize()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Şifreyi doğrula"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -15,6 +51,112 @@ def get_password_hash(password: str) -> str:
     """Şifreyi hashle"""
     return pwd_context.hash(password)
 
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password'ü şifre havuzunda çalıştır (event loop bloklanmaz)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash'i şifre havuzunda çalıştır"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), get_password_hash, password)
+
+
+# JWT imzalama: varsayılan python-jose; JWT_BACKEND="pyjwt" ve PyJWT kuruluysa
+# daha hızlı olan PyJWT kullanılır (aynı HS* token formatı, birbirinin yerine geçer)
+_pyjwt = None
+if settings.JWT_BACKEND == "pyjwt":
+    try:
+        import jwt as _pyjwt
+    except ImportError:
+        print("JWT_BACKEND=pyjwt but PyJWT is not installed, falling back to python-jose")
+
+
+def _encode(payload: dict) -> str:
+    if _pyjwt is not None:
+        return _pyjwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def _decode(token: str) -> Optional[dict]:
+    if _pyjwt is not None:
+        try:
+            return _pyjwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except _pyjwt.PyJWTError:
+            return None
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
+
+class TokenCache:
+    """Doğrulanmış token'lar için boyut sınırlı LRU (anahtar: token'ın SHA-256 özeti).
+
+    Kayıt, token'ın exp zamanında (en geç ttl_seconds sonra) geçersiz olur;
+    böylece süresi dolan bir token önbellekten asla dönmez.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, key: bytes, payload: dict) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """JWT token oluştur"""
     to_encode = data.copy()
@@ -22,15 +164,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
+
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = _encode(to_encode)
     return encoded_jwt
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """JWT token'ı çöz"""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    """JWT token'ı çöz (daha önce doğrulanmış token'lar imza kontrolü yapılmadan önbellekten döner)"""
+    key = TokenCache.key(token)
+    payload = token_cache.get(key)
+    if payload is not None:
         return payload
-    except JWTError:
-        return None
+    payload = _decode(token)
+    if payload is not None:
+        token_cache.set(key, payload)
+    return payload
@@ -0,0 +1,188 @@
+import heapq
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+# İstek başına SQL ölçümü ve yavaş sorgu günlüğü.
+# Dinleyiciler Engine sınıfına bağlıdır; core/database.py'deki birincil,
+# async (senkron çekirdeği) ve replika engine'lerinin her cursor çalıştırması
+# etkin istek ölçümüne eklenir: ifade sayısı, toplam veritabanı süresi ve en
+# yavaş ifadeler. Testler count_statements() ile bir kod bloğunu, HTTP
+# üzerinden ise QUERY_COUNT_HEADER açıkken (çalışma anında da açılabilir)
+# X-Query-Count başlığını ölçebilir; N+1 gerilemeleri sayı artışı olarak yakalanır.
+# DEBUG modunda ölçüm Server-Timing başlığıyla döner. SLOW_QUERY_THRESHOLD_MS'i
+# aşan ifadeler, normalize edilmiş SQL ve parametre tipleriyle "app.sql.slow"
+# günlüğüne yazılır (değerler yazılmaz).
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+SERVER_TIMING_HEADER = "Server-Timing"
+SLOWEST_KEPT = 3
+SQL_PREVIEW_LENGTH = 120
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+
+class StatementCounter:
+    """Bir istek (veya count_statements bloğu) boyunca çalışan SQL ifadelerinin ölçümü"""
+
+    __slots__ = ("count", "total_seconds", "slowest", "scope")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest: List[Tuple[float, str]] = []  # (süre, normalize SQL) min-heap
+        self.scope = scope
+
+    def record(self, seconds: float, statement: str) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, (seconds, statement))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, statement))
+
+    @property
+    def route(self) -> str:
+        """Eşleşen FastAPI route şablonu (örn. /api/v1/events/{event_id})"""
+        if self.scope is None:
+            return "-"
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "-")
+
+    def server_timing(self) -> str:
+        entries = [f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries"']
+        for rank, (seconds, statement) in enumerate(sorted(self.slowest, reverse=True), start=1):
+            preview = _quote(normalize_sql(statement)[:SQL_PREVIEW_LENGTH])
+            entries.append(f'db-slow-{rank};dur={seconds * 1000:.2f};desc="{preview}"')
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[StatementCounter]] = ContextVar("sql_statement_counter", default=None)
+
+
+@contextmanager
+def count_statements(scope: Optional[Scope] = None) -> Iterator[StatementCounter]:
+    """Blok içinde (ve oradan başlatılan thread/task'larda) çalışan SQL ifadelerini ölç"""
+    counter = StatementCounter(scope)
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+# Literal ve yer tutucu kalıpları; normalize edilmiş SQL'de değerler "?" olur,
+# IN (...) listeleri tek bir kalıba indirgenir ki aynı sorgu şekli tek satırda gruplansın
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """Değerlerden arındırılmış, tek satırlık SQL (yavaş sorguları gruplamak için)"""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _STRING_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    return _PLACEHOLDER_LIST.sub("(?, ...)", text)
+
+
+def _type_names(parameters: Any) -> str:
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> str:
+    """Bağlı parametrelerin yalnızca tipleri (değerler günlüğe yazılmaz)"""
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {_type_names(rows[0])}" if rows else "0 x ()"
+    return _type_names(parameters or ())
+
+
+def _quote(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("sql_started_at")
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    counter = _current.get()
+    if counter is not None:
+        counter.record(seconds, statement)
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold and seconds * 1000 >= threshold:
+        slow_query_logger.warning(
+            "slow query %.1fms route=%s sql=%s params=%s",
+            seconds * 1000,
+            counter.route if counter is not None else "-",
+            normalize_sql(statement),
+            parameter_shape(parameters, executemany),
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(exception_context):
+    # Hata alan ifadenin zamanlayıcısı bir sonraki ifadeye karışmasın
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("sql_started_at"):
+        connection.info["sql_started_at"].pop()
+
+
+def configure_slow_query_log() -> None:
+    """SLOW_QUERY_LOG_FILE verildiyse yavaş sorguları ayrıca o dosyaya yaz"""
+    if not settings.SLOW_QUERY_LOG_FILE:
+        return
+    if any(isinstance(handler, logging.FileHandler) for handler in slow_query_logger.handlers):
+        return
+    handler = logging.FileHandler(settings.SLOW_QUERY_LOG_FILE, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_logger.addHandler(handler)
+
+
+class QueryCountMiddleware:
+    """İsteği ölçüm altında çalıştır; QUERY_COUNT_HEADER açıkken X-Query-Count,
+    DEBUG modunda Server-Timing başlığı ekle"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_statements(scope) as counter:
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    # Akış yanıtlarında gövde sırasında çalışan ifadeler başlıklara yansımaz
+                    headers = MutableHeaders(scope=message)
+                    if settings.QUERY_COUNT_HEADER or settings.DEBUG:
+                        headers[QUERY_COUNT_HEADER] = str(counter.count)
+                    if settings.DEBUG:
+                        headers.append(SERVER_TIMING_HEADER, counter.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
@@ -0,0 +1,229 @@
+import os
+import re
+import stat
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import anyio
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from .blobs import BLOB_DIRNAME
+
+# /uploads sunumu: blob deposundaki dosyaların adı içerik özetinden geldiği
+# için değişmezler; uzun süreli "immutable" önbellek başlığı ve dosya adından
+# türetilen güçlü ETag ile sunulurlar. Büyük dosyalar için tek aralıklı
+# (single-range) Range istekleri 206 ile yanıtlanır.
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+LEGACY_CACHE_CONTROL = "public, max-age=86400"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Range başlığını (başlangıç, bitiş) çiftine çevir.
+
+    Birden fazla aralık veya tanınmayan biçim None döner (tam yanıt verilir);
+    karşılanamayan aralık 416 döner.
+    """
+    match = _RANGE_RE.match(range_header.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # "bytes=-N": son N bayt
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+class FileRangeResponse(Response):
+    """Dosyanın yalnızca istenen aralığını parça parça gönderen 206 yanıtı"""
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, path: str, start: int, end: int, size: int, headers: dict, media_type: Optional[str] = None):
+        self.path = path
+        self.start = start
+        self.end = end
+        super().__init__(status_code=status.HTTP_206_PARTIAL_CONTENT, headers=headers, media_type=media_type)
+        self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        # Dosya başlıklardan önce açılır: silinmişse hata yanıt başlamadan yükselir
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class OpenedFileResponse(FileResponse):
+    """Dosyayı yanıt başlıklarını göndermeden önce açan FileResponse.
+
+    Önbellekteki stat sonucu bayatsa (dosya silinmiş) FileNotFoundError henüz
+    hiçbir şey gönderilmeden yükselir ve 404'e çevrilebilir.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["method"].upper() == "HEAD":
+            await super().__call__(scope, receive, send)
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            more_body = True
+            while more_body:
+                chunk = await file.read(self.chunk_size)
+                more_body = len(chunk) == self.chunk_size
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if self.background is not None:
+            await self.background()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    return etag in [tag.strip(" W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+def serve_file(
+    scope,
+    path: str,
+    stat_result: os.stat_result,
+    *,
+    cache_control: str,
+    etag: Optional[str] = None,
+    filename: Optional[str] = None,
+    media_type: Optional[str] = None,
+) -> Response:
+    """Dosyayı önbellek başlıkları, koşullu GET (304) ve Range (206) desteğiyle sun"""
+    request_headers = Headers(scope=scope)
+    response = OpenedFileResponse(
+        path,
+        stat_result=stat_result,
+        filename=filename,
+        media_type=media_type,
+        headers={"cache-control": cache_control, "accept-ranges": "bytes"},
+    )
+    if etag is not None:
+        response.headers["etag"] = etag
+    etag = response.headers["etag"]
+
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return NotModifiedResponse(response.headers)
+
+    range_header = request_headers.get("range")
+    if_range = request_headers.get("if-range")
+    # If-Range eşleşmezse (dosya değişmiş olabilir) tam içerik gönderilir
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = parse_byte_range(range_header, stat_result.st_size)
+        if byte_range is not None:
+            headers = {
+                name: value for name, value in response.headers.items()
+                if name not in ("content-length", "content-type")
+            }
+            return FileRangeResponse(path, *byte_range, stat_result.st_size, headers=headers,
+                                     media_type=response.media_type)
+    return response
+
+
+class UploadStaticFiles(StaticFiles):
+    """/uploads için StaticFiles: immutable önbellek başlıkları, Range ve stat önbelleği.
+
+    private_prefixes altındaki yollar (başvuru dosyaları) hiç sunulmaz; onlar
+    yetkili endpoint üzerinden indirilir.
+    """
+
+    def __init__(self, *args, private_prefixes: Sequence[str] = (), stat_cache_size: int = 2048,
+                 stat_cache_ttl: float = 60.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.private_prefixes = tuple(prefix.strip("/") + "/" for prefix in private_prefixes)
+        self.stat_cache_size = stat_cache_size
+        self.stat_cache_ttl = stat_cache_ttl
+        self._stat_cache: "OrderedDict[str, Tuple[float, str, os.stat_result]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_immutable(path: str) -> bool:
+        return path.replace(os.sep, "/").startswith(BLOB_DIRNAME + "/")
+
+    def _forget(self, path: str) -> None:
+        with self._lock:
+            self._stat_cache.pop(path, None)
+
+    def _cached_lookup(self, path: str) -> Optional[Tuple[str, os.stat_result]]:
+        with self._lock:
+            entry = self._stat_cache.get(path)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._stat_cache[path]
+                return None
+            self._stat_cache.move_to_end(path)
+            return entry[1], entry[2]
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        except FileNotFoundError:
+            # Dosya stat'tan sonra silindi (örn. blob GC); yanıt henüz başlamadı.
+            # Önbellek kaydı atılır ve yol yeniden aranır (404)
+            path = self.get_path(scope)
+            self._forget(path)
+            response = await self.get_response(path, scope)
+            await response(scope, receive, send)
+
+    async def get_response(self, path: str, scope) -> Response:
+        normalized = path.replace(os.sep, "/")
+        if any(normalized.startswith(prefix) for prefix in self.private_prefixes):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        if scope["method"] in ("GET", "HEAD"):
+            # Değişmez dosyalar için stat sonucu önbellekten (thread havuzuna gidilmeden)
+            cached = self._cached_lookup(path)
+            if cached is not None:
+                return self.file_response(cached[0], cached[1], scope)
+        return await super().get_response(path, scope)
+
+    def lookup_path(self, path: str):
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode) and self._is_immutable(path):
+            with self._lock:
+                self._stat_cache[path] = (time.monotonic() + self.stat_cache_ttl, full_path, stat_result)
+                self._stat_cache.move_to_end(path)
+                while len(self._stat_cache) > self.stat_cache_size:
+                    self._stat_cache.popitem(last=False)
+        return full_path, stat_result
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        relative = os.path.relpath(full_path, os.path.realpath(self.directory)) if self.directory else ""
+        if self._is_immutable(relative):
+            # İçerik adresli ad: ETag olarak dosya adı yeterli ve güçlüdür
+            return serve_file(scope, full_path, stat_result, cache_control=IMMUTABLE_CACHE_CONTROL,
+                              etag=f'"{os.path.basename(full_path)}"')
+        return serve_file(scope, full_path, stat_result, cache_control=LEGACY_CACHE_CONTROL)
@@ -0,0 +1,184 @@
+import asyncio
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select
+from starlette.concurrency import run_in_threadpool
+
+from .blobs import is_blob_reference, release_references
+from .config import settings
+from . import database
+from .images import delete_upload_file
+from .leases import acquire_lease, lease_owner_id, release_lease
+from ..models import Story
+
+# Süresi dolmuş storyleri arka planda temizleyen periyodik süpürücü.
+# Her turda veritabanı kilidini (lease) alan tek bir worker çalışır. Satırlar
+# parti parti tek bir DELETE ... RETURNING ile silinir; yalnızca gerçekten
+# silinen satırların blob referansları aynı transaction'da düşülür, bu yüzden
+# eşzamanlı bir elle temizleme çift sayım yapmaz. Blob deposu dışındaki eski
+# dosyalar ayrı bir iş parçacığındaki kuyruğa bırakılır.
+
+LEASE_NAME = "story-sweeper"
+
+
+class FileRemovalWorker:
+    """Dosya silmelerini süpürme/istek akışından ayıran tek iş parçacıklı kuyruk"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.removed = 0
+        self.failed = 0
+
+    def submit(self, image_url: Optional[str], image_variants: Optional[dict] = None) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="file-removal", daemon=True)
+                self._thread.start()
+        self._queue.put((image_url, image_variants))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                delete_upload_file(*item)
+                self.removed += 1
+            except OSError as e:
+                self.failed += 1
+                print(f"Could not remove file {item[0]}: {e}")
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Kuyruktaki dosyaları silip iş parçacığını durdur"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+
+class StorySweeper:
+    def __init__(self, interval_seconds: float, batch_size: int, files: FileRemovalWorker):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.files = files
+        self.owner = lease_owner_id()
+        # Sahip her turda yeniler; çökerse en geç iki tur sonra başka bir worker devralır
+        self.lease_seconds = max(60.0, interval_seconds * 2)
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._counters = {"runs": 0, "skipped_not_leader": 0, "errors": 0, "deleted_total": 0}
+        self._last: Optional[dict] = None
+
+    def sweep(self, now: Optional[datetime] = None) -> dict:
+        """Süresi dolmuş storyleri parti parti sil ve rapor döndür"""
+        now = now or datetime.utcnow()
+        started = time.perf_counter()
+        deleted = batches = files_queued = 0
+        # Süresi dolanlar birincilden okunur; replikadaki gecikmiş liste silmeyi kaçırmasın
+        db = database.primary_session()
+        try:
+            while True:
+                ids = db.scalars(
+                    select(Story.id).where(Story.expires_at < now).order_by(Story.id).limit(self.batch_size)
+                ).all()
+                if not ids:
+                    break
+                rows = db.execute(
+                    delete(Story)
+                    .where(Story.id.in_(ids), Story.expires_at < now)
+                    .returning(Story.image_url, Story.image_variants)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                # Toplu DELETE flush'tan geçmez; blob sayaçları burada düşülür
+                release_references(db.connection(), [row.image_url for row in rows])
+                db.commit()
+                batches += 1
+                deleted += len(rows)
+                for row in rows:
+                    # Blob deposundaki dosyaları collect_garbage siler; harici URL'lerin dosyası yoktur
+                    if (row.image_url or "").startswith("/uploads/") and not is_blob_reference(row.image_url):
+                        self.files.submit(row.image_url, row.image_variants)
+                        files_queued += 1
+                if len(ids) < self.batch_size:
+                    break
+        finally:
+            db.close()
+
+        report = {
+            "deleted": deleted,
+            "batches": batches,
+            "files_queued": files_queued,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "finished_at": datetime.utcnow().isoformat(),
+        }
+        with self._lock:
+            self._counters["runs"] += 1
+            self._counters["deleted_total"] += deleted
+            self._last = report
+        return report
+
+    def run_once(self) -> Optional[dict]:
+        """Kilit bu worker'daysa süpür; değilse None"""
+        if not acquire_lease(database.engine, LEASE_NAME, self.owner, self.lease_seconds):
+            with self._lock:
+                self._counters["skipped_not_leader"] += 1
+            return None
+        return self.sweep()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception as e:
+                with self._lock:
+                    self._counters["errors"] += 1
+                print(f"Story sweep failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # Kilidi bırak; diğer worker'lar süre dolmasını beklemeden devralabilir
+            await run_in_threadpool(release_lease, database.engine, LEASE_NAME, self.owner)
+        await run_in_threadpool(self.files.stop)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "running": self._task is not None,
+                "interval_seconds": self.interval_seconds,
+                "batch_size": self.batch_size,
+                "last": self._last,
+                "files_pending": self.files.pending(),
+                "files_removed": self.files.removed,
+                "files_failed": self.files.failed,
+            }
+
+
+file_removal_worker = FileRemovalWorker()
+
+story_sweeper = StorySweeper(
+    interval_seconds=settings.STORY_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.STORY_SWEEP_BATCH_SIZE,
+    files=file_removal_worker,
+)
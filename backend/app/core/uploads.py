@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import NamedTuple
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+
+# Akış (streaming) tabanlı dosya yükleme: içerik parça parça geçici dosyaya
+# yazılır, boyut sınırı her parçada kontrol edilir ve özet (SHA-256) aynı
+# geçişte hesaplanır. Tamamlanan dosya hedefe atomik olarak taşınır; yarım
+# kalan yüklemeler hedef yolda hiçbir zaman görünmez.
+
+
+class StoredUpload(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Max size: {max_size / 1024 / 1024}MB"
+    )
+
+
+def _discard(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def save_upload_stream(file: UploadFile, destination: str, max_size: int = settings.MAX_FILE_SIZE) -> StoredUpload:
+    """Yüklemeyi boyut sınırıyla parça parça diske yaz ve destination'a atomik taşı"""
+    # Boyut biliniyorsa (multipart başlığından) hiç okumadan reddet
+    if file.size is not None and file.size > max_size:
+        raise _too_large(max_size)
+
+    directory = os.path.dirname(destination) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Geçici dosya aynı dizinde açılır ki os.replace atomik olsun
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise _too_large(max_size)
+                digest.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+        await run_in_threadpool(os.replace, temp_path, destination)
+    except BaseException:
+        await run_in_threadpool(_discard, temp_path)
+        raise
+    return StoredUpload(path=destination, size=size, sha256=digest.hexdigest())
+
+
+class RequestSizeLimitMiddleware:
+    """İstek gövdesini MAX_REQUEST_BODY_SIZE ile sınırlayan ASGI middleware.
+
+    Content-Length sınırı aşıyorsa gövde hiç okunmadan 413 döner; başlık yoksa
+    (chunked) okunan bayt sayılır ve sınır aşıldığında okuma kesilir.
+    """
+
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = next((value for name, value in scope["headers"] if name == b"content-length"), None)
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            body = json.dumps({"detail": "Request body too large"}).encode()
+            await send({"type": "http.response.start", "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        "headers": [(b"content-type", b"application/json"),
+                                    (b"content-length", str(len(body)).encode()),
+                                    (b"connection", b"close")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Route içinde okunduğu için FastAPI bunu 413 yanıtına çevirir
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Request body too large"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,116 @@
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from itertools import chain
+from typing import Any, Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+# Bağımlılıksız, akış (streaming) tabanlı tek sayfalık XLSX üretici.
+# ZIP arşivi aranamaz (unseekable) bir hedefe yazılır ve biriken baytlar
+# parça parça döndürülür; satırlar hiçbir zaman bellekte toplanmaz.
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+FLUSH_BYTES = 64 * 1024
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+# XML 1.0'da izin verilmeyen kontrol karakterleri
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_ILLEGAL_SHEET_NAME = re.compile(r"[\[\]:*?/\\]")
+
+
+class _Sink(io.RawIOBase):
+    """zipfile'ın yazdığı baytları toplayan, aranamaz hedef"""
+
+    def __init__(self):
+        self._chunks = []
+        self.pending = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.pending = 0
+        return data
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(ref: str, value: Any) -> str:
+    if value is None or value == "":
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row(index: int, values: Sequence[Any]) -> bytes:
+    cells = "".join(_cell(f"{_column_letter(column)}{index}", value) for column, value in enumerate(values, start=1))
+    return f'<row r="{index}">{cells}</row>'.encode("utf-8")
+
+
+def iter_xlsx(header: Sequence[Any], rows: Iterable[Sequence[Any]], sheet_name: str = "Sheet1") -> Iterator[bytes]:
+    """Başlık ve satırlardan XLSX dosyasını ~64KB'lık parçalar halinde üret"""
+    name = escape(_ILLEGAL_SHEET_NAME.sub("", sheet_name)[:31] or "Sheet1", {'"': "&quot;"})
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(name=name))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(_SHEET_HEAD.encode("utf-8"))
+            for index, values in enumerate(chain([header], rows), start=1):
+                sheet.write(_row(index, values))
+                if sink.pending >= FLUSH_BYTES:
+                    yield sink.drain()
+            sheet.write(_SHEET_TAIL.encode("utf-8"))
+    yield sink.drain()  # merkezi dizin arşiv kapanırken yazılır
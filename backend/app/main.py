@@ -1,14 +1,31 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 
 from .core.config import settings
-from .core.database import engine, Base
+from .core.database import engine, async_engine, replica_engines, async_replica_engines, Base
+from .api import deps
 from .api.api import api_router
 from .models import Admin
-from .core.security import get_password_hash
+from .core.security import get_password_hash, password_queue_depth, shutdown_password_pool, token_cache
 from .core.database import SessionLocal
+from .core.search import ensure_event_search_index, mark_search_index_ready
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.cache import ResponseCacheMiddleware, response_cache
+from .core.conditional import query_flag_set
+from .core.ratelimit import login_limiter
+from .core.images import pending_image_jobs, shutdown_image_pool
+from .core.uploads import RequestSizeLimitMiddleware
+from .core.blobs import BLOB_DIRNAME
+from .core.static import UploadStaticFiles
+from .core.sweeper import story_sweeper
+from .core.sqlstats import QUERY_COUNT_HEADER, SERVER_TIMING_HEADER, QueryCountMiddleware, configure_slow_query_log
+from .core.principals import principal_cache
+from .core.metrics import (
+    CACHE_ENTRIES, CACHE_HITS, CACHE_MISSES, CONTENT_TYPE as METRICS_CONTENT_TYPE, WORK_QUEUE,
+    MetricsMiddleware, registry as metrics_registry,
+)
+from starlette.concurrency import run_in_threadpool
 
 # Veritabanı tablolarını oluştur
 # Base.metadata.create_all(bind=engine) # Testler için bu satırı yorumla, conftest.py yönetecek
@@ -19,6 +36,33 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# İstek gövdesi sınırı: büyük yüklemeler multipart ayrıştırılmadan reddedilir
+app.add_middleware(RequestSizeLimitMiddleware, max_body_size=settings.MAX_REQUEST_BODY_SIZE)
+
+# Public okuma endpoint'leri için yanıt önbelleği (yol -> geçersiz kılma etiketleri)
+# CORS'tan önce eklenir ki önbellekten dönen yanıtlara da CORS başlıkları eklensin
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        routes={
+            f"{settings.API_V1_STR}/events/": ("events",),
+            f"{settings.API_V1_STR}/events/featured": ("events",),
+            f"{settings.API_V1_STR}/categories/": ("categories",),
+            f"{settings.API_V1_STR}/stories/": ("stories",),
+            f"{settings.API_V1_STR}/settings/": ("settings",),
+        },
+        # upcoming_only şimdiki zamana göre süzer; TTL boyunca geçmişte kalan etkinlikler sunulmasın
+        bypass={
+            f"{settings.API_V1_STR}/events/": query_flag_set("upcoming_only"),
+            f"{settings.API_V1_STR}/events/featured": query_flag_set("upcoming_only"),
+        },
+    )
+
+# İstek başına SQL ölçümü (N+1 tespiti; testler başlığı doğrular)
+# X-Query-Count QUERY_COUNT_HEADER, Server-Timing DEBUG açıkken eklenir; önbellekten dönen yanıtlar 0 sayar
+configure_slow_query_log()
+app.add_middleware(QueryCountMiddleware)
+
 # CORS ayarları
 app.add_middleware(
     CORSMiddleware,
@@ -26,14 +70,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER, SERVER_TIMING_HEADER, "X-Cache", "ETag", "Last-Modified", "Content-Range", "Accept-Ranges"],
 )
 
+# İstek metrikleri en dışta ölçülür; CORS ön kontrolleri ve önbellekten dönen yanıtlar da dahil
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # API router'ını ekle
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-# Statik dosyalar (upload edilen görseller)
+# Statik dosyalar (upload edilen görseller); başvuru dosyaları yalnızca yetkili endpoint'ten indirilir
 if os.path.exists(settings.UPLOAD_FOLDER):
-    app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_FOLDER), name="uploads")
+    app.mount(
+        "/uploads",
+        UploadStaticFiles(directory=settings.UPLOAD_FOLDER, private_prefixes=("applications", f"{BLOB_DIRNAME}/applications")),
+        name="uploads",
+    )
 
 # Ana sayfa
 @app.get("/")
@@ -49,6 +102,44 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+# Yanıt önbelleği sayaçları (hit/miss/eviction)
+@app.get("/health/cache")
+def cache_stats():
+    return response_cache.stats()
+
+# Giriş denemesi sınırlayıcısı sayaçları (izin/ret/kilitlenme)
+@app.get("/health/login-throttle")
+def login_throttle_stats():
+    return login_limiter.stats()
+
+# Story süpürücüsü: son tur raporu ve toplam sayaçlar
+@app.get("/health/story-sweeper")
+def story_sweeper_stats():
+    return story_sweeper.stats()
+
+# Önbellek ve kuyruk sayaçları her anlık görüntüde metriklere aktarılır
+def collect_runtime_metrics():
+    for name, cache in (("response", response_cache), ("principal", principal_cache), ("token", token_cache)):
+        stats = cache.stats()
+        CACHE_HITS.set((name,), stats["hits"])
+        CACHE_MISSES.set((name,), stats["misses"])
+        CACHE_ENTRIES.set((name,), stats["entries"])
+    WORK_QUEUE.set(("image",), pending_image_jobs())
+    WORK_QUEUE.set(("password",), password_queue_depth())
+
+
+metrics_registry.register_collector(collect_runtime_metrics)
+
+# Prometheus metrikleri (çok süreçli modda tüm worker'ların toplamı)
+if settings.METRICS_ENABLED:
+    metrics_dependencies = [Depends(deps.get_current_active_admin)] if settings.METRICS_REQUIRE_ADMIN else []
+
+    @app.get("/metrics", include_in_schema=False, dependencies=metrics_dependencies)
+    async def metrics():
+        snapshot = metrics_registry.snapshot()
+        body = await run_in_threadpool(metrics_registry.render, snapshot)
+        return Response(body, headers={"Content-Type": METRICS_CONTENT_TYPE})
+
 # İlk admin kullanıcısını oluştur (eğer yoksa)
 def create_initial_admin():
     db = SessionLocal()
@@ -75,4 +166,25 @@ def create_initial_admin():
 @app.on_event("startup")
 async def startup_event():
     create_initial_admin()
+    if ensure_event_search_index(engine):
+        # Async engine ve replikalar aynı şemayı kullanır; indeks onlar için de hazır
+        async_engines = [async_engine, *async_replica_engines] if async_engine is not None else async_replica_engines
+        for ready_engine in [*replica_engines, *(ready.sync_engine for ready in async_engines)]:
+            mark_search_index_ready(ready_engine)
+    if settings.STORY_SWEEP_ENABLED:
+        story_sweeper.start()
+    if settings.METRICS_ENABLED:
+        metrics_registry.start(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL_SECONDS)
     print(f"Application started. API docs available at http://localhost:8000/docs")
+
+# Uygulama kapanırken süpürücüyü, görsel işleme ve şifre havuzlarını kapat
+@app.on_event("shutdown")
+async def shutdown_event():
+    await story_sweeper.stop()
+    await metrics_registry.stop()
+    await shutdown_image_pool()
+    shutdown_password_pool()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in async_replica_engines:
+        await replica.dispose()
@@ -9,6 +9,9 @@ from .club import Club, ClubMember
 from .user_role import UserRole
 from .content_request import ContentRequest
 from .form import Form, Application, ApplicationFile
+from .table_version import TableVersion
+from .blob import Blob
+from .job_lease import JobLease
 
 __all__ = [
     "Category",
@@ -24,4 +27,7 @@ __all__ = [
     "Form",
     "Application",
     "ApplicationFile",
+    "TableVersion",
+    "Blob",
+    "JobLease",
 ]
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from datetime import datetime
+from ..core.database import Base
+
+
+class Blob(Base):
+    """İçerik adresli (SHA-256) yükleme kaydı; aynı içerik bir kez saklanır"""
+    __tablename__ = "blobs"
+
+    key = Column(String, primary_key=True)  # "<bucket>/ab/cd/<sha256>.<uzantı>"
+    sha256 = Column(String(64), nullable=False, index=True)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Event/Story.image_url ve ApplicationFile.file_path referansları
+    meta = Column(JSON, nullable=True)  # Görseller için varyant manifesti
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Çöp toplama: referansı kalmamış eski kayıtlar
+        Index("ix_blobs_ref_count_updated_at", "ref_count", "updated_at"),
+    )
@@ -19,4 +19,4 @@ class Category(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # İlişkiler
-    events = relationship("Event", back_populates="category")
+    events = relationship("Event", back_populates="category", lazy="raise")
@@ -15,9 +15,9 @@ class Club(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_onupdate=func.now())
 
-    members = relationship("ClubMember", back_populates="club")
-    content_requests = relationship("ContentRequest", back_populates="club")
-    club_specific_roles = relationship("UserRole", back_populates="club", foreign_keys="[UserRole.club_id]")
+    members = relationship("ClubMember", back_populates="club", lazy="raise")
+    content_requests = relationship("ContentRequest", back_populates="club", lazy="raise")
+    club_specific_roles = relationship("UserRole", back_populates="club", foreign_keys="[UserRole.club_id]", lazy="raise")
 
 class ClubMember(Base):
     __tablename__ = "club_members"
@@ -28,5 +28,5 @@ class ClubMember(Base):
     role = Column(String, nullable=False) # E.g., "member", "officer", "president"
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    club = relationship("Club", back_populates="members")
-    user = relationship("User", back_populates="club_memberships")
+    club = relationship("Club", back_populates="members", lazy="raise")
+    user = relationship("User", back_populates="club_memberships", lazy="raise")
@@ -14,5 +14,5 @@ class ContentRequest(Base):
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
     reviewer_id = Column(Integer, ForeignKey("users.id"), nullable=True) # Admin/SuperAdmin who reviewed
 
-    club = relationship("Club", back_populates="content_requests")
-    reviewer = relationship("User", back_populates="reviewed_requests", foreign_keys=[reviewer_id])
+    club = relationship("Club", back_populates="content_requests", lazy="raise")
+    reviewer = relationship("User", back_populates="reviewed_requests", foreign_keys=[reviewer_id], lazy="raise")
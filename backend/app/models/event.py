@@ -1,20 +1,35 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Boolean, Index, JSON
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
+from typing import Optional
 from ..core.database import Base
 
 
+def compose_starts_at(date: Optional[str], time: Optional[str]) -> Optional[datetime]:
+    """YYYY-MM-DD tarih ve HH:MM(:SS) saat metinlerinden başlangıç zamanı üret"""
+    if not date or not time:
+        return None
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(f"{date.strip()} {time.strip()}", fmt)
+        except ValueError:
+            continue
+    return None
+
+
 class Event(Base):
     __tablename__ = "events"
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
-    date = Column(String, nullable=False)  # YYYY-MM-DD formatında
-    time = Column(String, nullable=False)  # HH:MM formatında
+    date = Column(String, nullable=False)  # YYYY-MM-DD formatında (eski alan, starts_at ile senkron)
+    time = Column(String, nullable=False)  # HH:MM formatında (eski alan, starts_at ile senkron)
+    starts_at = Column(DateTime, nullable=False)  # date + time; sıralama ve filtreleme bu kolonla yapılır
     location = Column(String, nullable=False)
     organizer = Column(String, nullable=False)
     image_url = Column(String, nullable=True)
+    image_variants = Column(JSON, nullable=True)  # Yüklenen görselin boyut/format varyantları (srcset manifesti)
     
     # Harita koordinatları
     latitude = Column(Float, nullable=True)
@@ -27,10 +42,34 @@ class Event(Base):
     
     # Kategori ilişkisi
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    category = relationship("Category", back_populates="events")
+    category = relationship("Category", back_populates="events", lazy="raise")
     
     # Durum ve tarihler
     is_active = Column(Boolean, default=True)
     is_featured = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Ana sayfa sorguları: aktif etkinlikler tarih sırasıyla, kategori/öne çıkan filtreli
+        Index("ix_events_active_starts_at", "is_active", "starts_at", "id"),
+        Index("ix_events_active_category_starts_at", "is_active", "category_id", "starts_at", "id"),
+        Index("ix_events_active_featured_starts_at", "is_active", "is_featured", "starts_at", "id"),
+    )
+
+    @validates("date", "time")
+    def _sync_starts_at(self, key, value):
+        """date/time değiştiğinde starts_at'i güncelle"""
+        date = value if key == "date" else self.date
+        time = value if key == "time" else self.time
+        starts_at = compose_starts_at(date, time)
+        if starts_at is not None:
+            self.starts_at = starts_at
+        return value
+
+    @validates("image_url")
+    def _reset_image_variants(self, key, value):
+        """Görsel değişirse eski varyant manifesti geçersizdir"""
+        if value != self.image_url:
+            self.image_variants = None
+        return value
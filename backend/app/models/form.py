@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Index, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -13,12 +13,13 @@ class Form(Base):
     description = Column(Text, nullable=True)
     fields_json = Column(JSON, nullable=False) # Stores the structure of the form fields
     is_active = Column(Boolean, default=False, index=True) # Default to False, activate when ready
+    allow_multiple_submissions = Column(Boolean, default=False, server_default=false(), nullable=False) # Otherwise one application per user
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_onupdate=func.now())
 
-    club = relationship("Club") # Relationship to Club model
+    club = relationship("Club", lazy="raise") # Relationship to Club model
     # event = relationship("Event") # Optional: Relationship to Event model
-    applications = relationship("Application", back_populates="form", cascade="all, delete-orphan")
+    applications = relationship("Application", back_populates="form", cascade="all, delete-orphan", lazy="raise")
 
 class Application(Base):
     __tablename__ = "applications"
@@ -29,10 +30,21 @@ class Application(Base):
     status = Column(String, default="submitted", index=True) # e.g., submitted, under_review, accepted, rejected
     data_json = Column(JSON, nullable=False) # Stores the actual submitted data
     submitted_at = Column(DateTime(timezone=True), server_default=func.now())
+    idempotency_key = Column(String(128), nullable=True) # Client-supplied Idempotency-Key; retries return this application
+    # SINGLE_SUBMISSION_SLOT for forms that accept one application per user, NULL otherwise
+    # (NULLs never collide in the unique index below)
+    submission_slot = Column(Integer, nullable=True)
 
-    form = relationship("Form", back_populates="applications")
-    submitter = relationship("User") # Relationship to User model
-    application_files = relationship("ApplicationFile", back_populates="application", cascade="all, delete-orphan")
+    form = relationship("Form", back_populates="applications", lazy="raise")
+    submitter = relationship("User", lazy="raise") # Relationship to User model
+    application_files = relationship("ApplicationFile", back_populates="application", cascade="all, delete-orphan", lazy="raise")
+
+    __table_args__ = (
+        Index("uq_applications_idempotency", "form_id", "user_id", "idempotency_key", unique=True),
+        Index("uq_applications_submission_slot", "form_id", "user_id", "submission_slot", unique=True),
+    )
+
+SINGLE_SUBMISSION_SLOT = 1
 
 class ApplicationFile(Base):
     __tablename__ = "application_files"
@@ -44,4 +56,4 @@ class ApplicationFile(Base):
     original_file_name = Column(String, nullable=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    application = relationship("Application", back_populates="application_files")
+    application = relationship("Application", back_populates="application_files", lazy="raise")
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+from ..core.database import Base
+
+
+class JobLease(Base):
+    """Arka plan işi kilidi: birden fazla worker arasında işi tek bir sahip çalıştırır"""
+    __tablename__ = "job_leases"
+
+    name = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)  # "<host>:<pid>:<rastgele>"
+    expires_at = Column(DateTime, nullable=False)  # sahip bu süreye kadar yenilemezse kilit devralınabilir
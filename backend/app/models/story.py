@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Index
+from sqlalchemy.orm import validates
 from datetime import datetime, timedelta
 from ..core.database import Base
 
@@ -9,13 +10,26 @@ class Story(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     image_url = Column(String, nullable=False)
+    image_variants = Column(JSON, nullable=True)  # Yüklenen görselin boyut/format varyantları (srcset manifesti)
     link_url = Column(String, nullable=True)  # Tıklandığında yönlendirilecek URL
     order_index = Column(Integer, default=0)  # Sıralama için
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=24))
+    expires_at = Column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=24), index=True)  # süpürücü tarar
+
+    __table_args__ = (
+        # Public liste: aktif ve süresi dolmamış storyler
+        Index("ix_stories_is_active_expires_at", "is_active", "expires_at"),
+    )
     
     @property
     def is_expired(self):
         """Story'nin süresi dolmuş mu kontrol et"""
         return datetime.utcnow() > self.expires_at
+
+    @validates("image_url")
+    def _reset_image_variants(self, key, value):
+        """Görsel değişirse eski varyant manifesti geçersizdir"""
+        if value != self.image_url:
+            self.image_variants = None
+        return value
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..core.database import Base
+
+
+class TableVersion(Base):
+    """Tablo bazında değişiklik sayacı (ETag / Last-Modified doğrulayıcıları için)"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -15,7 +15,7 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_onupdate=func.now())
 
-    club_memberships = relationship("ClubMember", back_populates="user")
-    roles = relationship("UserRole", back_populates="user")
+    club_memberships = relationship("ClubMember", back_populates="user", lazy="raise")
+    roles = relationship("UserRole", back_populates="user", lazy="raise")
     # reviewed_content_requests by user:
-    reviewed_requests = relationship("ContentRequest", back_populates="reviewer", foreign_keys="[ContentRequest.reviewer_id]")
+    reviewed_requests = relationship("ContentRequest", back_populates="reviewer", foreign_keys="[ContentRequest.reviewer_id]", lazy="raise")
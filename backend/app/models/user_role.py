@@ -13,5 +13,5 @@ class UserRole(Base):
     club_id = Column(Integer, ForeignKey("clubs.id"), nullable=True) # Nullable if not a club-specific role
     granted_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    user = relationship("User", back_populates="roles")
-    club = relationship("Club", back_populates="club_specific_roles", foreign_keys=[club_id])
+    user = relationship("User", back_populates="roles", lazy="raise")
+    club = relationship("Club", back_populates="club_specific_roles", foreign_keys=[club_id], lazy="raise")
@@ -1,5 +1,6 @@
 from .category import Category, CategoryCreate, CategoryUpdate
-from .event import Event, EventCreate, EventUpdate, EventList
+from .image import ImageVariant, ResponsiveImage
+from .event import Event, EventCreate, EventUpdate, EventList, EventImportError, EventImportReport
 from .story import Story, StoryCreate, StoryUpdate
 from .auth import Token, TokenData, Admin # Assuming Admin here is a schema, not a model
 from .settings import Settings, SettingsUpdate
@@ -23,6 +24,10 @@ __all__ = [
     "EventCreate",
     "EventUpdate",
     "EventList",
+    "EventImportError",
+    "EventImportReport",
+    "ImageVariant",
+    "ResponsiveImage",
     "Story",
     "StoryCreate",
     "StoryUpdate",
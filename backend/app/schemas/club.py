@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-# from .user import UserRead # Using forward reference for UserRead in ClubMemberRead
+from .user import UserRead
 
 class ClubBase(BaseModel):
     name: str
@@ -42,7 +42,7 @@ class ClubMemberRead(ClubMemberBase):
     id: int
     club_id: int # Include club_id for clarity
     joined_at: datetime
-    user: Optional['schemas.user.UserRead'] = None # Forward reference for user details
+    user: Optional[UserRead] = None # Üye kullanıcı bilgileri
 
     class Config:
         from_attributes = True
@@ -1,7 +1,29 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, field_validator
+from typing import List, Optional
 from datetime import datetime
 from .category import Category
+from .image import ResponsiveImage
+
+
+def _validate_date(value: Optional[str]) -> Optional[str]:
+    if value is not None:
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError("date must be in YYYY-MM-DD format")
+    return value
+
+
+def _validate_time(value: Optional[str]) -> Optional[str]:
+    if value is not None:
+        for fmt in ("%H:%M", "%H:%M:%S"):
+            try:
+                datetime.strptime(value, fmt)
+                return value
+            except ValueError:
+                continue
+        raise ValueError("time must be in HH:MM format")
+    return value
 
 
 class EventBase(BaseModel):
@@ -23,7 +45,16 @@ class EventBase(BaseModel):
 
 
 class EventCreate(EventBase):
-    pass
+    # Biçim yalnızca girdide doğrulanır; Event/EventList eski kayıtları da döndürebilmeli
+    @field_validator("date")
+    @classmethod
+    def check_date(cls, value: Optional[str]) -> Optional[str]:
+        return _validate_date(value)
+
+    @field_validator("time")
+    @classmethod
+    def check_time(cls, value: Optional[str]) -> Optional[str]:
+        return _validate_time(value)
 
 
 class EventUpdate(BaseModel):
@@ -43,9 +74,21 @@ class EventUpdate(BaseModel):
     is_active: Optional[bool] = None
     is_featured: Optional[bool] = None
 
+    @field_validator("date")
+    @classmethod
+    def check_date(cls, value: Optional[str]) -> Optional[str]:
+        return _validate_date(value)
+
+    @field_validator("time")
+    @classmethod
+    def check_time(cls, value: Optional[str]) -> Optional[str]:
+        return _validate_time(value)
+
 
 class Event(EventBase):
     id: int
+    starts_at: datetime
+    image_variants: Optional[ResponsiveImage] = None
     created_at: datetime
     updated_at: datetime
     category: Category  # Kategori bilgisi de döneceğiz
@@ -61,10 +104,27 @@ class EventList(BaseModel):
     description: str
     date: str
     time: str
+    starts_at: datetime
     location: str
     category: Category
     image_url: Optional[str] = None
+    image_variants: Optional[ResponsiveImage] = None
     organizer: str
     
     class Config:
         from_attributes = True
+
+
+class EventImportError(BaseModel):
+    """İçe aktarmada atlanan satır (dosyadaki satır numarası)"""
+    row: int
+    errors: List[str]
+
+
+class EventImportReport(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    dry_run: bool
+    errors: List[EventImportError]
+    errors_truncated: bool  # hata sayısı rapor sınırını aştıysa True
@@ -1,8 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Any, Dict
 from datetime import datetime
-# Assuming UserRead will be imported using forward reference or direct import if no circularity
-# from .user import UserRead
+from .user import UserRead
 
 # Schema for individual fields within a form's fields_json
 class FormFieldSchema(BaseModel):
@@ -19,6 +18,7 @@ class FormBase(BaseModel):
     description: Optional[str] = None
     fields_json: List[FormFieldSchema] # Defines the structure of the form
     is_active: bool = False
+    allow_multiple_submissions: bool = False # Otherwise each user can apply once
     # event_id: Optional[int] = None # If forms can be linked to events
 
 class FormCreate(FormBase):
@@ -29,6 +29,7 @@ class FormUpdate(BaseModel): # Allow partial updates
     description: Optional[str] = None
     fields_json: Optional[List[FormFieldSchema]] = None
     is_active: Optional[bool] = None
+    allow_multiple_submissions: Optional[bool] = None
     # event_id: Optional[int] = None
 
 class FormRead(FormBase):
@@ -78,7 +79,7 @@ class ApplicationRead(ApplicationBase):
     user_id: int
     status: str
     submitted_at: datetime
-    submitter: Optional['schemas.user.UserRead'] = None # Populate user details using forward reference
+    submitter: Optional[UserRead] = None # Populate user details
     application_files: List[ApplicationFileRead] = [] # Populate submitted files
 
     class Config:
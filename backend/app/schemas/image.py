@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str  # "webp", "jpeg", "png" ...
+
+
+class ResponsiveImage(BaseModel):
+    """Yüklenen görselin varyantları; srcset değerleri formata göre hazır döner"""
+    width: int
+    height: int
+    srcset: Dict[str, str]  # örn. {"webp": "/uploads/x_w400.webp 400w, ...", "jpg": "..."}
+    variants: List[ImageVariant]
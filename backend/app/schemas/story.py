@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from .image import ResponsiveImage
 
 
 class StoryBase(BaseModel):
@@ -25,6 +26,7 @@ class StoryUpdate(BaseModel):
 
 class Story(StoryBase):
     id: int
+    image_variants: Optional[ResponsiveImage] = None
     created_at: datetime
     expires_at: datetime
     is_expired: bool
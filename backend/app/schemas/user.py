@@ -1,8 +1,7 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List # Added List
 from datetime import datetime
-# Ensure UserRoleRead is importable. Using forward reference as string.
-# from .user_role import UserRoleRead # This would be direct import
+from .user_role import UserRoleRead
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -24,7 +23,7 @@ class UserRead(UserBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
-    roles: List['schemas.user_role.UserRoleRead'] = [] # Forward reference
+    roles: List[UserRoleRead] = []
 
     class Config:
         from_attributes = True
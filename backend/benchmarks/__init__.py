@@ -0,0 +1,16 @@
+"""
+Performans ölçüm (benchmark) paketi
+
+Sentetik veri üretimi ve ana endpoint'lerin yük altında ölçümü. backend
+klasöründen çalıştırılır; veritabanı .env'deki DATABASE_URL'dir.
+
+    # Ölçek faktörü 1: ~2000 etkinlik, 1000 kullanıcı, 10000 başvuru
+    python -m benchmarks generate --scale 1 --seed 42 --reset
+
+    # Uygulama aynı süreçte (ağ olmadan) veya çalışan bir sunucuya karşı
+    python -m benchmarks run --mode inprocess --output reports/base.json
+    python -m benchmarks run --mode http --base-url http://localhost:8000 --output reports/http.json
+
+    # İki raporu karşılaştır (throughput ve p50/p95/p99 farkları)
+    python -m benchmarks compare reports/base.json reports/new.json
+"""
@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import sys
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "manifest.json")
+
+
+def _generate(args) -> None:
+    from app.core.database import engine
+    from .dataset import generate_dataset, write_manifest
+
+    manifest = generate_dataset(engine, scale=args.scale, seed=args.seed, reset=args.reset, batch_size=args.batch_size)
+    write_manifest(manifest, args.manifest)
+    print(json.dumps(manifest["counts"]))
+    print(f"Manifest yazıldı: {args.manifest}")
+
+
+def _run(args) -> None:
+    from .dataset import read_manifest
+    from .runner import http_client, inprocess_client, run_benchmarks
+    from .scenarios import SCENARIOS
+
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Bilinmeyen senaryo: {', '.join(unknown)} (mevcut: {', '.join(SCENARIOS)})")
+    manifest = read_manifest(args.manifest)
+    if args.mode == "http":
+        client_context, target = http_client(args.base_url, args.concurrency), args.base_url
+    else:
+        client_context, target = inprocess_client(), "app.main:app"
+    with client_context as client:
+        report = run_benchmarks(
+            client, manifest, names, mode=args.mode, target=target, requests=args.requests,
+            concurrency=args.concurrency, warmup=args.warmup, seed=args.seed,
+        )
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Rapor yazıldı: {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+def _compare(args) -> None:
+    from .runner import compare_reports
+
+    with open(args.base, encoding="utf-8") as handle:
+        base = json.load(handle)
+    with open(args.new, encoding="utf-8") as handle:
+        new = json.load(handle)
+    print("\n".join(compare_reports(base, new)))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Sentetik veri üretimi ve endpoint ölçümleri")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Ölçek faktörüne göre sentetik veri üret (DATABASE_URL)")
+    generate.add_argument("--scale", type=float, default=1.0, help="1.0: ~2000 etkinlik, 1000 kullanıcı, 10000 başvuru")
+    generate.add_argument("--seed", type=int, default=42)
+    generate.add_argument("--reset", action="store_true", help="Tüm tabloları silip yeniden oluştur")
+    generate.add_argument("--batch-size", type=int, default=5000, help="INSERT başına satır")
+    generate.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    generate.set_defaults(handler=_generate)
+
+    run = commands.add_parser("run", help="Senaryoları çalıştır ve JSON rapor üret")
+    run.add_argument("--mode", choices=("inprocess", "http"), default="inprocess")
+    run.add_argument("--base-url", default="http://localhost:8000", help="http modunda hedef sunucu")
+    run.add_argument("--scenarios", help="Virgülle ayrılmış senaryo adları; varsayılan hepsi")
+    run.add_argument("--requests", type=int, default=200, help="Senaryo başına ölçülen istek")
+    run.add_argument("--warmup", type=int, default=20, help="Ölçüm öncesi ısınma isteği")
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    run.add_argument("--output", help="Rapor dosyası (verilmezse stdout)")
+    run.set_defaults(handler=_run)
+
+    compare = commands.add_parser("compare", help="İki raporu karşılaştır")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Engine
+
+from app.core.database import Base
+from app.core.roles import RoleType
+from app.core.search import ensure_event_search_index
+from app.models import (
+    Application, ApplicationFile, Category, Club, ClubMember, Event, Form, Story, User, UserRole,
+)
+
+# Ölçeklenebilir sentetik veri kümesi.
+# Satır sayıları ölçek faktörüyle çarpılır; aynı tohum (seed) aynı veriyi
+# üretir. Satırlar ORM nesnesi oluşturmadan toplu INSERT ile ve açık id'lerle
+# yazılır, böylece ölçüm senaryoları (benchmarks/scenarios.py) veritabanını
+# sorgulamadan manifest üzerinden geçerli id'ler seçebilir.
+
+BASE_COUNTS = {
+    "clubs": 20,
+    "users": 1000,
+    "events": 2000,
+    "forms_per_club": 2,
+    "applications": 10000,
+    "stories": 50,
+}
+HOT_FORM_SHARE = 0.3  # başvuruların bu kadarı 1. kulübün ilk formuna gider (derin sayfalama için)
+BENCH_PASSWORD_HASH = "benchmark-not-a-login"
+USER_EMAIL_PATTERN = "bench-user{n}@example.com"
+ADMIN_EMAIL = "bench-admin@example.com"
+MANAGER_EMAIL = "bench-manager@example.com"  # 1. kulübün yöneticisi
+
+CATEGORIES = [
+    {"name": "Film", "slug": "film", "color_class": "bg-soft-blue", "text_color_class": "text-blue-800", "icon": "Film"},
+    {"name": "Eğitim", "slug": "education", "color_class": "bg-soft-green", "text_color_class": "text-green-800", "icon": "GraduationCap"},
+    {"name": "Sosyal", "slug": "social", "color_class": "bg-purple-100", "text_color_class": "text-vivid-purple", "icon": "Users"},
+    {"name": "Spor", "slug": "sports", "color_class": "bg-amber-100", "text_color_class": "text-amber-800", "icon": "Trophy"},
+    {"name": "Sanat", "slug": "arts", "color_class": "bg-soft-pink", "text_color_class": "text-pink-800", "icon": "Palette"},
+]
+
+TOPICS = [
+    "Yapay Zeka", "Girişimcilik", "Fotoğrafçılık", "Satranç", "Tiyatro", "Kariyer", "Robotik", "Caz",
+    "Münazara", "Kodlama", "Bilim Kurgu", "Halk Dansları", "Basketbol", "Yoga", "Edebiyat", "Sinema",
+    "Blokzincir", "Gönüllülük", "Mimarlık", "Psikoloji", "İklim", "Oyun Tasarımı", "Tarih", "Müzik",
+]
+FORMATS = ["Atölyesi", "Söyleşisi", "Turnuvası", "Gösterimi", "Semineri", "Buluşması", "Festivali", "Kampı"]
+LOCATIONS = [
+    "Beyazıt Kampüsü", "Avcılar Kampüsü", "Kongre Merkezi", "Rektörlük Konferans Salonu",
+    "Merkez Kütüphane", "Spor Salonu", "Fen Fakültesi Amfi 3", "Hukuk Fakültesi Bahçesi",
+]
+FACULTIES = ["Mühendislik", "Tıp", "Hukuk", "İktisat", "Edebiyat", "Fen", "İletişim", "Eczacılık"]
+FIRST_NAMES = ["Ayşe", "Mehmet", "Zeynep", "Can", "Elif", "Burak", "Selin", "Emre", "Deniz", "Ece", "Kaan", "İrem"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Öztürk", "Aydın", "Arslan", "Doğan", "Koç"]
+SENTENCES = [
+    "Alanında uzman konuklarla interaktif bir oturum.",
+    "Katılım ücretsizdir, kontenjan sınırlıdır.",
+    "Etkinlik sonunda katılım belgesi verilecektir.",
+    "Tüm fakültelerden öğrenciler davetlidir.",
+    "Program sonrası ikram ve tanışma bölümü olacaktır.",
+    "Önceden deneyim gerekmez, malzemeler kulüp tarafından sağlanır.",
+]
+
+FORM_FIELDS = [
+    {"name": "full_name", "label": "Ad Soyad", "type": "text", "required": True},
+    {"name": "email", "label": "E-posta", "type": "email", "required": True},
+    {"name": "phone", "label": "Telefon", "type": "tel", "required": False},
+    {"name": "faculty", "label": "Fakülte", "type": "select", "required": True, "options": FACULTIES},
+    {"name": "year", "label": "Sınıf", "type": "radio", "required": True, "options": ["1", "2", "3", "4"]},
+    {"name": "gpa", "label": "Not Ortalaması", "type": "number", "required": False},
+    {"name": "interests", "label": "İlgi Alanları", "type": "checkbox", "required": False, "options": TOPICS[:8]},
+    {"name": "motivation", "label": "Neden katılmak istiyorsunuz?", "type": "textarea", "required": True},
+    {"name": "consent", "label": "KVKK metnini okudum", "type": "checkbox", "required": True},
+]
+
+
+def scaled_counts(scale: float) -> Dict[str, int]:
+    counts = {name: max(1, int(round(value * scale))) for name, value in BASE_COUNTS.items()}
+    counts["forms_per_club"] = BASE_COUNTS["forms_per_club"]
+    counts["forms"] = counts["clubs"] * counts["forms_per_club"]
+    return counts
+
+
+def user_email(n: int) -> str:
+    return USER_EMAIL_PATTERN.format(n=n)
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def application_data(rng: random.Random, email: Optional[str] = None) -> Dict[str, Any]:
+    """FORM_FIELDS'a uygun, gerçekçi bir data_json (isteğe bağlı alanlar bazen boş)"""
+    data: Dict[str, Any] = {
+        "full_name": person_name(rng),
+        "email": email or f"ogrenci{rng.randrange(10**6)}@ogr.example.edu.tr",
+        "faculty": rng.choice(FACULTIES),
+        "year": rng.choice(["1", "2", "3", "4"]),
+        "motivation": " ".join(rng.sample(SENTENCES, rng.randint(1, 3))),
+        "consent": True,
+    }
+    if rng.random() < 0.7:
+        data["phone"] = f"05{rng.randint(30, 59)} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}"
+    if rng.random() < 0.5:
+        data["gpa"] = round(rng.uniform(1.8, 4.0), 2)
+    if rng.random() < 0.8:
+        data["interests"] = rng.sample(FORM_FIELDS[6]["options"], rng.randint(1, 3))
+    return data
+
+
+def _batched(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _event_rows(rng: random.Random, count: int, now: datetime) -> Iterator[dict]:
+    for event_id in range(1, count + 1):
+        starts_at = (now + timedelta(days=rng.randint(-90, 180))).replace(
+            hour=rng.randint(9, 20), minute=rng.choice((0, 15, 30, 45)), second=0, microsecond=0
+        )
+        topic = rng.choice(TOPICS)
+        yield {
+            "id": event_id,
+            "title": f"{topic} {rng.choice(FORMATS)}",
+            "description": f"{topic} üzerine. " + " ".join(rng.sample(SENTENCES, 3)),
+            "date": starts_at.strftime("%Y-%m-%d"),
+            "time": starts_at.strftime("%H:%M"),
+            "starts_at": starts_at,
+            "location": rng.choice(LOCATIONS),
+            "organizer": f"{topic} Kulübü",
+            "category_id": rng.randint(1, len(CATEGORIES)),
+            "requires_registration": rng.random() < 0.3,
+            "is_active": rng.random() < 0.95,
+            "is_featured": rng.random() < 0.05,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def _application_rows(rng: random.Random, counts: Dict[str, int], now: datetime) -> Iterator[dict]:
+    statuses = ["submitted", "under_review", "accepted", "rejected"]
+    for application_id in range(1, counts["applications"] + 1):
+        form_id = 1 if rng.random() < HOT_FORM_SHARE else rng.randint(1, counts["forms"])
+        user_id = rng.randint(1, counts["users"])
+        yield {
+            "id": application_id,
+            "form_id": form_id,
+            "user_id": user_id,
+            "status": rng.choices(statuses, weights=(6, 2, 1, 1))[0],
+            "data_json": application_data(rng, user_email(user_id)),
+            "submitted_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+        }
+
+
+def _advance_sequences(connection, models) -> None:
+    # Açık id'lerle yazılan tablolarda PostgreSQL dizileri ilerlemez; sonraki INSERT'ler çakışmasın
+    if connection.dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__tablename__
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def _is_empty(engine: Engine) -> bool:
+    with engine.connect() as connection:
+        return not any(connection.execute(select(func.count()).select_from(model)).scalar() for model in (User, Event))
+
+
+def generate_dataset(engine: Engine, scale: float = 1.0, seed: int = 42,
+                     reset: bool = False, batch_size: int = 5000) -> dict:
+    """Sentetik veri kümesini yaz ve senaryoların kullanacağı manifesti döndür"""
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    if not _is_empty(engine):
+        raise RuntimeError("Database already has users/events; rerun with --reset to replace them")
+
+    rng = random.Random(seed)
+    counts = scaled_counts(scale)
+    now = datetime.utcnow().replace(microsecond=0)
+    admin_id, manager_id = counts["users"] + 1, counts["users"] + 2
+
+    users = [
+        {"id": n, "email": user_email(n), "password_hash": BENCH_PASSWORD_HASH, "full_name": person_name(rng),
+         "student_id": f"B{n:07d}", "is_active": True}
+        for n in range(1, counts["users"] + 1)
+    ]
+    users.append({"id": admin_id, "email": ADMIN_EMAIL, "password_hash": BENCH_PASSWORD_HASH, "full_name": "Bench Admin", "student_id": None, "is_active": True})
+    users.append({"id": manager_id, "email": MANAGER_EMAIL, "password_hash": BENCH_PASSWORD_HASH, "full_name": "Bench Manager", "student_id": None, "is_active": True})
+    # executemany'de her satır aynı anahtarları taşımalı
+    roles = [{"user_id": n, "role_type": RoleType.USER, "club_id": None} for n in range(1, counts["users"] + 1)]
+    roles.append({"user_id": admin_id, "role_type": RoleType.ADMIN, "club_id": None})
+    roles.append({"user_id": manager_id, "role_type": RoleType.CLUB_MANAGER, "club_id": 1})
+
+    clubs = [
+        {"id": n, "name": f"{TOPICS[(n - 1) % len(TOPICS)]} Kulübü {n}", "description": rng.choice(SENTENCES), "is_active": True}
+        for n in range(1, counts["clubs"] + 1)
+    ]
+    members = [
+        {"club_id": club_id, "user_id": n, "role": "member"}
+        for n in range(1, counts["users"] + 1)
+        for club_id in rng.sample(range(1, counts["clubs"] + 1), min(2, counts["clubs"]))
+    ]
+    forms = [
+        {"id": form_id, "club_id": (form_id - 1) // counts["forms_per_club"] + 1,
+         "name": f"Üyelik Başvurusu {form_id}", "fields_json": FORM_FIELDS, "is_active": True,
+         "allow_multiple_submissions": True}
+        for form_id in range(1, counts["forms"] + 1)
+    ]
+    stories = [
+        {"id": n, "title": f"{rng.choice(TOPICS)} duyurusu", "image_url": f"https://picsum.photos/seed/bench{n}/800/800",
+         "order_index": n, "is_active": True, "created_at": now,
+         # ~%10'unun süresi dolmuş (süpürücü ve aktif filtre için)
+         "expires_at": now + timedelta(hours=rng.randint(-48, -1) if rng.random() < 0.1 else rng.randint(1, 48))}
+        for n in range(1, counts["stories"] + 1)
+    ]
+
+    tables = [
+        (Category, [{"id": n, **category} for n, category in enumerate(CATEGORIES, start=1)]),
+        (User, users), (Club, clubs), (UserRole, roles), (ClubMember, members), (Form, forms),
+        (Event, _event_rows(rng, counts["events"], now)),
+        (Application, _application_rows(rng, counts, now)),
+        (Story, stories),
+    ]
+    with engine.begin() as connection:
+        for model, rows in tables:
+            for batch in _batched(rows, batch_size):
+                connection.execute(insert(model), batch)
+        # Başvuruların ~%20'sinde bir CV dosyası kaydı (dosyanın kendisi yazılmaz)
+        file_rows = (
+            {"application_id": application_id, "file_path": f"/uploads/applications/bench-cv-{application_id}.pdf",
+             "file_type": "application/pdf", "original_file_name": "cv.pdf"}
+            for application_id in range(1, counts["applications"] + 1) if rng.random() < 0.2
+        )
+        for batch in _batched(file_rows, batch_size):
+            connection.execute(insert(ApplicationFile), batch)
+        _advance_sequences(connection, [model for model, _ in tables])
+
+    ensure_event_search_index(engine)  # toplu INSERT ORM olaylarından geçmez; FTS indeksi yeniden kurulur
+
+    return {
+        "scale": scale,
+        "seed": seed,
+        "generated_at": now.isoformat(),
+        "counts": counts,
+        "category_ids": list(range(1, len(CATEGORIES) + 1)),
+        "user_email_pattern": USER_EMAIL_PATTERN,
+        "admin_email": ADMIN_EMAIL,
+        "manager_email": MANAGER_EMAIL,
+        "hot_form_id": 1,
+        "search_terms": [topic.split()[0] for topic in TOPICS],
+    }
+
+
+def write_manifest(manifest: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, ensure_ascii=False, indent=2)
+
+
+def read_manifest(path: str) -> dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
@@ -0,0 +1,163 @@
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .scenarios import SCENARIOS, BenchRequest, Scenario
+
+# Senaryoları eşzamanlı iş parçacıklarıyla çalıştırıp throughput ve gecikme
+# yüzdeliklerini (p50/p95/p99) ölçen sürücü. "inprocess" modunda uygulama
+# aynı süreçte TestClient ile (ağ ve sunucu olmadan), "http" modunda çalışan
+# bir sunucuya karşı httpx ile ölçülür. İstekler ölçüm başlamadan önce
+# üretilir; istek hazırlığı (örn. görsel üretimi) sonuçlara karışmaz.
+
+PERCENTILES = (50, 95, 99)
+
+# (gecikme saniye, status, X-Cache, hata)
+Sample = Tuple[float, Optional[int], Optional[str], Optional[str]]
+
+
+@contextmanager
+def inprocess_client() -> Iterator:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:  # startup/shutdown olayları da çalışır
+        yield client
+
+
+@contextmanager
+def http_client(base_url: str, concurrency: int, timeout: float = 30.0) -> Iterator:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    with httpx.Client(base_url=base_url, timeout=timeout, limits=limits) as client:
+        yield client
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Doğrusal aralıklı yüzdelik (numpy'nin varsayılanıyla aynı)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _send(client, request: BenchRequest) -> Sample:
+    started = time.perf_counter()
+    try:
+        response = client.request(
+            request.method, request.url, params=request.params, headers=request.headers,
+            data=request.data, files=request.files,
+        )
+        response.read()
+    except Exception as e:
+        return time.perf_counter() - started, None, None, f"{type(e).__name__}: {e}"
+    return time.perf_counter() - started, response.status_code, response.headers.get("x-cache"), None
+
+
+def _execute(client, requests: List[BenchRequest], concurrency: int) -> List[Sample]:
+    if concurrency <= 1:
+        return [_send(client, request) for request in requests]
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+        return list(pool.map(lambda request: _send(client, request), requests))
+
+
+def summarize(samples: List[Sample], wall_seconds: float, expected_status: Sequence[int]) -> dict:
+    latencies = sorted(sample[0] * 1000 for sample in samples)
+    statuses = Counter(str(sample[1]) if sample[1] is not None else "error" for sample in samples)
+    errors = [sample for sample in samples if sample[1] not in expected_status]
+    first_errors = sorted({sample[3] or f"HTTP {sample[1]}" for sample in errors})[:5]
+    return {
+        "requests": len(samples),
+        "errors": len(errors),
+        "error_examples": first_errors,
+        "status_counts": dict(sorted(statuses.items())),
+        "cache_hits": sum(1 for sample in samples if sample[2] == "HIT"),
+        "wall_seconds": round(wall_seconds, 4),
+        "throughput_rps": round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": {
+            "min": round(latencies[0], 3) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            **{f"p{pct}": round(percentile(latencies, pct), 3) for pct in PERCENTILES},
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+    }
+
+
+def run_scenario(client, scenario: Scenario, manifest: dict, requests: int,
+                 concurrency: int, warmup: int, seed: int) -> dict:
+    rng = random.Random(f"{seed}:{scenario.name}")
+    warmup_requests = [scenario.build(rng, manifest) for _ in range(warmup)]
+    measured_requests = [scenario.build(rng, manifest) for _ in range(requests)]
+    _execute(client, warmup_requests, concurrency)
+    started = time.perf_counter()
+    samples = _execute(client, measured_requests, concurrency)
+    return summarize(samples, time.perf_counter() - started, scenario.expected_status)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(client, manifest: dict, scenario_names: Sequence[str], *, mode: str, target: str,
+                   requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    report = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(),
+            "mode": mode,
+            "target": target,
+            "requests_per_scenario": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "seed": seed,
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "dataset": {key: manifest.get(key) for key in ("scale", "seed", "generated_at", "counts")},
+        "scenarios": {},
+    }
+    for name in scenario_names:
+        result = run_scenario(client, SCENARIOS[name], manifest, requests, concurrency, warmup, seed)
+        report["scenarios"][name] = result
+        latency = result["latency_ms"]
+        print(f"{name:<20} {result['throughput_rps']:>9.1f} req/s  p50 {latency['p50']:>8.2f}ms  "
+              f"p95 {latency['p95']:>8.2f}ms  p99 {latency['p99']:>8.2f}ms  errors {result['errors']}")
+    return report
+
+
+def compare_reports(base: dict, new: dict) -> List[str]:
+    """İki rapordaki ortak senaryoların throughput ve gecikme farkları"""
+
+    def change(old: float, current: float) -> str:
+        return f"{(current - old) / old * 100:+.1f}%" if old else "n/a"
+
+    lines = [f"{'scenario':<20} {'req/s':>22} {'p50 ms':>22} {'p95 ms':>22} {'p99 ms':>22}"]
+    for name, current in new["scenarios"].items():
+        previous = base["scenarios"].get(name)
+        if previous is None:
+            continue
+        cells = [f"{previous['throughput_rps']:.1f}->{current['throughput_rps']:.1f} "
+                 f"({change(previous['throughput_rps'], current['throughput_rps'])})"]
+        for pct in PERCENTILES:
+            old, value = previous["latency_ms"][f"p{pct}"], current["latency_ms"][f"p{pct}"]
+            cells.append(f"{old:.1f}->{value:.1f} ({change(old, value)})")
+        lines.append(f"{name:<20} " + " ".join(f"{cell:>22}" for cell in cells))
+    return lines
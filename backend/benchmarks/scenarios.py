@@ -0,0 +1,105 @@
+import io
+import json
+import random
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from .dataset import application_data
+
+# Ölçüm senaryoları: her biri manifestten geçerli id'ler seçerek bir HTTP
+# isteği tarifi üretir. Aynı tohumla aynı istek dizisi oluşur; böylece iki
+# çalıştırma (örn. bir optimizasyondan önce ve sonra) karşılaştırılabilir.
+
+API = "/api/v1"
+
+
+class BenchRequest(NamedTuple):
+    method: str
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    data: Optional[Dict[str, str]] = None
+    files: Optional[List[Tuple[str, Tuple[str, bytes, str]]]] = None
+
+
+class Scenario(NamedTuple):
+    name: str
+    description: str
+    build: Callable[[random.Random, dict], BenchRequest]
+    expected_status: Tuple[int, ...] = (200,)
+
+
+def _user_email(rng: random.Random, manifest: dict) -> str:
+    return manifest["user_email_pattern"].format(n=rng.randint(1, manifest["counts"]["users"]))
+
+
+def events_list(rng: random.Random, manifest: dict) -> BenchRequest:
+    # Farklı sayfalar; yanıt önbelleğinin her isteği karşılaması engellenir
+    return BenchRequest("GET", f"{API}/events/", params={"limit": 20, "skip": rng.randrange(0, 200, 20)})
+
+
+def events_search(rng: random.Random, manifest: dict) -> BenchRequest:
+    return BenchRequest("GET", f"{API}/events/", params={"search": rng.choice(manifest["search_terms"]), "limit": 20})
+
+
+def events_filtered(rng: random.Random, manifest: dict) -> BenchRequest:
+    return BenchRequest("GET", f"{API}/events/", params={
+        "category_id": rng.choice(manifest["category_ids"]),
+        "upcoming_only": "true",
+        "limit": rng.choice((10, 20, 50)),
+    })
+
+
+def submit_application(rng: random.Random, manifest: dict) -> BenchRequest:
+    email = _user_email(rng, manifest)
+    form_id = rng.randint(1, manifest["counts"]["forms"])
+    return BenchRequest(
+        "POST", f"{API}/applications/form/{form_id}",
+        headers={"X-User-Email": email, "Idempotency-Key": uuid.UUID(int=rng.getrandbits(128)).hex},
+        data={"data_json": json.dumps(application_data(rng, email), ensure_ascii=False)},
+    )
+
+
+def list_applications(rng: random.Random, manifest: dict) -> BenchRequest:
+    return BenchRequest(
+        "GET", f"{API}/applications/form/{manifest['hot_form_id']}/applications",
+        params={"limit": 50, "skip": rng.randrange(0, 500, 50)},
+        headers={"X-User-Email": manifest["manager_email"]},
+    )
+
+
+def _sample_image(rng: random.Random, size: Tuple[int, int] = (1600, 1000)) -> bytes:
+    # Her istekte farklı içerik: blob deposu aynı dosyayı tekrar işlemez
+    img = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        draw.rectangle((x, y, x + rng.randint(40, 400), y + rng.randint(40, 300)),
+                       fill=tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def upload_event_image(rng: random.Random, manifest: dict) -> BenchRequest:
+    event_id = rng.randint(1, manifest["counts"]["events"])
+    return BenchRequest(
+        "POST", f"{API}/events/{event_id}/upload-image",
+        headers={"X-User-Email": manifest["admin_email"]},
+        files=[("file", (f"bench-{event_id}.jpg", _sample_image(rng), "image/jpeg"))],
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("events_list", "read_events, paged", events_list),
+        Scenario("events_search", "read_events with full-text search", events_search),
+        Scenario("events_filtered", "read_events by category, upcoming only", events_filtered),
+        Scenario("submit_application", "submit_application with realistic data_json", submit_application, (201,)),
+        Scenario("list_applications", "list_applications_for_form on the busiest form", list_applications),
+        Scenario("upload_event_image", "event image upload and variant generation", upload_event_image),
+    )
+}
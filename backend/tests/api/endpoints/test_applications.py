@@ -0,0 +1,228 @@
+import csv
+import io
+import json
+import zipfile
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.endpoints import applications as applications_endpoint
+from app.core.config import settings
+from app.models import Application, Club, Form
+
+# Mock-header users from app.api.deps.MOCK_USERS_DB
+USER_HEADERS = {"X-User-Email": "user@example.com"}
+ADMIN_HEADERS = {"X-User-Email": "admin@example.com"}
+
+DEFAULT_FIELDS = [
+    {"name": "motivation", "label": "Motivation", "type": "textarea", "required": True},
+    {"name": "team", "label": "Team", "type": "select", "options": ["design", "software"]},
+]
+
+# Helper to create a club and an active form owned by it
+def create_test_form(db: Session, fields: Optional[List[dict]] = None, allow_multiple_submissions: bool = False) -> Form:
+    club = Club(name="Test Club")
+    db.add(club)
+    db.flush()
+    form = Form(
+        club_id=club.id,
+        name="Recruitment",
+        fields_json=fields if fields is not None else DEFAULT_FIELDS,
+        is_active=True,
+        allow_multiple_submissions=allow_multiple_submissions,
+    )
+    db.add(form)
+    db.commit()
+    db.refresh(form)
+    return form
+
+def submit(client: TestClient, form_id: int, data: dict, key: Optional[str] = None, files=None):
+    headers: Dict[str, str] = dict(USER_HEADERS)
+    if key is not None:
+        headers["Idempotency-Key"] = key
+    return client.post(
+        f"{settings.API_V1_STR}/applications/form/{form_id}",
+        headers=headers,
+        data={"data_json": json.dumps(data)},
+        files=files,
+    )
+
+# --- Test Cases for idempotent submissions ---
+
+def test_submit_application_idempotent_replay(client: TestClient, db_session: Session):
+    form = create_test_form(db_session)
+    payload = {"motivation": "I like robots", "team": "software"}
+
+    first = submit(client, form.id, payload, key="retry-1")
+    assert first.status_code == 201, first.json()
+    assert "Idempotent-Replayed" not in first.headers
+
+    replay = submit(client, form.id, payload, key="retry-1")
+    assert replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json()["id"] == first.json()["id"]
+    assert db_session.query(Application).filter(Application.form_id == form.id).count() == 1
+
+def test_submit_application_key_reused_with_different_payload(client: TestClient, db_session: Session):
+    form = create_test_form(db_session, allow_multiple_submissions=True)
+    assert submit(client, form.id, {"motivation": "First"}, key="reused").status_code == 201
+
+    response = submit(client, form.id, {"motivation": "Second"}, key="reused")
+    assert response.status_code == 422
+    assert "different payload" in response.json()["detail"]
+    assert db_session.query(Application).filter(Application.form_id == form.id).count() == 1
+
+def test_submit_application_duplicate_on_single_submission_form(client: TestClient, db_session: Session):
+    form = create_test_form(db_session)
+    assert submit(client, form.id, {"motivation": "First"}, key="a").status_code == 201
+
+    # A new key (or no key) is a second application, not a retry
+    assert submit(client, form.id, {"motivation": "Again"}, key="b").status_code == 409
+    assert submit(client, form.id, {"motivation": "Again"}).status_code == 409
+
+def test_submit_application_multiple_submissions_allowed(client: TestClient, db_session: Session):
+    form = create_test_form(db_session, allow_multiple_submissions=True)
+    assert submit(client, form.id, {"motivation": "One"}).status_code == 201
+    assert submit(client, form.id, {"motivation": "Two"}).status_code == 201
+    assert db_session.query(Application).filter(Application.form_id == form.id).count() == 2
+
+def test_submit_application_race_resolved_by_unique_index(client: TestClient, db_session: Session, monkeypatch):
+    form = create_test_form(db_session)
+    payload = {"motivation": "Concurrent"}
+    first = submit(client, form.id, payload, key="race")
+    assert first.status_code == 201
+
+    # Simulate a concurrent request that passed the pre-check before the first one committed:
+    # the pre-check sees nothing, the INSERT hits the unique index, and the retry lookup answers.
+    original_lookup = applications_endpoint._find_prior_application
+    calls = []
+
+    def lookup_missing_first(*args, **kwargs):
+        calls.append(args)
+        return None if len(calls) == 1 else original_lookup(*args, **kwargs)
+
+    monkeypatch.setattr(applications_endpoint, "_find_prior_application", lookup_missing_first)
+
+    replay = submit(client, form.id, payload, key="race")
+    assert replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json()["id"] == first.json()["id"]
+
+    calls.clear()
+    conflict = submit(client, form.id, payload, key="other-race")
+    assert conflict.status_code == 409
+    assert len(calls) == 2 # pre-check and the lookup after the IntegrityError
+    assert db_session.query(Application).filter(Application.form_id == form.id).count() == 1
+
+# --- Test Cases for submission validation against fields_json ---
+
+def test_submit_application_missing_required_field(client: TestClient, db_session: Session):
+    form = create_test_form(db_session)
+    response = submit(client, form.id, {"team": "design"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["data_json", "motivation"]
+
+    # Blank strings do not satisfy a required text field
+    response = submit(client, form.id, {"motivation": "   "})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["data_json", "motivation"]
+
+def test_submit_application_invalid_option(client: TestClient, db_session: Session):
+    form = create_test_form(db_session)
+    response = submit(client, form.id, {"motivation": "Hi", "team": "marketing"})
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert [error["loc"] for error in errors] == [["data_json", "team"]]
+
+def test_submit_application_stores_only_declared_fields(client: TestClient, db_session: Session):
+    form = create_test_form(db_session)
+    response = submit(client, form.id, {"motivation": "Hi", "team": "design", "is_admin": True})
+    assert response.status_code == 201
+    assert response.json()["data_json"] == {"motivation": "Hi", "team": "design"}
+
+def test_submit_application_missing_file(client: TestClient, db_session: Session):
+    fields = DEFAULT_FIELDS + [{"name": "cv", "label": "CV", "type": "file", "required": True}]
+    form = create_test_form(db_session, fields=fields)
+
+    response = submit(client, form.id, {"motivation": "Hi"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["data_json", "cv"]
+
+    # The field names a file that was not uploaded
+    response = submit(client, form.id, {"motivation": "Hi", "cv": "cv.pdf"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "file_missing"
+    assert db_session.query(Application).filter(Application.form_id == form.id).count() == 0
+
+# --- Test Cases for application exports ---
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+def export(client: TestClient, form_id: int, fmt: str):
+    return client.get(f"{settings.API_V1_STR}/applications/form/{form_id}/export", headers=ADMIN_HEADERS, params={"format": fmt})
+
+def sheet_rows(content: bytes) -> List[Dict[str, str]]:
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        assert archive.testzip() is None
+        parts = {name: ElementTree.fromstring(archive.read(name)) for name in archive.namelist()}
+    assert set(parts) == {"[Content_Types].xml", "_rels/.rels", "xl/workbook.xml",
+                          "xl/_rels/workbook.xml.rels", "xl/worksheets/sheet1.xml"}
+    rows = []
+    for row in parts["xl/worksheets/sheet1.xml"].iterfind("s:sheetData/s:row", SHEET_NS):
+        cells = {}
+        for cell in row.iterfind("s:c", SHEET_NS):
+            column = cell.get("r")[:-len(row.get("r"))]
+            text = cell.find("s:is/s:t", SHEET_NS) if cell.get("t") == "inlineStr" else cell.find("s:v", SHEET_NS)
+            cells[column] = text.text
+        rows.append(cells)
+    return rows
+
+def test_export_applications_xlsx_is_valid_workbook(client: TestClient, db_session: Session):
+    form = create_test_form(db_session, allow_multiple_submissions=True)
+    form.name = "Başvurular <2030>"
+    db_session.commit()
+    first = submit(client, form.id, {"motivation": 'Çekirdek ekip & "robotlar" <3', "team": "design"}).json()
+    second = submit(client, form.id, {"motivation": "Şimdi\tdeğil\x01"}).json()
+
+    response = export(client, form.id, "xlsx")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    rows = sheet_rows(response.content)
+
+    header = rows[0]
+    assert [header[column] for column in "ABCDEFGHI"] == [
+        "Application ID", "Submitted At", "Status", "User ID", "Email", "Full Name", "Motivation", "Team", "Files",
+    ]
+    assert len(rows) == 3
+    assert rows[1]["A"] == str(first["id"])
+    assert rows[1]["G"] == 'Çekirdek ekip & "robotlar" <3'
+    assert rows[1]["H"] == "design"
+    assert rows[2]["A"] == str(second["id"])
+    assert rows[2]["G"] == "Şimdi\tdeğil" # Control characters that XML 1.0 forbids are dropped
+    assert "H" not in rows[2] # Empty cells are omitted
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        sheet = ElementTree.fromstring(archive.read("xl/workbook.xml")).find("s:sheets/s:sheet", SHEET_NS)
+    assert sheet.get("name") == "Başvurular <2030>"
+
+def test_export_applications_csv_neutralizes_formulas(client: TestClient, db_session: Session):
+    form = create_test_form(db_session, allow_multiple_submissions=True)
+    values = ["=HYPERLINK(\"http://evil\")", "+1+1", "-2", "@SUM(A1)", "plain, \"quoted\""]
+    for value in values:
+        assert submit(client, form.id, {"motivation": value}).status_code == 201
+
+    response = export(client, form.id, "csv")
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0][6] == "Motivation"
+    assert [row[6] for row in rows[1:]] == [
+        "'=HYPERLINK(\"http://evil\")", "'+1+1", "'-2", "'@SUM(A1)", 'plain, "quoted"',
+    ]
+
+def test_export_applications_requires_manager(client: TestClient, db_session: Session):
+    form = create_test_form(db_session)
+    response = client.get(f"{settings.API_V1_STR}/applications/form/{form.id}/export", headers=USER_HEADERS)
+    assert response.status_code == 403
+    assert export(client, form.id, "pdf").status_code == 400
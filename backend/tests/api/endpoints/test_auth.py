@@ -1,9 +1,15 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from backend.app.models import Admin
-from backend.app.core.security import get_password_hash, verify_password
-from backend.app.core.config import settings
+from app.api.endpoints import auth as auth_endpoint
+from app.core.ratelimit import LoginRateLimiter, MemoryRateLimitBackend, RateLimitBackend
+from app.models import Admin
+from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
 
 
 def create_test_admin(db: Session, username: str = "testadmin", password: str = "testpassword") -> Admin:
@@ -107,5 +113,98 @@ def test_read_users_me_authenticated(client: TestClient, db_session: Session):
     assert data["is_active"] is True
     assert "id" in data
 
+
+# --- Test Cases for login rate limiting ---
+
+@pytest.fixture
+def login_limiter(monkeypatch) -> LoginRateLimiter:
+    # A fresh, small limiter per test: 3 failures lock the username, 5 attempts per IP
+    limiter = LoginRateLimiter(
+        MemoryRateLimitBackend(), ip_burst=5, ip_per_minute=0.001,
+        user_failure_burst=3, user_failure_refill_seconds=600,
+    )
+    monkeypatch.setattr(auth_endpoint, "login_limiter", limiter)
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_ENABLED", True)
+    return limiter
+
+
+def login(client: TestClient, username: str, password: str):
+    return client.post(f"{settings.API_V1_STR}/auth/login", data={"username": username, "password": password})
+
+
+def test_rate_limit_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+
+def test_login_lockout_after_failures(client: TestClient, db_session: Session, login_limiter: LoginRateLimiter):
+    create_test_admin(db_session, username="lockeduser", password="rightpassword")
+
+    for _ in range(3):
+        assert login(client, "lockeduser", "wrongpassword").status_code == 401
+
+    # Locked: even the right password is rejected before the database and bcrypt
+    response = login(client, "lockeduser", "rightpassword")
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 600
+    # Username keys are case-insensitive
+    assert login(client, "LockedUser", "rightpassword").status_code == 429
+
+    stats = login_limiter.stats()
+    assert stats["failures"] == 3
+    assert stats["lockouts"] == 1
+    assert stats["throttled_username"] == 2
+
+
+def test_login_success_resets_failures(client: TestClient, db_session: Session, login_limiter: LoginRateLimiter):
+    create_test_admin(db_session, username="resetuser", password="rightpassword")
+
+    for _ in range(2):
+        assert login(client, "resetuser", "wrongpassword").status_code == 401
+    assert login(client, "resetuser", "rightpassword").status_code == 200
+
+    # The bucket is full again: three more failures are needed for a lockout
+    for _ in range(3):
+        assert login(client, "resetuser", "wrongpassword").status_code == 401
+    assert login(client, "resetuser", "rightpassword").status_code == 429
+
+
+def test_login_ip_limit_refunds_username_token(login_limiter: LoginRateLimiter):
+    # TestClient requests carry no client address, so the IP bucket is exercised directly
+    async def attempts():
+        for index in range(5):
+            await login_limiter.check(f"someone{index}", "10.0.0.2")
+        with pytest.raises(HTTPException) as excinfo:
+            await login_limiter.check("ipuser", "10.0.0.2")
+        assert excinfo.value.status_code == 429
+        assert int(excinfo.value.headers["Retry-After"]) >= 1
+
+        # The attempt rejected by the IP limit did not cost the username a token
+        for _ in range(3):
+            await login_limiter.check("ipuser", "10.0.0.3")
+
+    asyncio.run(attempts())
+    assert login_limiter.stats()["throttled_ip"] == 1
+
+
+def test_username_token_is_consumed_up_front():
+    limiter = LoginRateLimiter(
+        MemoryRateLimitBackend(), ip_burst=100, ip_per_minute=60,
+        user_failure_burst=2, user_failure_refill_seconds=600,
+    )
+
+    async def attempts():
+        # Concurrent attempts are counted before their outcome is known
+        await limiter.check("racer", "10.0.0.1")
+        await limiter.check("racer", "10.0.0.1")
+        with pytest.raises(HTTPException) as excinfo:
+            await limiter.check("racer", "10.0.0.1")
+        assert excinfo.value.status_code == 429
+
+        await limiter.record_success("racer")
+        await limiter.check("racer", "10.0.0.1")
+
+    asyncio.run(attempts())
+
 # TODO: Add tests for inactive user if that logic is implemented for admins
 # TODO: Add tests for token expiration if relevant for /me endpoint (might be hard to test without time manipulation)
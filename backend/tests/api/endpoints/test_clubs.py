@@ -0,0 +1,29 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Club
+
+# Mock-header users from app.api.deps.MOCK_USERS_DB
+ADMIN_HEADERS = {"X-User-Email": "admin@example.com"}
+USER_HEADERS = {"X-User-Email": "user@example.com"}
+
+# --- Test Cases for conditional GET on user-scoped routes ---
+
+def test_read_clubs_etag_is_per_user(client: TestClient, db_session: Session):
+    db_session.add(Club(name="ETag Club"))
+    db_session.commit()
+    url = f"{settings.API_V1_STR}/clubs/"
+
+    user_response = client.get(url, headers=USER_HEADERS)
+    admin_response = client.get(url, headers=ADMIN_HEADERS)
+    assert user_response.status_code == admin_response.status_code == 200
+    assert user_response.headers["ETag"] != admin_response.headers["ETag"]
+    assert "X-User-Email" in user_response.headers["Vary"]
+
+    user_etag = user_response.headers["ETag"]
+    assert client.get(url, headers={**USER_HEADERS, "If-None-Match": user_etag}).status_code == 304
+    # Another user's validator never matches
+    assert client.get(url, headers={**ADMIN_HEADERS, "If-None-Match": user_etag}).status_code == 200
+    # Authorization runs before the 304 check
+    assert client.get(url, headers={"If-None-Match": user_etag}).status_code == 401
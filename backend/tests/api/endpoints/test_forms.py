@@ -0,0 +1,74 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.form_validation import compiled_forms
+from app.models import Club, Form
+
+# Mock-header users from app.api.deps.MOCK_USERS_DB
+ADMIN_HEADERS = {"X-User-Email": "admin@example.com"}
+USER_HEADERS = {"X-User-Email": "user@example.com"}
+
+
+def create_test_club(db: Session, name: str = "Form Club") -> Club:
+    club = Club(name=name)
+    db.add(club)
+    db.commit()
+    db.refresh(club)
+    return club
+
+
+def form_payload(club_id: int, fields: list) -> dict:
+    return {"club_id": club_id, "name": "Recruitment", "fields_json": fields,
+            "is_active": True, "allow_multiple_submissions": True}
+
+
+# --- Test Cases for form definitions ---
+
+def test_create_form_duplicate_field_name(client: TestClient, db_session: Session):
+    club = create_test_club(db_session)
+    fields = [
+        {"name": "email", "label": "E-mail", "type": "email"},
+        {"name": "email", "label": "Other e-mail", "type": "text"},
+    ]
+    response = client.post(f"{settings.API_V1_STR}/forms/", headers=ADMIN_HEADERS, json=form_payload(club.id, fields))
+    assert response.status_code == 400
+    assert "Duplicate field name: email" in response.json()["detail"]
+    assert db_session.query(Form).count() == 0
+
+
+def test_update_form_duplicate_field_name(client: TestClient, db_session: Session):
+    club = create_test_club(db_session)
+    fields = [{"name": "why", "label": "Why", "type": "text"}]
+    form_id = client.post(f"{settings.API_V1_STR}/forms/", headers=ADMIN_HEADERS, json=form_payload(club.id, fields)).json()["id"]
+
+    response = client.put(f"{settings.API_V1_STR}/forms/{form_id}", headers=ADMIN_HEADERS, json={"fields_json": fields * 2})
+    assert response.status_code == 400
+
+
+def test_update_form_evicts_compiled_validator(client: TestClient, db_session: Session):
+    club = create_test_club(db_session)
+    fields = [{"name": "why", "label": "Why", "type": "text", "required": True}]
+    response = client.post(f"{settings.API_V1_STR}/forms/", headers=ADMIN_HEADERS, json=form_payload(club.id, fields))
+    assert response.status_code == 201
+    form_id = response.json()["id"]
+    submit_url = f"{settings.API_V1_STR}/applications/form/{form_id}"
+
+    response = client.post(submit_url, headers=USER_HEADERS, data={"data_json": json.dumps({"why": "Because"})})
+    assert response.status_code == 201
+    assert form_id in compiled_forms._entries
+
+    new_fields = fields + [{"name": "level", "label": "Level", "type": "select", "required": True, "options": ["junior", "senior"]}]
+    response = client.put(f"{settings.API_V1_STR}/forms/{form_id}", headers=ADMIN_HEADERS, json={"fields_json": new_fields})
+    assert response.status_code == 200
+    assert form_id not in compiled_forms._entries # Dropped on commit, recompiled on the next submission
+
+    response = client.post(submit_url, headers=USER_HEADERS, data={"data_json": json.dumps({"why": "Because"})})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["data_json", "level"]
+
+    response = client.post(submit_url, headers=USER_HEADERS, data={"data_json": json.dumps({"why": "Because", "level": "senior"})})
+    assert response.status_code == 201
+    assert response.json()["data_json"] == {"why": "Because", "level": "senior"}
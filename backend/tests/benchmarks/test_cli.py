@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.dataset import scaled_counts
+from benchmarks.runner import PERCENTILES
+from benchmarks.scenarios import SCENARIOS
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_cli(env: dict, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "benchmarks", *args], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, timeout=300,
+    )
+
+
+@pytest.fixture
+def bench_env(tmp_path):
+    # A fresh database and upload folders; the CLI reads DATABASE_URL like the app does
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=f"sqlite:///{tmp_path / 'bench.db'}",
+        UPLOAD_FOLDER=str(tmp_path / "uploads"),
+        UPLOAD_DIR=str(tmp_path / "private_uploads"),
+        METRICS_MULTIPROC_DIR="",
+    )
+    env.setdefault("SECRET_KEY", "benchmark-smoke-test")
+    env.setdefault("ADMIN_USERNAME", "admin")
+    env.setdefault("ADMIN_PASSWORD", "admin123")
+    return env
+
+
+# --- Smoke test for generate + run ---
+
+def test_generate_and_run_every_scenario(bench_env, tmp_path):
+    manifest_path, report_path = str(tmp_path / "manifest.json"), str(tmp_path / "report.json")
+
+    generated = run_cli(bench_env, "generate", "--scale", "0.01", "--manifest", manifest_path)
+    assert generated.returncode == 0, generated.stderr
+    with open(manifest_path, encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    assert manifest["counts"] == scaled_counts(0.01)
+
+    ran = run_cli(bench_env, "run", "--mode", "inprocess", "--requests", "2", "--warmup", "0",
+                  "--manifest", manifest_path, "--output", report_path)
+    assert ran.returncode == 0, ran.stderr
+    with open(report_path, encoding="utf-8") as handle:
+        report = json.load(handle)
+
+    assert report["meta"]["mode"] == "inprocess"
+    assert report["meta"]["requests_per_scenario"] == 2
+    assert set(report["meta"]) >= {"started_at", "target", "concurrency", "warmup", "seed", "git_commit", "python"}
+    assert report["dataset"]["counts"] == manifest["counts"]
+    assert list(report["scenarios"]) == list(SCENARIOS)
+    for name, result in report["scenarios"].items():
+        expected = str(SCENARIOS[name].expected_status[0])
+        assert result["requests"] == 2
+        assert result["errors"] == 0, (name, result["error_examples"])
+        assert result["status_counts"] == {expected: 2}, name
+        assert result["throughput_rps"] > 0
+        assert set(result["latency_ms"]) == {"min", "mean", "max", *(f"p{pct}" for pct in PERCENTILES)}
+        assert result["latency_ms"]["min"] <= result["latency_ms"]["p50"] <= result["latency_ms"]["max"]
@@ -1,43 +1,59 @@
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 # Import models first to ensure Base.metadata is populated before Base is used by other modules if any race condition.
-from backend.app.models.admin import Admin
-from backend.app.models.category import Category
-from backend.app.models.event import Event
-from backend.app.models.story import Story
-from backend.app.core.database import Base, get_db # Base needs to be the one used by models
+from app.models.admin import Admin
+from app.models.category import Category
+from app.models.event import Event
+from app.models.story import Story
+from app.models.club import Club
+from app.models.form import Application, ApplicationFile, Form
+from app.models.blob import Blob
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.core.database import Base, configure_sqlite_engine # Base needs to be the one used by models
+from app.api import deps
 
 # Import the module that will be patched, aliased to avoid confusion
-import backend.app.core.database as app_db_module_to_patch
+import app.core.database as app_db_module_to_patch
 
-# Use an in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Use a temporary SQLite file for testing: the sync and the async (aiosqlite) engine
+# must see the same database, which separate in-memory connections would not.
+_test_db_dir = tempfile.mkdtemp(prefix="etkinlik-test-")
+_test_db_path = os.path.join(_test_db_dir, "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{_test_db_path}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{_test_db_path}"
 
-test_engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+test_engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+test_async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+configure_sqlite_engine(test_engine)
+configure_sqlite_engine(test_async_engine.sync_engine)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    test_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
-# Store original engine and SessionLocal to restore after tests
-_original_engine_backup = None
-_original_session_local_backup = None
+# Store original engines and session factories to restore after tests
+_PATCHED_ATTRIBUTES = {
+    "engine": test_engine,
+    "SessionLocal": TestingSessionLocal,
+    "async_engine": test_async_engine,
+    "AsyncSessionLocal": TestingAsyncSessionLocal,
+}
+_originals_backup = {}
 
 @pytest.fixture(scope="session", autouse=True)
 def patch_db_engine_create_tables():
-    global _original_engine_backup, _original_session_local_backup
-
-    _original_engine_backup = app_db_module_to_patch.engine
-    _original_session_local_backup = app_db_module_to_patch.SessionLocal
-
-    app_db_module_to_patch.engine = test_engine
-    app_db_module_to_patch.SessionLocal = TestingSessionLocal
+    for name, replacement in _PATCHED_ATTRIBUTES.items():
+        _originals_backup[name] = getattr(app_db_module_to_patch, name)
+        setattr(app_db_module_to_patch, name, replacement)
     
     # All models should have been imported, Base.metadata should be complete.
     Base.metadata.create_all(bind=test_engine)
@@ -45,15 +61,16 @@ def patch_db_engine_create_tables():
     yield # Tests run here
     
     Base.metadata.drop_all(bind=test_engine) # Clean up
+    test_engine.dispose()
     
     # Restore original
-    app_db_module_to_patch.engine = _original_engine_backup
-    app_db_module_to_patch.SessionLocal = _original_session_local_backup
+    for name, original in _originals_backup.items():
+        setattr(app_db_module_to_patch, name, original)
 
 
 @pytest.fixture(scope="session")
 def test_app(patch_db_engine_create_tables): # Ensures patching is done first
-    from backend.app.main import app as actual_app # Import app here, after patching
+    from app.main import app as actual_app # Import app here, after patching
     return actual_app
 
 
@@ -70,8 +87,16 @@ def db_session(patch_db_engine_create_tables): # Ensures it runs after patching
     # Clear data from tables before each test to ensure test isolation for committed data
     # Order is important due to foreign key constraints (Event depends on Category)
     # Admin is listed last, assuming no other models depend on it directly for these tests.
+    session.query(UserRole).delete()
+    session.query(ApplicationFile).delete()
+    session.query(Application).delete()
+    session.query(Form).delete()
+    session.query(Club).delete()
     session.query(Event).delete()
+    session.query(Story).delete()
     session.query(Category).delete()
+    session.query(Blob).delete()
+    session.query(User).delete()
     # This will also delete any admin created by startup events (e.g. "testadmin")
     # Tests requiring admin users must create them explicitly.
     session.query(Admin).delete() 
@@ -103,7 +128,14 @@ def client(db_session, test_app): # Takes the test_app fixture
             # premature closing of the session that the test function is still using.
             pass
 
-    test_app.dependency_overrides[get_db] = override_get_db_shared
+    # Async routes get their own session on the same test database; the sync
+    # db_session cannot be shared across the event loop.
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_session:
+            yield async_session
+
+    test_app.dependency_overrides[deps.get_db] = override_get_db_shared
+    test_app.dependency_overrides[deps.get_async_db] = override_get_async_db
     
     with TestClient(test_app) as c:
         yield c
@@ -0,0 +1,153 @@
+import asyncio
+import io
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+from starlette.datastructures import UploadFile
+
+from app.core import blobs
+from app.core.blobs import blob_path, blob_reference, collect_garbage, ingest_upload, reconcile_ref_counts
+from app.core.config import settings
+from app.models import Blob, Category, Event
+
+
+@pytest.fixture(autouse=True)
+def blob_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path / "public"))
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "private"))
+    return tmp_path
+
+
+def ingest(db: Session, content: bytes, bucket: str = "events", extension: str = "jpg") -> Blob:
+    upload = UploadFile(file=io.BytesIO(content), filename=f"poster.{extension}")
+    return asyncio.run(ingest_upload(db, upload, bucket, extension))
+
+
+def create_event(db: Session, image_url=None) -> Event:
+    category = db.query(Category).first()
+    if category is None:
+        category = Category(name="Blob", slug="blob", color_class="bg", text_color_class="text")
+        db.add(category)
+        db.flush()
+    event = Event(title="Poster", description="d", date="2030-01-01", time="10:00", location="Hall",
+                  organizer="Club", category_id=category.id, image_url=image_url)
+    db.add(event)
+    db.commit()
+    return event
+
+
+def ref_count(db: Session, key: str) -> int:
+    db.expire_all()
+    return db.get(Blob, key).ref_count
+
+
+def age(db: Session, key: str, seconds: int) -> None:
+    db.get(Blob, key).updated_at = datetime.utcnow() - timedelta(seconds=seconds)
+    db.commit()
+
+
+# --- Deduplication ---
+
+def test_ingest_upload_deduplicates_identical_content(db_session: Session):
+    first = ingest(db_session, b"same poster")
+    second = ingest(db_session, b"same poster")
+    assert first.key == second.key
+    assert db_session.query(Blob).count() == 1
+    assert os.path.exists(blob_path(first.key))
+
+    incoming = os.path.join(blobs._bucket_root("events"), blobs.INCOMING_DIRNAME)
+    assert os.listdir(incoming) == [] # The duplicate upload was discarded
+
+    other = ingest(db_session, b"another poster")
+    assert other.key != first.key
+    assert db_session.query(Blob).count() == 2
+
+
+def test_ingest_upload_recreates_missing_file(db_session: Session):
+    blob = ingest(db_session, b"poster")
+    os.remove(blob_path(blob.key))
+    assert ingest(db_session, b"poster").key == blob.key
+    assert os.path.exists(blob_path(blob.key))
+
+
+# --- Reference counting ---
+
+def test_ref_count_follows_create_replace_and_delete(db_session: Session):
+    first = ingest(db_session, b"first")
+    second = ingest(db_session, b"second")
+
+    event = create_event(db_session, blob_reference(first.key))
+    other = create_event(db_session, blob_reference(first.key))
+    assert ref_count(db_session, first.key) == 2
+
+    event.image_url = blob_reference(second.key)
+    db_session.commit()
+    assert ref_count(db_session, first.key) == 1
+    assert ref_count(db_session, second.key) == 1
+
+    db_session.delete(other)
+    db_session.commit()
+    assert ref_count(db_session, first.key) == 0
+
+    # External URLs are not blobs and do not touch any counter
+    event.image_url = "https://example.com/poster.jpg"
+    db_session.commit()
+    assert ref_count(db_session, second.key) == 0
+
+
+def test_reconcile_ref_counts_repairs_drift(db_session: Session):
+    blob = ingest(db_session, b"poster")
+    create_event(db_session, blob_reference(blob.key))
+    db_session.get(Blob, blob.key).ref_count = 7
+    db_session.commit()
+
+    assert reconcile_ref_counts(db_session) == 1
+    assert ref_count(db_session, blob.key) == 1
+    assert reconcile_ref_counts(db_session) == 0
+
+
+# --- Garbage collection ---
+
+def test_collect_garbage_respects_grace_period(db_session: Session):
+    blob = ingest(db_session, b"fresh")
+    assert collect_garbage(db_session, grace_seconds=3600)["deleted"] == 0
+    assert os.path.exists(blob_path(blob.key))
+
+    age(db_session, blob.key, 7200)
+    result = collect_garbage(db_session, grace_seconds=3600)
+    assert result == {"deleted": 1, "reclaimed_bytes": len(b"fresh")}
+    assert db_session.query(Blob).count() == 0
+    assert not os.path.exists(blob_path(blob.key))
+
+
+def test_collect_garbage_keeps_referenced_blobs(db_session: Session):
+    blob = ingest(db_session, b"poster")
+    create_event(db_session, blob_reference(blob.key))
+    # Counter drifted to zero although an event still points at the blob
+    db_session.get(Blob, blob.key).ref_count = 0
+    db_session.commit()
+    age(db_session, blob.key, 7200)
+
+    assert collect_garbage(db_session, grace_seconds=3600)["deleted"] == 0
+    assert ref_count(db_session, blob.key) == 1
+    assert os.path.exists(blob_path(blob.key))
+
+
+def test_collect_garbage_skips_blob_reuploaded_after_selection(db_session: Session, monkeypatch):
+    blob = ingest(db_session, b"poster")
+    age(db_session, blob.key, 7200)
+
+    # A concurrent upload of the same content lands between candidate selection and the delete
+    original_count = blobs.count_references
+
+    def reupload_then_count(db, key):
+        ingest(db_session, b"poster")
+        return original_count(db, key)
+
+    monkeypatch.setattr(blobs, "count_references", reupload_then_count)
+    assert collect_garbage(db_session, grace_seconds=3600)["deleted"] == 0
+    db_session.expire_all()
+    assert db_session.get(Blob, blob.key) is not None
+    assert os.path.exists(blob_path(blob.key))
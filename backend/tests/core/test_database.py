@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core import database
+from app.core.config import settings
+from app.core.database import (
+    ASYNC_DRIVERS, ThreadedAsyncSession, create_async_engine_for, routing_session_class, threaded_async_sessionmaker,
+)
+from app.models import Category, Event
+
+
+def make_session():
+    primary, replica = create_engine("sqlite://"), create_engine("sqlite://")
+    return routing_session_class(primary, [replica])(), primary, replica
+
+
+def test_routing_session_reads_from_replica():
+    session, primary, replica = make_session()
+    assert session.get_bind(clause=select(Event)) is replica
+    assert session.get_bind(clause=update(Event).values(title="x")) is primary
+
+
+def test_routing_session_select_for_update_uses_primary():
+    session, primary, replica = make_session()
+    assert session.get_bind(clause=select(Event).with_for_update()) is primary
+    # Row locks pin the session: later reads see the locked rows' writes
+    assert session.get_bind(clause=select(Event)) is primary
+
+
+# --- Test Cases for databases without an async driver ---
+
+def test_create_async_engine_for_missing_driver(monkeypatch):
+    assert create_async_engine_for("mysql://user@localhost/app", "primary") is None
+    # asyncpg is not installed here; a driver that cannot be imported must not break startup
+    monkeypatch.setitem(ASYNC_DRIVERS, "sqlite", "sqlite+nosuchdriver")
+    assert create_async_engine_for("sqlite://", "primary") is None
+    monkeypatch.undo()
+    assert create_async_engine_for("sqlite://", "primary") is not None
+
+
+def test_threaded_async_session_serves_async_routes(client: TestClient, db_session: Session):
+    category = Category(name="Threaded", slug="threaded", color_class="bg-blue-500", text_color_class="text-white")
+    db_session.add(category)
+    db_session.flush()
+    event = Event(title="Threaded read", description="d", date="2030-01-01", time="10:00", location="Hall",
+                  organizer="Club", starts_at=datetime(2030, 1, 1, 10, 0), category_id=category.id)
+    db_session.add(event)
+    db_session.commit()
+    event_id = event.id
+
+    sessions = []
+    session_factory = threaded_async_sessionmaker(database.SessionLocal)
+
+    async def threaded_get_async_db():
+        async with session_factory() as db:
+            sessions.append(db)
+            yield db
+
+    client.app.dependency_overrides[deps.get_async_db] = threaded_get_async_db
+    assert client.get(f"{settings.API_V1_STR}/events/{event_id}").json()["title"] == "Threaded read"
+    assert [item["id"] for item in client.get(f"{settings.API_V1_STR}/events/").json()] == [event_id]
+    assert client.get(f"{settings.API_V1_STR}/categories/{category.id}").json()["name"] == "Threaded"
+    assert all(isinstance(db, ThreadedAsyncSession) for db in sessions) and len(sessions) == 3
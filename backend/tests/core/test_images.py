@@ -0,0 +1,69 @@
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+from app.core import images
+from app.core.config import settings
+from app.core.images import build_image_manifest, build_variants, image_job_slot, pending_image_jobs
+
+
+def make_image(path, width: int, height: int, fmt: str) -> str:
+    Image.new("RGB", (width, height), (10, 120, 200)).save(path, fmt)
+    return str(path)
+
+
+def test_build_variants_widths_and_formats(tmp_path):
+    path = make_image(tmp_path / "poster.jpg", 1000, 500, "JPEG")
+    variants = build_variants(path)
+
+    assert [(v["width"], v["format"]) for v in variants] == [
+        (160, "webp"), (160, "jpg"), (400, "webp"), (400, "jpg"),
+        (800, "webp"), (800, "jpg"), (1000, "webp"), (1000, "jpg"),
+    ]
+    assert all(v["height"] == v["width"] // 2 for v in variants)
+    # The largest original-format variant is the processed file itself
+    assert variants[-1]["file"] == "poster.jpg"
+    for variant in variants:
+        with Image.open(tmp_path / variant["file"]) as img:
+            assert img.format == ("WEBP" if variant["format"] == "webp" else "JPEG")
+            assert img.width == variant["width"]
+
+
+def test_build_variants_webp_source_and_small_image(tmp_path):
+    webp = build_variants(make_image(tmp_path / "story.webp", 500, 500, "WEBP"))
+    assert [(v["width"], v["format"]) for v in webp] == [(160, "webp"), (400, "webp"), (500, "webp")]
+
+    small = build_variants(make_image(tmp_path / "icon.png", 100, 40, "PNG"))
+    assert [(v["width"], v["format"], v["file"]) for v in small] == [(100, "webp", "icon_w100.webp"), (100, "png", "icon.png")]
+
+
+def test_build_image_manifest_srcset(tmp_path):
+    variants = build_variants(make_image(tmp_path / "poster.png", 900, 300, "PNG"))
+    manifest = build_image_manifest(variants, url_prefix="/uploads/blobs/events/ab/cd")
+
+    assert (manifest["width"], manifest["height"]) == (900, 300)
+    assert manifest["srcset"]["webp"] == ", ".join(
+        f"/uploads/blobs/events/ab/cd/poster_w{width}.webp {width}w" for width in (160, 400, 800, 900)
+    )
+    assert manifest["srcset"]["png"].endswith("/uploads/blobs/events/ab/cd/poster.png 900w")
+    assert build_image_manifest([]) is None
+
+
+def test_image_job_slot_rejects_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_PROCESS_MAX_PENDING", 2)
+    monkeypatch.setattr(images, "_pending_jobs", 0)
+
+    with image_job_slot():
+        with image_job_slot():
+            assert pending_image_jobs() == 2
+            with pytest.raises(HTTPException) as error:
+                with image_job_slot():
+                    pass
+            assert error.value.status_code == 503
+            assert error.value.headers == {"Retry-After": "5"}
+
+    # Slots are released on exit, also when the job fails
+    with pytest.raises(RuntimeError):
+        with image_job_slot():
+            raise RuntimeError("processing failed")
+    assert pending_image_jobs() == 0
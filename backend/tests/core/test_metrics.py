@@ -0,0 +1,159 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry, merge_snapshots, render_families
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def make_registry(directory=None) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.directory = str(directory) if directory else None
+    registry.requests = registry.counter("requests_total", "Requests", ("route",))
+    registry.in_progress = registry.gauge("in_progress", "In progress")
+    registry.latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    return registry
+
+
+def foreign_snapshot(pid: int, started_at: float, requests: float, in_progress: float = 0.0, **extra) -> dict:
+    registry = make_registry()
+    registry.requests.inc(("/a",), requests)
+    registry.in_progress.set((), in_progress)
+    snapshot = registry.snapshot()
+    snapshot.update(pid=pid, started_at=started_at, instance=f"{pid}_{int(started_at * 1000)}", **extra)
+    return snapshot
+
+
+def write_file(directory, snapshot: dict) -> str:
+    path = os.path.join(str(directory), f"metrics_{snapshot['instance']}.json")
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(snapshot, handle)
+    return path
+
+
+def sample(families: dict, name: str, labels=()) -> float:
+    return families[name]["samples"].get(tuple(labels), 0.0)
+
+
+# --- Exposition format ---
+
+def test_render_prometheus_text_format():
+    registry = make_registry()
+    registry.requests.inc(('/say/"hi"\n',), 2)
+    registry.latency.observe(("/a",), 0.05)
+    registry.latency.observe(("/a",), 0.5)
+    registry.latency.observe(("/a",), 5)
+    text = render_families(merge_snapshots([registry.snapshot()]))
+
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert "# HELP requests_total Requests" in lines
+    assert "# TYPE requests_total counter" in lines
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'requests_total{route="/say/\\"hi\\"\\n"} 2.0' in lines
+    # Buckets are cumulative and end with +Inf; _count equals the +Inf bucket
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert "# TYPE in_progress gauge" in lines
+
+
+# --- Multiprocess merge ---
+
+def test_merge_sums_counters_and_drops_dead_gauges():
+    own = make_registry()
+    own.requests.inc(("/a",), 1)
+    own.in_progress.set((), 2)
+    gone = foreign_snapshot(dead_pid(), 100.0, requests=4, in_progress=7)
+
+    families = merge_snapshots([own.snapshot(), gone])
+    assert sample(families, "requests_total", ["/a"]) == 5 # Counters of exited workers are kept
+    assert sample(families, "in_progress") == 2 # Gauges only from live workers
+
+
+def test_merge_detects_reused_pid():
+    # Same pid, older start time: the file belongs to an earlier process
+    own = make_registry()
+    own.in_progress.set((), 1)
+    snapshot = own.snapshot()
+    stale = foreign_snapshot(snapshot["pid"], snapshot["started_at"] - 60, requests=3, in_progress=9)
+
+    families = merge_snapshots([snapshot, stale])
+    assert sample(families, "in_progress") == 1
+    assert sample(families, "requests_total", ["/a"]) == 3
+
+
+def test_merge_skips_absorbed_snapshots():
+    gone = foreign_snapshot(dead_pid(), 100.0, requests=4)
+    own = make_registry()
+    own._retired = merge_snapshots([gone])
+    own._absorbed = {gone["instance"]}
+
+    # The absorbing worker already wrote its file, the dead one is not deleted yet
+    families = merge_snapshots([own.snapshot(), gone])
+    assert sample(families, "requests_total", ["/a"]) == 4
+
+
+def test_reap_keeps_counters_monotonic(tmp_path):
+    own = make_registry(tmp_path)
+    own.requests.inc(("/a",), 2)
+    own.latency.observe(("/a",), 0.5)
+    own.write_snapshot(own.snapshot())
+
+    older = foreign_snapshot(dead_pid(), 50.0, requests=1)
+    # The dead worker had itself absorbed an even older one
+    gone = foreign_snapshot(dead_pid(), 100.0, requests=4, in_progress=3,
+                            retired={"requests_total": older["metrics"]["requests_total"]},
+                            absorbed=[older["instance"]])
+    gone_path = write_file(tmp_path, gone)
+    before = merge_snapshots(own._read_snapshots(own.snapshot()))
+    assert sample(before, "requests_total", ["/a"]) == 7
+
+    assert own.reap_snapshots() == 1
+    assert not os.path.exists(gone_path)
+    assert not os.path.exists(gone_path + ".lock")
+    assert [name for name in os.listdir(tmp_path)] == [f"metrics_{own.instance}.json"]
+
+    # Any worker reading the directory now sees the same totals
+    with open(tmp_path / f"metrics_{own.instance}.json", encoding="utf-8") as handle:
+        written = json.load(handle)
+    after = merge_snapshots([written])
+    assert sample(after, "requests_total", ["/a"]) == 7
+    assert sample(after, "in_progress") == 0 # The dead worker's gauge is not inherited
+    assert sorted(written["absorbed"]) == sorted([gone["instance"], older["instance"]])
+    assert own.reap_snapshots() == 0
+
+
+def test_reap_skips_locked_and_live_snapshots(tmp_path):
+    own = make_registry(tmp_path)
+    own.write_snapshot(own.snapshot())
+    live = write_file(tmp_path, foreign_snapshot(os.getppid(), 100.0, requests=1))
+    locked = write_file(tmp_path, foreign_snapshot(dead_pid(), 100.0, requests=1))
+    open(locked + ".lock", "w").close() # Another worker is taking it over
+
+    assert own.reap_snapshots() == 0
+    assert os.path.exists(live) and os.path.exists(locked)
+
+
+# --- /metrics endpoint ---
+
+def test_metrics_endpoint_requires_admin(client: TestClient):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"X-User-Email": "user@example.com"}).status_code == 403
+
+    response = client.get("/metrics", headers={"X-User-Email": "admin@example.com"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    assert "# TYPE http_requests_total counter" in response.text
+    assert 'http_requests_total{method="GET",route="/metrics",status="403"}' in response.text
@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.permissions import build_permission_index, permissions_for, require_club_manager
+from app.core.roles import RoleType
+from app.models import Club
+
+
+def role(role_type: RoleType, club_id=None) -> SimpleNamespace:
+    return SimpleNamespace(role_type=role_type, club_id=club_id)
+
+
+# The per-request checks the endpoints used before the permission index.
+# One deliberate difference: a CLUB_MANAGER role without a club used to "manage"
+# objects whose club_id is None; the index grants nothing for such roles.
+def legacy_can_manage(roles, club_id) -> bool:
+    is_manager_of_club = any(
+        hasattr(r, "club_id") and r.role_type == RoleType.CLUB_MANAGER and r.club_id == club_id for r in roles
+    )
+    is_system_admin = any(r.role_type == RoleType.ADMIN or r.role_type == RoleType.SUPER_ADMIN for r in roles)
+    return is_manager_of_club or is_system_admin
+
+
+ROLE_SETS = {
+    "none": [],
+    "user": [role(RoleType.USER)],
+    "manager_1": [role(RoleType.CLUB_MANAGER, 1)],
+    "manager_1_2": [role(RoleType.CLUB_MANAGER, 1), role(RoleType.CLUB_MANAGER, 2), role(RoleType.USER)],
+    "manager_without_club": [role(RoleType.CLUB_MANAGER)],
+    "admin": [role(RoleType.ADMIN)],
+    "super_admin": [role(RoleType.SUPER_ADMIN)],
+    "manager_and_admin": [role(RoleType.CLUB_MANAGER, 3), role(RoleType.ADMIN)],
+}
+CLUB_IDS = [None, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("name", sorted(ROLE_SETS))
+def test_can_manage_club_matches_legacy_check(name):
+    roles = ROLE_SETS[name]
+    permissions = build_permission_index(roles)
+    for club_id in CLUB_IDS[1:]:
+        assert permissions.can_manage_club(club_id) == legacy_can_manage(roles, club_id), club_id
+    assert permissions.can_manage_club(None) == permissions.is_system_admin
+    assert permissions.has_roles == bool(roles)
+    assert permissions.is_super_admin == (name == "super_admin")
+
+
+@pytest.mark.parametrize("name", sorted(ROLE_SETS))
+def test_manageable_matches_legacy_filter(name):
+    roles = ROLE_SETS[name]
+    items = [SimpleNamespace(club_id=club_id) for club_id in CLUB_IDS[1:]]
+    expected = [item for item in items if legacy_can_manage(roles, item.club_id)]
+    assert build_permission_index(roles).manageable(items) == expected
+    # A custom key function is used for items that are not club-owned models
+    pairs = [(club_id, "form") for club_id in CLUB_IDS[1:]]
+    assert build_permission_index(roles).manageable(pairs, club_id=lambda pair: pair[0]) == [
+        pair for pair in pairs if legacy_can_manage(roles, pair[0])
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(ROLE_SETS))
+def test_club_clause_matches_legacy_filter(name, db_session: Session):
+    clubs = [Club(name=f"Clause Club {index}") for index in range(4)]
+    db_session.add_all(clubs)
+    db_session.commit()
+    # Map the symbolic club ids 1..4 of the role sets onto the real primary keys
+    real_ids = {index + 1: club.id for index, club in enumerate(clubs)}
+    roles = [role(r.role_type, real_ids.get(r.club_id)) for r in ROLE_SETS[name]]
+
+    clause = build_permission_index(roles).club_clause(Club.id)
+    selected = {club.id for club in db_session.query(Club).filter(clause)}
+    assert selected == {club.id for club in clubs if legacy_can_manage(roles, club.id)}
+
+
+def test_permissions_for_uses_precomputed_index():
+    index = build_permission_index([role(RoleType.CLUB_MANAGER, 7)])
+    principal = SimpleNamespace(permissions=index, roles=[])
+    assert permissions_for(principal) is index
+    # ORM users (roles loaded, no index) are indexed on the fly
+    assert permissions_for(SimpleNamespace(roles=[role(RoleType.ADMIN)])).is_system_admin
+
+
+def test_require_club_manager_errors():
+    with pytest.raises(HTTPException) as error:
+        require_club_manager(SimpleNamespace(roles=[]), 1, detail="nope")
+    assert error.value.status_code == 403
+    assert error.value.detail == "User has no roles assigned"
+
+    with pytest.raises(HTTPException) as error:
+        require_club_manager(SimpleNamespace(roles=[role(RoleType.CLUB_MANAGER, 2)]), 1, detail="nope")
+    assert error.value.detail == "nope"
+
+    assert require_club_manager(SimpleNamespace(roles=[role(RoleType.CLUB_MANAGER, 1)]), 1, detail="nope").can_manage_club(1)
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.deps import _mock_principal
+from app.core import database
+from app.core.config import settings
+from app.core.principals import principal_cache, resolve_principal
+from app.core.roles import RoleType
+from app.models import Club, Form, User, UserRole
+
+DB_MANAGER_EMAIL = "dbmanager@example.com"
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def resolve(email: str):
+    async def run():
+        async with database.AsyncSessionLocal() as db:
+            return await resolve_principal(email, db, fallback=_mock_principal)
+    return asyncio.run(run())
+
+
+def create_club_with_form(db: Session, name: str) -> Form:
+    club = Club(name=name)
+    db.add(club)
+    db.flush()
+    form = Form(club_id=club.id, name=f"{name} Form", fields_json=[], is_active=True)
+    db.add(form)
+    db.commit()
+    return form
+
+
+def test_principal_cache_invalidated_after_club_manager_change(client: TestClient, db_session: Session):
+    form_a = create_club_with_form(db_session, "Club A")
+    form_b = create_club_with_form(db_session, "Club B")
+    user = User(email=DB_MANAGER_EMAIL, password_hash="x", full_name="DB Manager")
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserRole(user_id=user.id, role_type=RoleType.CLUB_MANAGER, club_id=form_a.club_id))
+    db_session.commit()
+
+    headers = {"X-User-Email": DB_MANAGER_EMAIL}
+    export_url = f"{settings.API_V1_STR}/applications/form/{{}}/export"
+    assert client.get(export_url.format(form_a.id), headers=headers).status_code == 200
+    hits = principal_cache.stats()["hits"]
+    assert client.get(export_url.format(form_b.id), headers=headers).status_code == 403
+    assert principal_cache.stats()["hits"] == hits + 1 # Served from the cache
+
+    # Granting the club B role commits through the ORM and drops the cached principal
+    db_session.add(UserRole(user_id=user.id, role_type=RoleType.CLUB_MANAGER, club_id=form_b.club_id))
+    db_session.commit()
+    assert client.get(export_url.format(form_b.id), headers=headers).status_code == 200
+
+    # Deactivating the user is picked up the same way
+    user.is_active = False
+    db_session.commit()
+    assert client.get(export_url.format(form_a.id), headers=headers).status_code == 400
+
+
+def test_resolve_principal_falls_back_to_mock_users(db_session: Session):
+    principal = resolve("manager_club1@example.com")
+    assert principal.id == 103
+    assert principal.permissions.managed_club_ids == {1}
+    assert not principal.permissions.is_system_admin
+
+    assert resolve("nobody@example.com") is None
+    found, cached = principal_cache.get("nobody@example.com")
+    assert found and cached is None # Unknown e-mails are cached too
+
+    # A real user with a mock e-mail takes precedence once it is committed
+    user = User(email="manager_club1@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.commit()
+    principal = resolve("manager_club1@example.com")
+    assert principal.id == user.id
+    assert not principal.permissions.has_roles
+
+
+def test_resolve_principal_uses_cache(db_session: Session):
+    first = resolve("admin@example.com")
+    hits = principal_cache.stats()["hits"]
+    assert resolve("admin@example.com") is first
+    assert principal_cache.stats()["hits"] == hits + 1
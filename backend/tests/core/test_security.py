@@ -0,0 +1,69 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core import security
+from app.core.security import TokenCache, create_access_token, decode_access_token
+
+
+@pytest.fixture
+def token_cache(monkeypatch) -> TokenCache:
+    # Long TTL: only the token's own exp can expire an entry in these tests
+    cache = TokenCache(max_entries=16, ttl_seconds=3600)
+    monkeypatch.setattr(security, "token_cache", cache)
+    return cache
+
+
+def test_decode_access_token_is_cached(token_cache: TokenCache):
+    token = create_access_token({"sub": "cacheduser"})
+    assert decode_access_token(token)["sub"] == "cacheduser"
+    assert decode_access_token(token)["sub"] == "cacheduser"
+    assert token_cache.stats()["hits"] == 1
+    assert decode_access_token(token + "x") is None
+
+
+def test_token_cache_entry_expires_at_token_exp(token_cache: TokenCache):
+    token = create_access_token({"sub": "shortlived"}, expires_delta=timedelta(seconds=1))
+    payload = decode_access_token(token)
+    assert payload is not None
+    assert decode_access_token(token) is not None # Served from the cache
+
+    # Past exp the cached payload must not be returned, although the cache TTL is an hour
+    time.sleep(max(0.0, payload["exp"] - time.time()) + 1.1)
+    assert decode_access_token(token) is None
+    assert token_cache.stats()["entries"] == 0
+
+
+def test_token_cache_expiry_uses_exp_not_ttl(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(security.time, "time", lambda: now[0])
+    cache = TokenCache(max_entries=4, ttl_seconds=60)
+
+    cache.set(b"long", {"exp": now[0] + 3600})
+    cache.set(b"short", {"exp": now[0] + 5})
+    now[0] += 10
+    assert cache.get(b"short") is None
+    assert cache.get(b"long") is not None # Bounded by ttl_seconds instead
+    now[0] += 60
+    assert cache.get(b"long") is None
+
+
+def test_token_cache_lru_bound():
+    cache = TokenCache(max_entries=2, ttl_seconds=60)
+    cache.set(b"a", {"sub": "a"})
+    cache.set(b"b", {"sub": "b"})
+    assert cache.get(b"a") == {"sub": "a"} # a is now the most recently used
+
+    cache.set(b"c", {"sub": "c"})
+    assert cache.stats()["entries"] == 2
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == {"sub": "a"}
+    assert cache.get(b"c") == {"sub": "c"}
+
+
+def test_token_cache_returns_copies():
+    cache = TokenCache(max_entries=2, ttl_seconds=60)
+    cache.set(b"a", {"sub": "a"})
+    cache.get(b"a")["sub"] = "tampered"
+    assert cache.get(b"a") == {"sub": "a"}
@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core import database, sqlstats
+from app.core.config import settings
+from app.core.sqlstats import (
+    QUERY_COUNT_HEADER, SERVER_TIMING_HEADER, QueryCountMiddleware, count_statements, normalize_sql, parameter_shape,
+)
+
+
+@pytest.fixture
+def sql_app(patch_db_engine_create_tables) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryCountMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with database.engine.connect() as connection:
+            for _ in range(item_id):
+                connection.execute(text("SELECT :value"), {"value": item_id})
+        return {"ok": True}
+
+    return app
+
+
+def test_count_statements_block():
+    with count_statements() as counter:
+        with database.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    assert counter.count == 2
+    assert counter.total_seconds > 0
+    assert len(counter.slowest) == 2
+
+
+def test_query_count_header(sql_app: FastAPI, monkeypatch):
+    client = TestClient(sql_app)
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "QUERY_COUNT_HEADER", False)
+    response = client.get("/items/3")
+    assert QUERY_COUNT_HEADER not in response.headers
+    assert SERVER_TIMING_HEADER not in response.headers
+
+    monkeypatch.setattr(settings, "QUERY_COUNT_HEADER", True)
+    assert client.get("/items/3").headers[QUERY_COUNT_HEADER] == "3"
+    assert client.get("/items/0").headers[QUERY_COUNT_HEADER] == "0"
+
+
+def test_server_timing_in_debug_mode(sql_app: FastAPI, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+    response = TestClient(sql_app).get("/items/5")
+    assert response.headers[QUERY_COUNT_HEADER] == "5"
+
+    entries = [entry.strip() for entry in response.headers[SERVER_TIMING_HEADER].split(", db-")]
+    assert entries[0].startswith("db;dur=")
+    assert entries[0].endswith('desc="5 queries"')
+    # Only the slowest statements are listed, values replaced by placeholders
+    assert len(entries) == 1 + sqlstats.SLOWEST_KEPT
+    assert all(entry.startswith("slow-") and 'desc="SELECT ?"' in entry for entry in entries[1:])
+
+
+def test_slow_query_log(sql_app: FastAPI, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.000001)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        TestClient(sql_app).get("/items/1")
+    records = [record.getMessage() for record in caplog.records if record.name == "app.sql.slow"]
+    assert len(records) == 1
+    assert "route=/items/{item_id}" in records[0]
+    assert "sql=SELECT ?" in records[0]
+    assert "params=(int)" in records[0] # sqlite binds positionally
+    assert "1" not in records[0].split("params=")[1] # Values are never logged
+
+    caplog.clear()
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        TestClient(sql_app).get("/items/1")
+    assert not [record for record in caplog.records if record.name == "app.sql.slow"]
+
+
+def test_normalize_sql_and_parameter_shape():
+    assert normalize_sql("SELECT *\n  FROM events WHERE title = 'Kahve ''Molası''' AND id > 10") == \
+        "SELECT * FROM events WHERE title = ? AND id > ?"
+    assert normalize_sql("SELECT * FROM events WHERE id IN (?, ?, ?)") == "SELECT * FROM events WHERE id IN (?, ...)"
+    assert normalize_sql("SELECT * FROM t WHERE id IN (:id_1, :id_2) AND x2 = 1") == \
+        "SELECT * FROM t WHERE id IN (?, ...) AND x2 = ?"
+    assert parameter_shape({"a": 1, "b": "x"}, executemany=False) == "{a: int, b: str}"
+    assert parameter_shape([(1, "x"), (2, "y")], executemany=True) == "2 x (int, str)"
+    assert parameter_shape([], executemany=True) == "0 x ()"
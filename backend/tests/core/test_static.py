@@ -0,0 +1,97 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.static import IMMUTABLE_CACHE_CONTROL, LEGACY_CACHE_CONTROL, UploadStaticFiles
+
+BLOB_NAME = "ab" * 32 + ".jpg"
+CONTENT = b"0123456789"
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    for relative in (f"blobs/events/ab/ab/{BLOB_NAME}", "legacy.jpg", "applications/cv.pdf", "blobs/applications/cv.pdf"):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(CONTENT)
+    return tmp_path
+
+
+@pytest.fixture
+def static_files(upload_dir) -> UploadStaticFiles:
+    return UploadStaticFiles(directory=str(upload_dir), private_prefixes=("applications", "blobs/applications"))
+
+
+@pytest.fixture
+def static_client(static_files) -> TestClient:
+    app = FastAPI()
+    app.mount("/uploads", static_files, name="uploads")
+    return TestClient(app)
+
+
+BLOB_URL = f"/uploads/blobs/events/ab/ab/{BLOB_NAME}"
+
+
+def test_blob_served_with_immutable_headers(static_client: TestClient):
+    response = static_client.get(BLOB_URL)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["ETag"] == f'"{BLOB_NAME}"'
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+    legacy = static_client.get("/uploads/legacy.jpg")
+    assert legacy.status_code == 200
+    assert legacy.headers["Cache-Control"] == LEGACY_CACHE_CONTROL
+
+
+def test_blob_strong_etag_not_modified(static_client: TestClient):
+    etag = static_client.get(BLOB_URL).headers["ETag"]
+    response = static_client.get(BLOB_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert static_client.get(BLOB_URL, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_blob_byte_ranges(static_client: TestClient):
+    response = static_client.get(BLOB_URL, headers={"Range": "bytes=2-5"})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["Content-Range"] == f"bytes 2-5/{len(CONTENT)}"
+    assert response.headers["Content-Length"] == "4"
+
+    suffix = static_client.get(BLOB_URL, headers={"Range": "bytes=-3"})
+    assert suffix.status_code == 206
+    assert suffix.content == b"789"
+
+    open_ended = static_client.get(BLOB_URL, headers={"Range": "bytes=8-"})
+    assert open_ended.content == b"89"
+
+    unsatisfiable = static_client.get(BLOB_URL, headers={"Range": "bytes=100-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+    # Multiple ranges and a mismatching If-Range fall back to the full body
+    assert static_client.get(BLOB_URL, headers={"Range": "bytes=0-1,4-5"}).status_code == 200
+    stale = static_client.get(BLOB_URL, headers={"Range": "bytes=0-1", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
+
+
+def test_private_prefixes_are_not_served(static_client: TestClient):
+    assert static_client.get("/uploads/applications/cv.pdf").status_code == 404
+    assert static_client.get("/uploads/blobs/applications/cv.pdf").status_code == 404
+
+
+def test_removed_blob_returns_404_and_drops_stat_cache_entry(static_client: TestClient, static_files, upload_dir):
+    assert static_client.get(BLOB_URL).status_code == 200
+    path = f"blobs/events/ab/ab/{BLOB_NAME}"
+    assert path in static_files._stat_cache
+
+    os.remove(upload_dir / path)
+    assert static_client.get(BLOB_URL).status_code == 404
+    assert static_client.get(BLOB_URL, headers={"Range": "bytes=0-1"}).status_code == 404
+    assert path not in static_files._stat_cache
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core import database
+from app.core.config import settings
+from app.core.leases import acquire_lease, release_lease
+from app.core.sweeper import LEASE_NAME, FileRemovalWorker, StorySweeper
+from app.models import Blob, JobLease, Story
+
+
+@pytest.fixture(autouse=True)
+def clear_leases(db_session: Session):
+    db_session.query(JobLease).delete()
+    db_session.commit()
+
+
+def make_sweeper(batch_size: int = 100) -> StorySweeper:
+    return StorySweeper(interval_seconds=30, batch_size=batch_size, files=FileRemovalWorker())
+
+
+def expire_lease(db: Session, name: str = LEASE_NAME) -> None:
+    db.query(JobLease).filter(JobLease.name == name).update({JobLease.expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+
+def add_story(db: Session, title: str, expired: bool, image_url: str = "https://example.com/story.jpg", **fields) -> Story:
+    offset = timedelta(hours=-1) if expired else timedelta(hours=1)
+    story = Story(title=title, image_url=image_url, expires_at=datetime.utcnow() + offset, **fields)
+    db.add(story)
+    db.commit()
+    return story
+
+
+# --- Leases ---
+
+def test_lease_held_by_one_owner_until_expiry(db_session: Session):
+    engine = database.engine
+    assert acquire_lease(engine, "job", "runner-a", ttl_seconds=60)
+    assert not acquire_lease(engine, "job", "runner-b", ttl_seconds=60) # A second holder cannot take it
+
+    first_expiry = db_session.get(JobLease, "job").expires_at
+    assert acquire_lease(engine, "job", "runner-a", ttl_seconds=120) # Renewal by the owner
+    db_session.expire_all()
+    assert db_session.get(JobLease, "job").expires_at > first_expiry
+
+    expire_lease(db_session, "job")
+    assert acquire_lease(engine, "job", "runner-b", ttl_seconds=60) # Taken over after expiry
+    assert not acquire_lease(engine, "job", "runner-a", ttl_seconds=60)
+    db_session.expire_all()
+    assert db_session.get(JobLease, "job").owner == "runner-b"
+
+
+def test_release_lease_only_by_owner(db_session: Session):
+    engine = database.engine
+    assert acquire_lease(engine, "job", "runner-a", ttl_seconds=60)
+    release_lease(engine, "job", "runner-b")
+    assert not acquire_lease(engine, "job", "runner-b", ttl_seconds=60)
+
+    release_lease(engine, "job", "runner-a")
+    assert acquire_lease(engine, "job", "runner-b", ttl_seconds=60)
+
+
+def test_run_once_sweeps_only_on_lease_holder(db_session: Session):
+    add_story(db_session, "Old", expired=True)
+    runner_a, runner_b = make_sweeper(), make_sweeper()
+
+    assert runner_a.run_once()["deleted"] == 1
+    assert runner_b.run_once() is None
+    assert runner_b.stats()["skipped_not_leader"] == 1
+
+    add_story(db_session, "Old again", expired=True)
+    expire_lease(db_session) # runner_a stopped renewing
+    assert runner_b.run_once()["deleted"] == 1
+    assert runner_a.run_once() is None
+
+
+# --- Sweeps ---
+
+def test_sweep_deletes_expired_stories_in_batches(db_session: Session):
+    for index in range(5):
+        add_story(db_session, f"Expired {index}", expired=True)
+    live = add_story(db_session, "Live", expired=False)
+
+    report = make_sweeper(batch_size=2).sweep()
+    assert (report["deleted"], report["batches"]) == (5, 3)
+    assert [story.id for story in db_session.query(Story).all()] == [live.id]
+    assert make_sweeper(batch_size=2).sweep()["deleted"] == 0
+
+
+def test_sweep_releases_blob_references(db_session: Session):
+    key = "stories/ab/cd/" + "cd" * 32 + ".jpg"
+    db_session.add(Blob(key=key, sha256="cd" * 32, size=1, ref_count=0))
+    db_session.commit()
+    add_story(db_session, "Blob story", expired=True, image_url=f"/uploads/blobs/{key}")
+    add_story(db_session, "Live blob story", expired=False, image_url=f"/uploads/blobs/{key}")
+    db_session.expire_all()
+    assert db_session.get(Blob, key).ref_count == 2
+
+    report = make_sweeper().sweep()
+    assert (report["deleted"], report["files_queued"]) == (1, 0) # Blob files are left to collect_garbage
+    db_session.expire_all()
+    assert db_session.get(Blob, key).ref_count == 1
+
+
+def test_sweep_removes_legacy_upload_files(db_session: Session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path))
+    for name in ("story.jpg", "story-320.webp"):
+        (tmp_path / name).write_bytes(b"image")
+    story = add_story(db_session, "Legacy", expired=True, image_url="/uploads/story.jpg",
+                      image_variants={"variants": [{"url": "/uploads/story-320.webp"}]})
+    story_id = story.id
+
+    sweeper = make_sweeper()
+    report = sweeper.sweep()
+    sweeper.files.stop() # Drains the queue before joining the worker thread
+
+    assert (report["deleted"], report["files_queued"]) == (1, 1)
+    db_session.expire_all()
+    assert db_session.get(Story, story_id) is None
+    assert list(tmp_path.iterdir()) == []
+    assert sweeper.stats()["files_removed"] == 1
@@ -0,0 +1,56 @@
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.uploads import RequestSizeLimitMiddleware
+
+MAX_BODY = 1024
+
+
+@pytest.fixture
+def limited_app():
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, max_body_size=MAX_BODY)
+    app.state.calls = 0
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        app.state.calls += 1
+        return {"size": len(await file.read())}
+
+    return app
+
+
+def test_request_within_limit_is_passed_through(limited_app):
+    client = TestClient(limited_app)
+    response = client.post("/upload", files={"file": ("a.bin", b"x" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_declared_content_length_rejected_before_parsing(limited_app):
+    client = TestClient(limited_app)
+    response = client.post("/upload", files={"file": ("a.bin", b"x" * (MAX_BODY * 4))})
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large"}
+    assert response.headers["connection"] == "close"
+    assert limited_app.state.calls == 0
+
+
+def test_chunked_body_cut_off_at_limit(limited_app):
+    client = TestClient(limited_app)
+    boundary = "limit-boundary"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.bin\"\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n").encode()
+
+    def body():
+        # No Content-Length: the middleware has to count the streamed bytes
+        yield head
+        for _ in range(8):
+            yield b"x" * 512
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = client.post("/upload", content=body(),
+                           headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    assert response.status_code == 413
+    assert limited_app.state.calls == 0
@@ -1,7 +1,7 @@
 import { Event } from "@/types";
 import { Link } from "react-router-dom";
 import { Calendar, MapPin, Clock } from "lucide-react";
-import { formatDate, getImageUrl } from "@/lib/utils";
+import { formatDate, getImageSrcSet, getImageUrl } from "@/lib/utils";
 
 interface EventCardProps {
   event: Event;
@@ -13,6 +13,9 @@ const EventCard = ({ event }: EventCardProps) => {
       <div className="relative h-56 overflow-hidden rounded-t-xl">
         <img
           src={getImageUrl(event.image_url)}
+          srcSet={getImageSrcSet(event.image_variants)}
+          sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
+          loading="lazy"
           alt={event.title}
           className="h-full w-full object-cover transition-transform duration-300 hover:scale-105"
         />
@@ -10,7 +10,7 @@ import {
   CarouselPrevious
 } from "@/components/ui/carousel";
 import { AspectRatio } from "@/components/ui/aspect-ratio";
-import { cn, getImageUrl } from "@/lib/utils";
+import { cn, getImageSrcSet, getImageUrl } from "@/lib/utils";
 import { storiesAPI } from "@/lib/api";
 import { Story } from "@/types";
 
@@ -96,6 +96,9 @@ const Stories = () => {
                   <div className="absolute inset-0">
                     <img 
                       src={getImageUrl(story.image_url)}
+                      srcSet={getImageSrcSet(story.image_variants)}
+                      sizes="200px"
+                      loading="lazy"
                       alt={story.title}
                       className="h-full w-full object-cover"
                     />
@@ -154,6 +157,8 @@ const Stories = () => {
                 {/* Story Image */}
                 <img 
                   src={getImageUrl(stories[currentStoryIndex].image_url)} 
+                  srcSet={getImageSrcSet(stories[currentStoryIndex].image_variants)}
+                  sizes="(min-width: 768px) 400px, 100vw"
                   alt={stories[currentStoryIndex].title}
                   className="h-full w-full object-cover"
                 />
@@ -1,6 +1,7 @@
 
 import { clsx, type ClassValue } from "clsx"
 import { twMerge } from "tailwind-merge"
+import type { ResponsiveImage } from "@/types"
 
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
@@ -31,3 +32,11 @@ export function getImageUrl(imageUrl: string | null | undefined): string {
   // Diğer durumlar için olduğu gibi döndür
   return imageUrl;
 }
+
+// Görsel varyantlarından <img srcSet> değeri üret (varsayılan WebP)
+export function getImageSrcSet(image: ResponsiveImage | null | undefined, format: string = 'webp'): string | undefined {
+  if (!image) return undefined;
+  const variants = image.variants.filter((variant) => variant.format === format);
+  if (variants.length === 0) return undefined;
+  return variants.map((variant) => `${getImageUrl(variant.url)} ${variant.width}w`).join(', ');
+}
@@ -12,6 +12,21 @@ export interface Category {
   updated_at: string;
 }
 
+// Yüklenen görselin boyut/format varyantları (backend ResponsiveImage)
+export interface ImageVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: string;
+}
+
+export interface ResponsiveImage {
+  width: number;
+  height: number;
+  srcset: Record<string, string>;
+  variants: ImageVariant[];
+}
+
 export interface Event {
   id: number;
   title: string;
@@ -23,6 +38,7 @@ export interface Event {
   category_id: number;
   category: Category;
   image_url?: string;
+  image_variants?: ResponsiveImage | null;
   latitude?: number;
   longitude?: number;
   address?: string;
@@ -38,6 +54,7 @@ export interface Story {
   id: number;
   title: string;
   image_url: string;
+  image_variants?: ResponsiveImage | null;
   link_url?: string;
   order_index: number;
   is_active: boolean;